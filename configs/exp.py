@@ -13,11 +13,154 @@ ip_proxy_pool_count = 2
 headless = False
 user_agent = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36 Edg/131.0.0.0'
 save_login_state = True
-save_data_option = 'json'
+# sinks every entry is pushed into as soon as it is parsed, any of the keys
+# of sink_options; 'json' keeps every entry in memory until the end of the run
+save_data_option = ['jsonl']
 user_data_dir = f'{platform}_user_data'
 
+# network
+# 'data' keeps only what the DOM needs, 'screenshot' keeps what the page
+# needs to render, None disables the blocking
+route_profile = 'screenshot'
+route_profiles = dict(
+    data=dict(
+        resource_types=['image', 'media', 'font'],
+        url_patterns=[
+            r'google-analytics\.com',
+            r'googletagmanager\.com',
+            r'hm\.baidu\.com',
+            r'sentry',
+            r'log-upload',
+        ],
+    ),
+    screenshot=dict(
+        resource_types=['media'],
+        url_patterns=[
+            r'google-analytics\.com',
+            r'googletagmanager\.com',
+            r'hm\.baidu\.com',
+            r'sentry',
+            r'log-upload',
+        ],
+    ),
+)
+# parser class name -> route profile, e.g. dict(IllustrationParser='data')
+parser_route_profiles = dict()
+# 'record' saves every response of the crawl, 'replay' serves them back and
+# never goes out to the network, None disables both
+network_mode = None
+network_archive = f'{workdir}/{platform}_network'  # kept out of exp_path
+replay_ignore_params = ['t', '_', 'timestamp']  # cache busters left out of the key
+
+# navigation
+ready_timeout = 15000  # ms to wait for the content of a page
+ready_stable_ms = 300  # ms the content must stay unchanged to be ready
+
+# interaction
+disable_transitions = True  # inject css that turns off transitions and animations
+switch_timeout = 2000  # ms to wait for a swiper slide or panel to switch
+switch_sleep_baseline = 1.0  # seconds of the fixed sleep a switch used to take
+slide_screenshots = False  # screenshot every swiper slide, needs a click per slide
+section_screenshots = False  # screenshot every section once the page is parsed
+# 'element' takes an element screenshot per section, 'crop' cuts them out of
+# one capture of the page. 'crop' captures with the viewport grown to the page
+# height, sections sized by vh look different there, so it is opt-in
+section_capture = 'element'
+artifact_workers = 4  # threads writing the screenshots and HTML files
+artifact_queue_size = 64  # files waiting per thread before the parsers wait
+artifact_batch_size = 16  # max files written per hand-off to a thread
+# 'raw' writes the HTML files as they are, 'lxml' canonicalizes them and
+# 'prettify' indents them with BeautifulSoup, the slowest by far
+html_serializer = 'raw'
+# 'tall' grows the viewport to the height of the page and captures it in one
+# go, 'scroll' captures it viewport by viewport. 'tall' falls back to 'scroll'
+# on pages that do not expand
+capture_mode = 'tall'
+tall_tile_height = 8000  # max pixels of one capture, taller pages take several
+tall_image_timeout = 5000  # ms to wait at most for the lazy images of a page
+# 'overlap' stitches the 'scroll' captures where their rows really overlap,
+# 'concat' crops them by the header and footer heights and pastes them
+stitch_mode = 'overlap'
+image_workers = 2  # processes decoding and stitching the page captures, 0 uses threads
+# preset of screenshot_presets the screenshots are saved with. 'png' keeps the
+# png of the browser, the others encode it again in the image pool: format is
+# 'png', 'webp', 'avif' (needs the pillow-avif-plugin) or 'jpeg', colors
+# quantizes a png to a palette, max_width scales the image down and
+# device_scale_factor sets the pixel ratio of the browser
+screenshot_preset = 'png'
+screenshot_presets = dict(
+    png=dict(format='png'),
+    png8=dict(format='png', colors=256),
+    webp=dict(format='webp', quality=80),
+    avif=dict(format='avif', quality=50),
+    thumb=dict(format='webp', quality=70, max_width=1280, device_scale_factor=1),
+)
+# link the section screenshots that look the same as in the last crawl to its
+# files instead of writing them again, by their perceptual hash
+screenshot_dedup = False
+screenshot_state_path = f'{workdir}/{platform}_screenshot_state'  # kept out of exp_path
+phash_threshold = 2  # max bits of 64 the hashes of an unchanged screenshot differ in
+skip_unchanged_html = True  # no screenshot of a section whose HTML is unchanged
+# write the screenshots and HTML files once by their sha256 to
+# artifact_store_path, the files of a crawl are hard links to the stored blobs
+artifact_store = False
+artifact_store_path = f'{workdir}/{platform}_artifacts'  # kept out of exp_path
+gc_artifacts = None  # drop the stored blobs no retained crawl references and exit
+artifact_keep_runs = 0  # latest crawls --gc-artifacts retains, 0 retains every crawl
+run_id = None  # id of the crawl in the artifact store, the start time if None
+format_html = None  # exp path of an earlier crawl, format its HTML files and exit
+html_format = 'prettify'  # serializer of --format-html
+
+# targets, any of 'wiki', 'strategy' and 'summon'
+crawl_targets = ['wiki']
+
+# scheduler
+concurrency = 1  # max number of pages loaded and parsed at the same time
+scheduler_report_interval = 30  # seconds between two queue reports
+workers = 1  # number of crawl processes, every one runs its own browser
+worker_index = 0  # set for every worker process, do not change
+incremental = False  # reuse the results of the entries unchanged since the last crawl
+crawl_state_path = f'{workdir}/{platform}_crawl_state'  # kept out of exp_path
+
+# watch, poll the listings and crawl only the entries that appeared
+watch = False
+watch_interval = 300  # seconds between two polls
+watch_rounds = 0  # polls before the watch stops, 0 polls forever
+watch_baseline = True  # the first poll of a listing only records its entries
+watch_state_path = f'{workdir}/{platform}_watch_state'  # kept out of exp_path
+
+# results
+resume = False  # continue from the last checkpoint in exp_path/checkpoints
+checkpoint_every = 50  # results between two checkpoints of the durable sinks
+checkpoint_interval = 5.0  # max seconds between two checkpoints
+# export the jsonl results after the run, any of 'parquet' (exp_path/export/
+# parquet, partitioned by category) and 'arrow' (Arrow IPC, memory-mappable)
+export_formats = []
+parquet_compression = 'zstd'
+
+# sinks
+sink_options = dict(
+    jsonl=dict(type='JsonlSink'),  # exp_path/results, continued by --resume
+    parquet=dict(type='ParquetSink', rows_per_file=1000),  # exp_path/sinks/parquet
+    elasticsearch=dict(type='ElasticsearchSink', index_prefix='genshin_impact_'),
+    redis=dict(
+        type='RedisSink',
+        key_prefix='genshin_impact:',
+        redis_db_host='127.0.0.1',
+        redis_db_port=6379,
+        redis_db_num=0,
+        redis_db_pwd=None,
+    ),
+)
+sink_queue_size = 256  # entries waiting per sink before the parsers wait
+sink_batch_size = 50  # max entries per write of a sink
+sink_flush_interval = 2.0  # max seconds an entry waits for its batch to fill
+
 # parser
-batch_size = 1
 save_screen = False
+archive_html = True  # keep the raw HTML of every page, --reparse parses it again
+offline = False  # set by --reparse, parse the archived HTML without a browser
+reparse = None  # exp path of an earlier crawl, set by --reparse
+reparse_workers = 0  # processes of --reparse, 0 uses one per cpu
 set_width_scale = 1.0
 set_height_scale = 4.0
@@ -2,6 +2,7 @@ from crawler.base.cache import AbstractCache
 from crawler.base.core import AbstractApiClient, AbstractCrawler, AbstractLogin
 from crawler.base.parser import AbstractParser
 from crawler.base.proxy import IpInfoModel, ProviderNameEnum, ProxyProvider
+from crawler.base.sink import AbstractSink
 
 __all__ = [
     'AbstractCrawler',
@@ -12,4 +13,5 @@ __all__ = [
     'IpInfoModel',
     'ProviderNameEnum',
     'AbstractParser',
+    'AbstractSink',
 ]
@@ -1,17 +1,54 @@
+import asyncio
 import os
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
-from playwright.async_api import BrowserContext, Page
+from playwright.async_api import BrowserContext, Locator, Page
 
 from crawler.logger import logger
-from crawler.utils.html_files import save_html_file
-from crawler.utils.screenshot import scroll_and_capture
+from crawler.network import route_blocker
+from crawler.offline import OfflinePage
+from crawler.scheduler import (
+    WorkQueue,
+    crawl_state,
+    fingerprint_of,
+    listing_watcher,
+    shard_of,
+)
+from crawler.utils.artifact_writer import artifact_writer
+from crawler.utils.element import (
+    disable_transitions,
+    read_swiper,
+    save_element_overleaf,
+    switch_to,
+    wait_until_ready,
+)
+from crawler.utils.html_files import archive_path
+from crawler.utils.image_encode import screenshot_encoder
+from crawler.utils.metrics import timings
+from crawler.utils.screenshot import capture_and_crop, scroll_and_capture, tall_capture
+from crawler.utils.screenshot_dedup import screenshot_dedup
+from crawler.utils.section_index import PATH_SCRIPT, SectionIndex
+from crawler.writer import result_sinks
 
 __all__ = ['AbstractParser']
 
 
 class AbstractParser(ABC):
+    # Route profile of the pages of this parser, None keeps the profile of
+    # the browser context, config.parser_route_profiles overrides it
+    route_profile: Optional[str] = None
+
+    # Css selector of the content the parser reads, the page is ready once
+    # its matches stop changing. None waits for networkidle instead
+    ready_selector: Optional[str] = None
+
+    # Entries whose ready_selector content is unchanged since the last crawl
+    # reuse its result with config.incremental, containers are always parsed
+    incremental: bool = True
+
     def __init__(
         self,
         *args,
@@ -22,6 +59,7 @@ class AbstractParser(ABC):
         img_path: str,
         html_path: str,
         icon: Optional[str] = None,
+        scheduler: Optional[WorkQueue] = None,
         **kwargs,
     ) -> None:
         self.config = config
@@ -30,13 +68,340 @@ class AbstractParser(ABC):
         self.name = name
         self.icon = icon
 
-        self.img_path = img_path
-        self.html_path = html_path
+        # Every parser saves its files in its own directory, resolved once so
+        # that parsing never mutates shared paths
+        self.img_path = os.path.join(img_path, id)
+        self.html_path = os.path.join(html_path, id)
 
         self.save_id = 0
 
         self.save_screen = self.config.save_screen
 
+        # Seconds of fixed sleeps saved by event-driven switches
+        self.sleep_saved = 0.0
+
+        self._scheduler = scheduler
+
+        # Section indexes of the current page, by the page or element they index
+        self._section_indexes: Dict[int, SectionIndex] = dict()
+
+        # Screenshots of the sections taken once the page is parsed: (element,
+        # CSS path to crop it by, img_path, set_width_scale, set_height_scale)
+        self._pending_screenshots: List[
+            Tuple[Locator, Optional[str], str, float, float]
+        ] = []
+
+        # A watch poll reads the listings without saving them
+        self.listings_only = False
+
+    @property
+    def scheduler(self) -> WorkQueue:
+        # Parsers created without a shared scheduler get their own queue
+        if self._scheduler is None:
+            self._scheduler = WorkQueue(concurrency=self.config.concurrency)
+        return self._scheduler
+
+    async def _new_page(self, browser_context: BrowserContext) -> Page:
+        """
+        New a context page with the route profile of this parser
+        :param browser_context:
+        :return:
+        """
+        context_page = await browser_context.new_page()
+
+        profile = self.config.parser_route_profiles.get(
+            type(self).__name__, self.route_profile
+        )
+        await route_blocker.attach(context_page, self.config, profile)
+
+        return context_page
+
+    async def _goto(
+        self,
+        context_page: Page,
+        url: str,
+        ready_selector: Optional[str] = None,
+    ) -> None:
+        """
+        Open the url and wait until the content of the page is ready
+        :param context_page:
+        :param url:
+        :param ready_selector: css selector of the content, see ready_selector
+        :return:
+        """
+        logger.info(f'| Go to the page {url}')
+
+        start_time = time.monotonic()
+
+        # Open the page
+        await context_page.goto(url, wait_until='domcontentloaded')
+
+        if ready_selector:
+            # Wait for the content instead of the trailing trackers and images
+            ready = await wait_until_ready(
+                context_page,
+                ready_selector,
+                timeout=self.config.ready_timeout,
+                stable_ms=self.config.ready_stable_ms,
+            )
+            if not ready:
+                logger.info(f'｜ Timeout waiting for {ready_selector} on {url}')
+        else:
+            try:
+                # Ensure all network activity is complete
+                await context_page.wait_for_load_state('networkidle')
+            except Exception as e:
+                logger.info(f'｜ Error: {e}')
+
+        timings.record(f'ready/{type(self).__name__}', time.monotonic() - start_time)
+
+        if self.config.disable_transitions:
+            await disable_transitions(context_page)
+
+    async def _switch(
+        self,
+        target: Locator,
+        watch: Optional[Locator] = None,
+        active_class: Optional[str] = None,
+    ) -> None:
+        """
+        Click a swiper bullet or tab and wait until the switch is done
+        :param target: element to click
+        :param watch: element whose content changes after the click
+        :param active_class: class the target gets once it is active
+        :return:
+        """
+        # Archived pages are never switched, they hold what the crawl saw
+        if self.config.offline:
+            return
+
+        waited = await switch_to(
+            target,
+            watch=watch,
+            active_class=active_class,
+            timeout=self.config.switch_timeout,
+        )
+
+        self.sleep_saved += max(0.0, self.config.switch_sleep_baseline - waited)
+
+        # The switch changed the page, the HTML captured with the indexes is outdated
+        for index in self._section_indexes.values():
+            index.stale = True
+
+    async def _sections(self, root: Page | Locator) -> SectionIndex:
+        """
+        Get the section index of a page or element, built once per page
+        :param root: page, or element whose sections are indexed
+        :return:
+        """
+        key = id(root)
+        if key not in self._section_indexes:
+            self._section_indexes[key] = await SectionIndex.build(root)
+        return self._section_indexes[key]
+
+    async def _capture(
+        self,
+        context_page: Page,
+        element: Locator,
+        save_name: str,
+        set_width_scale: Optional[float] = None,
+        set_height_scale: Optional[float] = None,
+    ) -> Tuple[str, Optional[str], str]:
+        """
+        Save the HTML of a section. Sections found through the section index
+        reuse the HTML captured with it, other elements take one evaluate.
+        The screenshot is only queued with config.section_screenshots, and
+        taken by _take_screenshots once the page is parsed. With
+        config.skip_unchanged_html a section whose HTML is the same as in the
+        last crawl links to its screenshot of the last crawl instead
+        :param context_page:
+        :param element:
+        :param save_name:
+        :param set_width_scale: viewport width scale of the screenshot
+        :param set_height_scale: viewport height scale of the screenshot
+        :return: content, img_path, html_path
+        """
+        screenshot = self.config.section_screenshots and not self.config.offline
+        crop = screenshot and self.config.section_capture == 'crop'
+
+        content = path = None
+        for index in self._section_indexes.values():
+            content = index.html_of(element)
+            if content is not None:
+                path = index.path_of(element)
+                break
+
+        if content is None and crop:
+            # The path the section is cropped by comes with the outer HTML
+            content, path = await element.evaluate(
+                f'el => [el.outerHTML, ({PATH_SCRIPT})(el)]'
+            )
+        elif content is None:
+            # Get the outer HTML of the element
+            content = await element.evaluate('el => el.outerHTML')
+
+        # Save the HTML content to a file
+        html_path = os.path.join(self.html_path, f'{save_name}.html')
+        await artifact_writer.write_html(html_path, content)
+
+        img_path = None
+        if screenshot:
+            img_path = screenshot_encoder.path(self.img_path, save_name)
+            previous_path = screenshot_dedup.unchanged(img_path, content)
+            if previous_path is not None:
+                # The section renders the same HTML as in the last crawl
+                await artifact_writer.write_link(img_path, previous_path)
+            else:
+                self._pending_screenshots.append(
+                    (
+                        element,
+                        path,
+                        img_path,
+                        set_width_scale or self.config.set_width_scale,
+                        set_height_scale or self.config.set_height_scale,
+                    )
+                )
+
+        return content, img_path, html_path
+
+    async def _take_screenshots(self, context_page: Page) -> None:
+        """
+        Take the queued screenshots of the sections, the viewport is resized
+        once per scale instead of once per section. With config.section_capture
+        'crop' the sections of a scale are cut out of one capture of the page,
+        the sections that can not be cropped take an element screenshot
+        :param context_page:
+        :return:
+        """
+        if not self._pending_screenshots:
+            return
+
+        original_viewport_size = context_page.viewport_size
+
+        groups: Dict[Tuple[float, float], List[Tuple[Locator, Optional[str], str]]] = (
+            dict()
+        )
+        for (
+            element,
+            path,
+            img_path,
+            set_width_scale,
+            set_height_scale,
+        ) in self._pending_screenshots:
+            groups.setdefault((set_width_scale, set_height_scale), []).append(
+                (element, path, img_path)
+            )
+
+        for (set_width_scale, set_height_scale), group in sorted(groups.items()):
+            await context_page.set_viewport_size(
+                {
+                    'width': int(original_viewport_size['width'] * set_width_scale),
+                    'height': int(original_viewport_size['height'] * set_height_scale),
+                }
+            )
+
+            missing = list(range(len(group)))
+            if self.config.section_capture == 'crop':
+                cropped = await capture_and_crop(
+                    context_page,
+                    [path for _, path, _ in group],
+                    [img_path for _, _, img_path in group],
+                    tile_height=self.config.tall_tile_height,
+                    image_timeout=self.config.tall_image_timeout,
+                    preset=screenshot_encoder.preset,
+                )
+                if cropped is None:
+                    logger.info(
+                        f'| Page does not expand, screenshot every section: {self.url}'
+                    )
+                else:
+                    missing = cropped
+
+            for idx in missing:
+                element, _, img_path = group[idx]
+                try:
+                    image = await element.screenshot()
+                    await screenshot_encoder.write(image, img_path)
+                except Exception as e:
+                    logger.info(f'| Error: {e} - screenshot {img_path}')
+
+        await context_page.set_viewport_size(original_viewport_size)
+
+        self._pending_screenshots.clear()
+
+    async def _read_slides(self, element: Locator) -> List[Dict[str, Any]]:
+        """
+        Read the label and HTML of every slide of the swiper in the element
+        in one round trip, slides that are populated lazily have no HTML yet
+        :param element:
+        :return: [{'label': ..., 'html': ...}], in the order of the slides
+        """
+        if self.config.offline:
+            return await element.read_swiper()
+        return await read_swiper(element)
+
+    async def _slide_content(
+        self, slide: Locator, slide_data: Locator, html: Optional[str] = None
+    ) -> str:
+        """
+        Get the HTML of a slide, the slide is only switched to when the HTML
+        read in bulk is missing
+        :param slide: bullet of the slide
+        :param slide_data: the slide
+        :param html: HTML read by _read_slides
+        :return:
+        """
+        if html and html.strip():
+            return html
+
+        await self._switch(slide, active_class='swiper-pagination-bullet-active')
+
+        return await slide_data.inner_html()
+
+    async def _capture_slide(
+        self,
+        context_page: Page,
+        element: Locator,
+        slide: Locator,
+        slide_data: Locator,
+        html: Optional[str],
+        save_name: str,
+    ) -> Tuple[str, Optional[str], str]:
+        """
+        Save the HTML of a slide, the screenshot of the element with the slide
+        switched in is only taken with config.slide_screenshots
+        :param context_page:
+        :param element: element the screenshot is taken of
+        :param slide: bullet of the slide
+        :param slide_data: the slide
+        :param html: HTML read by _read_slides
+        :param save_name:
+        :return: content, img_path, html_path
+        """
+        img_path = None
+        html_path = os.path.join(self.html_path, f'{save_name}.html')
+
+        if self.config.slide_screenshots and not self.config.offline:
+            await self._switch(slide, active_class='swiper-pagination-bullet-active')
+
+            # Capture a screenshot of the element
+            _, img_path, html_path = await save_element_overleaf(
+                page=context_page,
+                element=element,
+                save_name=save_name,
+                img_path=self.img_path,
+                html_path=self.html_path,
+                set_width_scale=self.config.set_width_scale,
+                set_height_scale=self.config.set_height_scale,
+            )
+
+        content = await self._slide_content(slide, slide_data, html)
+
+        # Save the HTML content of the slide to a file
+        await artifact_writer.write_html(html_path, content)
+
+        return content, img_path, html_path
+
     @abstractmethod
     async def _parse(
         self, context_page: Page, browser_context: BrowserContext
@@ -51,42 +416,71 @@ class AbstractParser(ABC):
     async def parse(
         self,
         browser_context: Optional[BrowserContext] = None,
+        category: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         parse page
         :param page:
+        :param category: category of the entry, None for a container
         :return:
         """
         res_info: Dict[str, Any] = dict()
 
-        # New a context page
-        context_page = await browser_context.new_page()
+        save_name = f'{self.save_id:04d}_full'
+        self.save_id += 1
 
-        logger.info(f'| Go to the page {self.url}')
-        # Open the page
-        await context_page.goto(self.url)
+        fingerprint = None
+        if self.config.offline:
+            # Load the HTML archived by an earlier crawl instead of the page
+            path = archive_path(self.html_path, save_name)
+            if not os.path.exists(path):
+                logger.info(f'| No archived HTML of {self.url}: {path}')
+                return self._summary()
+            context_page = OfflinePage.from_file(path, url=self.url)
+        else:
+            # New a context page
+            context_page = await self._new_page(browser_context)
 
-        try:
-            # Ensure all network activity is complete
-            await context_page.wait_for_load_state('networkidle')
-        except Exception as e:
-            logger.info(f'｜ Error: {e}')
+            # Open the page and wait until it is ready
+            await self._goto(context_page, self.url, self.ready_selector)
+
+            # Reuse the result of the last crawl if the entry is unchanged
+            fingerprint = await self._fingerprint(context_page)
+            if fingerprint is not None:
+                previous = await asyncio.to_thread(
+                    crawl_state.get,
+                    category,
+                    self.id,
+                    fingerprint,
+                    self.img_path,
+                    self.html_path,
+                )
+                if previous is not None:
+                    logger.info(f'| Unchanged since the last crawl: {self.url}')
+                    await context_page.close()
+                    # The next crawl links the files of this one
+                    crawl_state.set(
+                        category,
+                        self.id,
+                        fingerprint,
+                        previous,
+                        self.img_path,
+                        self.html_path,
+                    )
+                    return previous
 
         logger.info('| Start parsing page...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
 
-        self.img_path = os.path.join(self.img_path, self.id)
-        os.makedirs(self.img_path, exist_ok=True)
-        self.html_path = os.path.join(self.html_path, self.id)
-        os.makedirs(self.html_path, exist_ok=True)
+        # Every worker parses the containers, only the first one saves their
+        # files. An entry is only parsed by the worker of its shard
+        save_files = category is not None or self.config.worker_index == 0
 
         # Save a screenshot of the page
         content, img_path, html_path = await self._save_screenshot(
             context_page=context_page,
             save_name=save_name,
             browser_context=browser_context,
-            save_screen=self.save_screen,
+            save_screen=self.save_screen and not self.config.offline and save_files,
         )
 
         # Save the results to the dictionary
@@ -99,18 +493,265 @@ class AbstractParser(ABC):
 
         logger.info('| Start parsing page - sub elements...')
 
-        # Parse the page
-        res_info['data'] = await self._parse(context_page, browser_context)
+        try:
+            # Capture the HTML of every section of the page in one round trip
+            await self._sections(context_page)
+
+            # Parse the page
+            res_info['data'] = await self._parse(context_page, browser_context)
+
+            # Keep the HTML the page ended up with, --reparse reads it back
+            if self.config.archive_html and not self.config.offline and save_files:
+                await artifact_writer.write_text(
+                    archive_path(self.html_path, save_name),
+                    await context_page.content(),
+                )
+
+            # Take the screenshots of the sections in a separate stage
+            await self._take_screenshots(context_page)
+        finally:
+            # Close the context page
+            await context_page.close()
+            self._section_indexes.clear()
+            self._pending_screenshots.clear()
 
         logger.info('| Finish parsing page - sub elements...')
 
+        if self.sleep_saved:
+            timings.record(f'sleep_saved/{type(self).__name__}', self.sleep_saved)
+            logger.info(f'| Sleep saved by switches: {self.sleep_saved:.2f}s')
+
+        if fingerprint is not None:
+            crawl_state.set(
+                category, self.id, fingerprint, res_info, self.img_path, self.html_path
+            )
+
         logger.info('| Finish parsing page...')
 
-        # Close the context page
-        await context_page.close()
+        return res_info
+
+    def categories(self) -> Dict[str, Callable[..., Awaitable[Dict[str, Any]]]]:
+        """
+        Categories of a container, every one opens its own listing page
+        :return: category name -> parse method, empty if the page has no listings
+        """
+        return dict()
+
+    async def poll(
+        self, browser_context: Optional[BrowserContext] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch only the listings of the categories and parse the entries the
+        listing watcher has not seen, for the watch mode. The page of the
+        container is not opened and the listings are not saved
+        :param browser_context:
+        :return: the container summary with the categories in data
+        """
+        categories = self.categories()
+        if not categories:
+            return dict()
+
+        self.listings_only = True
+        try:
+            data = await self._run_categories(categories, browser_context)
+        finally:
+            self.listings_only = False
+
+        return dict(self._summary(), data=data)
+
+    async def _fingerprint(self, context_page: Page) -> Optional[str]:
+        """
+        Fingerprint of the rendered content of the page, the HTML of every
+        ready_selector match read in one round trip. The HTML is normalized
+        in a thread, classes, styles and lazy load state are left out
+        :param context_page:
+        :return: None if the parser is not crawled incrementally
+        """
+        if not (crawl_state.enabled and self.incremental and self.ready_selector):
+            return None
+
+        contents = await context_page.locator(self.ready_selector).evaluate_all(
+            'els => els.map(el => el.outerHTML)'
+        )
+        if not contents:
+            return None
+
+        return await asyncio.to_thread(fingerprint_of, contents)
+
+    async def _load_listing(
+        self,
+        category: str,
+        url: str,
+        browser_context: Optional[BrowserContext] = None,
+        ready_selector: Optional[str] = None,
+    ) -> Tuple[str, Optional[str], Optional[str]]:
+        """
+        Open a listing page in its own tab and save a screenshot of it, the
+        tab holds a slot of the shared work queue until the content is read.
+        A watch poll only reads the listing
+        :param category:
+        :param url:
+        :param browser_context:
+        :param ready_selector: css selector of the listing items
+        :return: content, img_path, html_path, no paths if nothing is saved
+        """
+        listings_only = self.listings_only
+
+        # Reserve the save name before waiting for a slot, so that the names
+        # follow the order in which the categories are started
+        save_name = f'{self.save_id:04d}_full'
+        if not listings_only:
+            self.save_id += 1
+
+        async def load() -> Tuple[str, Optional[str], Optional[str]]:
+            path = archive_path(self.html_path, save_name)
+            if self.config.offline:
+                # Read the listing archived by an earlier crawl
+                img_path = screenshot_encoder.path(self.img_path, save_name)
+                html_path = os.path.join(self.html_path, f'{save_name}.html')
+                if not os.path.exists(path):
+                    logger.info(f'| No archived HTML of {url}: {path}')
+                    return '', img_path, html_path
+                with open(path, encoding='utf-8') as f:
+                    return f.read(), img_path, html_path
+
+            context_page = await self._new_page(browser_context)
+            try:
+                # Open the page and wait until it is ready
+                await self._goto(context_page, url, ready_selector)
+
+                if listings_only:
+                    return await context_page.content(), None, None
+
+                # Save a screenshot of the page, every worker reads the
+                # listing but only the first one saves it
+                content, img_path, html_path = await self._save_screenshot(
+                    context_page=context_page,
+                    save_name=save_name,
+                    browser_context=browser_context,
+                    save_screen=self.save_screen and self.config.worker_index == 0,
+                )
+
+                # Keep the HTML of the listing, --reparse reads it back
+                if self.config.archive_html and self.config.worker_index == 0:
+                    await artifact_writer.write_text(path, content)
+
+                return content, img_path, html_path
+            finally:
+                await context_page.close()
+
+        return await self.scheduler.run(f'{category}_listing', load)
+
+    async def _run_categories(
+        self,
+        categories: Dict[str, Callable[..., Awaitable[Dict[str, Any]]]],
+        browser_context: Optional[BrowserContext] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run the categories as independent concurrent jobs, every category
+        opens its own listing page
+        :param categories: category name -> parse method
+        :param browser_context:
+        :return: category name -> result, in the order of the categories
+        """
+        results = await asyncio.gather(
+            *[method(None, browser_context) for method in categories.values()]
+        )
+
+        return dict(zip(categories.keys(), results, strict=True))
+
+    async def _run_entries(
+        self,
+        category: str,
+        parsers: List['AbstractParser'],
+        browser_context: Optional[BrowserContext] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse the entries of a category through the shared work queue, only
+        the entries of the shard of this worker are parsed
+        :param category:
+        :param parsers:
+        :param browser_context:
+        :return: results in the same order as the parsers
+        """
+        # In watch mode only the entries that appeared since the last poll
+        if listing_watcher.enabled:
+            new_ids = listing_watcher.new_ids(
+                category, [parser.id for parser in parsers]
+            )
+            parsers = [parser for parser in parsers if parser.id in new_ids]
+
+        # A resumed crawl skips the entries every durable sink has checkpointed
+        if result_sinks.resume:
+            completed = {
+                parser.id
+                for parser in parsers
+                if result_sinks.is_completed(category, parser.id)
+            }
+            if completed:
+                logger.info(f'| Resume {category}: skip {len(completed)} entries')
+                parsers = [parser for parser in parsers if parser.id not in completed]
+
+        # In a multi-process crawl every worker only parses its own shard
+        workers = self.config.workers
+        own = [
+            workers <= 1 or shard_of(parser.id, workers) == self.config.worker_index
+            for parser in parsers
+        ]
+        own_parsers = [
+            parser for parser, is_own in zip(parsers, own, strict=True) if is_own
+        ]
+
+        logger.info(f'| Schedule {len(own_parsers)} entries of {category}...')
+
+        own_results = iter(
+            await self.scheduler.map(
+                category,
+                [
+                    partial(self._parse_entry, category, parser, browser_context)
+                    for parser in own_parsers
+                ],
+            )
+        )
+
+        # The entries are only in the snapshot once they are crawled
+        if listing_watcher.enabled:
+            listing_watcher.commit(category, [parser.id for parser in own_parsers])
+
+        # The entries of the other shards keep their place in the listing as
+        # their summary, merging the shards fills them in listing order
+        return [
+            next(own_results) if is_own else parser._summary()
+            for parser, is_own in zip(parsers, own, strict=True)
+        ]
+
+    async def _parse_entry(
+        self,
+        category: str,
+        parser: 'AbstractParser',
+        browser_context: Optional[BrowserContext] = None,
+    ) -> Dict[str, Any]:
+        """
+        Parse an entry, with sinks its result is pushed into them right away
+        and only its summary is kept in memory
+        :param category:
+        :param parser:
+        :param browser_context:
+        :return:
+        """
+        res_info = await parser.parse(browser_context, category)
+
+        if result_sinks.enabled and res_info.get('data') is not None:
+            # Waits while a sink is behind, the slot is only freed once the
+            # result is queued
+            await result_sinks.put(category, res_info)
+            return parser._summary()
 
         return res_info
 
+    def _summary(self) -> Dict[str, Any]:
+        return {'url': self.url, 'id': self.id, 'name': self.name, 'icon': self.icon}
+
     async def _save_screenshot(
         self,
         context_page: Optional[Page] = None,
@@ -122,11 +763,24 @@ class AbstractParser(ABC):
         viewport_height_adjustment: int = 0,
         save_screen: bool = False,
     ):
-        img_path = os.path.join(self.img_path, f'{save_name}.png')
+        img_path = screenshot_encoder.path(self.img_path, save_name)
         html_path = os.path.join(self.html_path, f'{save_name}.html')
 
-        # Save a screenshot of the page
-        if save_screen:
+        # Save a screenshot of the page, in one go if the page expands
+        captured = False
+        if save_screen and self.config.capture_mode == 'tall':
+            captured = await tall_capture(
+                context_page,
+                img_path,
+                remove_footer=remove_footer,
+                tile_height=self.config.tall_tile_height,
+                image_timeout=self.config.tall_image_timeout,
+                preset=screenshot_encoder.preset,
+            )
+            if not captured:
+                logger.info(f'| Page does not expand, capture by scrolling: {self.url}')
+
+        if save_screen and not captured:
             await scroll_and_capture(
                 context_page,
                 img_path,
@@ -134,6 +788,8 @@ class AbstractParser(ABC):
                 remove_header=remove_header,
                 remove_footer=remove_footer,
                 viewport_height_adjustment=viewport_height_adjustment,
+                stitch_mode=self.config.stitch_mode,
+                preset=screenshot_encoder.preset,
             )
 
         # Get the page content
@@ -141,6 +797,6 @@ class AbstractParser(ABC):
 
         # Save the HTML content to a file
         if save_screen:
-            save_html_file(content, html_path)
+            await artifact_writer.write_html(html_path, content)
 
         return content, img_path, html_path
@@ -0,0 +1,52 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+__all__ = ['AbstractSink']
+
+
+class AbstractSink(ABC):
+    # A durable sink is part of the resume checkpoint: an entry only counts
+    # as done once every durable sink has synced it, a failed write stops the crawl
+    durable: bool = False
+
+    async def open(self, config) -> None:
+        """
+        open the sink before the first batch
+        :param config:
+        :return:
+        """
+        return None
+
+    @abstractmethod
+    async def write_batch(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        write a batch of parsed entries, blocking io belongs in a thread so
+        that a slow sink never stalls the event loop
+        :param batch: [(category, res_info)]
+        :return:
+        """
+        pass
+
+    async def sync(self) -> Any:
+        """
+        make every entry written so far durable, called by the checkpoints
+        of a durable sink
+        :return: json state that restore rolls the sink back to
+        """
+        return None
+
+    async def restore(self, state: Optional[Any]) -> None:
+        """
+        roll the files of this worker back to the last checkpoint before a
+        resumed crawl writes again, the entries after it are crawled again
+        :param state: returned by sync, None without a checkpoint
+        :return:
+        """
+        return None
+
+    async def close(self) -> None:
+        """
+        write what is left and release the sink
+        :return:
+        """
+        return None
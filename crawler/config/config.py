@@ -1,4 +1,5 @@
 import os
+import time
 from argparse import Namespace
 from typing import Any, Dict
 
@@ -22,6 +23,10 @@ def build_config(config_path: str, args: Namespace) -> Config:
 
     config.merge_from_dict(cfg_options)
 
+    # Every worker of a crawl shares the id of the crawl
+    if config.run_id is None:
+        config.run_id = time.strftime('%Y%m%d_%H%M%S')
+
     config.exp_path = assemble_project_path(config.exp_path)
     if config.if_remove is None:
         config.if_remove = bool(
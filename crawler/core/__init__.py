@@ -1,4 +1,6 @@
 from crawler.core.client import Client
 from crawler.core.core import Crawler
+from crawler.core.reparse import run_reparse
+from crawler.core.shard import merge_shards, run_workers
 
-__all__ = ['Crawler', 'Client']
+__all__ = ['Crawler', 'Client', 'run_workers', 'merge_shards', 'run_reparse']
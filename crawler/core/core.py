@@ -1,10 +1,14 @@
+import asyncio
+import json
 import os
+import time
 from typing import Any, Dict, Optional, Tuple
 
 from playwright.async_api import BrowserContext, BrowserType, async_playwright
 
-from crawler.base import AbstractCrawler, IpInfoModel
+from crawler.base import AbstractCrawler, AbstractParser, IpInfoModel
 from crawler.logger import logger
+from crawler.network import network_recorder, route_blocker
 from crawler.parser.strategy import StrategyParser
 from crawler.parser.summon import SummonParser
 from crawler.parser.wiki_pages.card import CardParser
@@ -12,11 +16,21 @@ from crawler.parser.wiki_pages.illustration import IllustrationParser
 from crawler.parser.wiki_pages.observation import ObservationParser
 from crawler.parser.wiki_pages.video_gallery import VideoGalleryParser
 from crawler.proxy import create_ip_pool
+from crawler.scheduler import WorkQueue, crawl_state, listing_watcher
+from crawler.utils.artifact_store import artifact_store
+from crawler.utils.artifact_writer import artifact_writer
 from crawler.utils.file_utils import assemble_project_path
+from crawler.utils.image_encode import screenshot_encoder
+from crawler.utils.image_pool import image_pool
+from crawler.utils.merge import merge_results
+from crawler.utils.metrics import timings
+from crawler.utils.screenshot_dedup import screenshot_dedup
+from crawler.writer import result_sinks
 
 
 class Crawler(AbstractCrawler):
     browser_context: BrowserContext
+    scheduler: WorkQueue
 
     def __init__(
         self,
@@ -47,8 +61,12 @@ class Crawler(AbstractCrawler):
         return playwright_proxy, httpx_proxy
 
     async def start(self):
+        if self.config.offline:
+            return await self.start_offline()
+
         playwright_proxy_format, httpx_proxy_format = None, None
-        if self.config.enable_ip_proxy:
+        # a replay never goes out to the network, it needs no proxy
+        if self.config.enable_ip_proxy and self.config.network_mode != 'replay':
             ip_proxy_pool = await create_ip_pool(
                 self.config.ip_proxy_pool_count, enable_validate_ip=True
             )
@@ -57,6 +75,13 @@ class Crawler(AbstractCrawler):
                 ip_proxy_info
             )
 
+        # the screenshots are saved with config.screenshot_preset, its pixel
+        # ratio is set on the browser context
+        screenshot_encoder.open(self.config)
+
+        # hashes of the screenshots of the last crawl, unchanged ones are linked
+        screenshot_dedup.open(self.config)
+
         async with async_playwright() as playwright:
             # Launch a browser context.
             chromium = playwright.chromium
@@ -79,7 +104,121 @@ class Crawler(AbstractCrawler):
                 ]
             )
 
-            await self.search()
+            # record the responses of the crawl, or serve recorded ones back
+            await network_recorder.attach(self.browser_context, self.config)
+
+            # block the requests the crawl does not need, registered after the
+            # recorder so that it sees every request first
+            await route_blocker.attach(
+                self.browser_context, self.config, self.config.route_profile
+            )
+
+            # results of the last crawl, reused for the unchanged entries
+            crawl_state.open(self.config)
+
+            # entry ids of the listings, the watch mode only crawls new ones
+            listing_watcher.open(self.config)
+
+            # entry results are pushed into the sinks as soon as they are parsed
+            await result_sinks.open(self.config)
+
+            # screenshots and HTML files are written by a pool of threads,
+            # through the content-addressed store with config.artifact_store
+            artifact_store.open(self.config)
+            artifact_writer.open(self.config)
+
+            # the page captures are decoded and stitched in a pool of processes
+            image_pool.open(self.config)
+
+            # shared work queue, every entry of every category goes through it
+            self.scheduler = WorkQueue(concurrency=self.config.concurrency)
+            report_task = asyncio.create_task(
+                self.scheduler.report(self.config.scheduler_report_interval)
+            )
+            sink_report_task = asyncio.create_task(
+                result_sinks.report(self.config.scheduler_report_interval)
+            )
+
+            try:
+                if self.config.watch:
+                    res_info = await self.watch()
+                else:
+                    res_info = await self.search()
+            finally:
+                report_task.cancel()
+                sink_report_task.cancel()
+                route_blocker.log_stats()
+                await result_sinks.close()
+                await artifact_writer.close()
+                await image_pool.close()
+                screenshot_encoder.log_stats()
+                screenshot_dedup.close()
+                await artifact_store.close()
+                network_recorder.log_stats()
+                crawl_state.log_stats()
+                timings.log_summary()
+
+        return res_info
+
+    async def watch(self) -> Dict[str, Any]:
+        """
+        Poll the listing pages every config.watch_interval seconds and crawl
+        only the entries that appeared since the last poll, until
+        config.watch_rounds polls are done (0 polls forever). Targets without
+        listings, strategy and summon, are not polled
+        """
+        res_info: Dict[str, Any] = dict()
+
+        rounds = 0
+        while True:
+            rounds += 1
+            logger.info(f'| Watch poll {rounds}...')
+
+            # Only the listings are fetched, the containers are not crawled again
+            round_info = await self.search(listings_only=True)
+
+            added = listing_watcher.reset_added()
+            if added:
+                # every poll that found new entries is saved on its own
+                round_path = os.path.join(
+                    self.config.exp_path,
+                    'watch',
+                    f'{time.strftime("%Y%m%d_%H%M%S")}.json',
+                )
+                os.makedirs(os.path.dirname(round_path), exist_ok=True)
+                with open(round_path, 'w', encoding='utf-8') as f:
+                    json.dump(round_info, f, ensure_ascii=False, indent=4)
+                logger.info(f'| Watch saved {added} new entries: {round_path}')
+
+                merge_results(res_info, round_info)
+            else:
+                logger.info('| Watch found no new entries')
+
+            if self.config.watch_rounds and rounds >= self.config.watch_rounds:
+                return res_info
+
+            await asyncio.sleep(self.config.watch_interval)
+
+    async def start_offline(self):
+        """Parse the HTML archived by an earlier crawl, no browser is launched"""
+        logger.info(f'| Start re-parsing the archive: {self.config.html_path}')
+
+        self.browser_context = None  # type: ignore
+        self.scheduler = WorkQueue(concurrency=self.config.concurrency)
+        await result_sinks.open(self.config)
+        artifact_store.open(self.config)
+        artifact_writer.open(self.config)
+        screenshot_encoder.open(self.config)
+
+        try:
+            res_info = await self.search()
+        finally:
+            await result_sinks.close()
+            await artifact_writer.close()
+            await artifact_store.close()
+            timings.log_summary()
+
+        return res_info
 
     async def launch_browser(
         self,
@@ -105,6 +244,7 @@ class Crawler(AbstractCrawler):
                 proxy=playwright_proxy,  # type: ignore
                 user_agent=user_agent,
                 java_script_enabled=True,
+                device_scale_factor=screenshot_encoder.device_scale_factor,
             )
             return browser_context
         else:
@@ -112,10 +252,19 @@ class Crawler(AbstractCrawler):
                 headless=headless,
                 proxy=playwright_proxy,
             )  # type: ignore
-            browser_context = await browser.new_context(user_agent=user_agent)
+            browser_context = await browser.new_context(
+                user_agent=user_agent,
+                device_scale_factor=screenshot_encoder.device_scale_factor,
+            )
             return browser_context
 
-    async def _parse_wiki(self):
+    def _crawl(self, parser: AbstractParser, listings_only: bool = False):
+        # A watch poll only fetches the listings of the container
+        if listings_only:
+            return parser.poll(self.browser_context)
+        return parser.parse(self.browser_context)
+
+    async def _parse_wiki(self, listings_only: bool = False):
         res_info: Dict[str, Any] = {}
 
         # # wiki (观测 Wiki)
@@ -143,9 +292,8 @@ class Crawler(AbstractCrawler):
             icon=None,
             img_path=self.config.img_path,
             html_path=self.config.html_path,
+            scheduler=self.scheduler,
         )
-        illustration_res_info = await illustration_parser.parse(self.browser_context)
-        logger.info(f'Illustration: {illustration_res_info}')
 
         # 卡牌图鉴 (卡牌图鉴)
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/231/233?bbs_presentation_style=no_header&visit_device=pc'
@@ -157,9 +305,8 @@ class Crawler(AbstractCrawler):
             icon=None,
             img_path=self.config.img_path,
             html_path=self.config.html_path,
+            scheduler=self.scheduler,
         )
-        card_res_info = await card_parser.parse(self.browser_context)
-        logger.info(f'Card: {card_res_info}')
 
         # 观测 影音回廊
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/80/212?bbs_presentation_style=no_header&visit_device=pc'
@@ -171,9 +318,8 @@ class Crawler(AbstractCrawler):
             icon=None,
             img_path=self.config.img_path,
             html_path=self.config.html_path,
+            scheduler=self.scheduler,
         )
-        video_gallery_res_info = await video_gallery_parser.parse(self.browser_context)
-        logger.info(f'VideoGallery: {video_gallery_res_info}')
 
         # 观测
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/190/7?bbs_presentation_style=no_header&visit_device=pc'
@@ -185,8 +331,25 @@ class Crawler(AbstractCrawler):
             icon=None,
             img_path=self.config.img_path,
             html_path=self.config.html_path,
+            scheduler=self.scheduler,
         )
-        observation_res_info = await observation_parser.parse(self.browser_context)
+
+        # The wiki pages are crawled concurrently, their entries share the
+        # concurrency budget of the work queue
+        (
+            illustration_res_info,
+            card_res_info,
+            video_gallery_res_info,
+            observation_res_info,
+        ) = await asyncio.gather(
+            self._crawl(illustration_parser, listings_only),
+            self._crawl(card_parser, listings_only),
+            self._crawl(video_gallery_parser, listings_only),
+            self._crawl(observation_parser, listings_only),
+        )
+        logger.info(f'Illustration: {illustration_res_info}')
+        logger.info(f'Card: {card_res_info}')
+        logger.info(f'VideoGallery: {video_gallery_res_info}')
         logger.info(f'Observation: {observation_res_info}')
 
         res_info.update(illustration_res_info)
@@ -196,7 +359,7 @@ class Crawler(AbstractCrawler):
 
         return res_info
 
-    async def _parse_strategy(self):
+    async def _parse_strategy(self, listings_only: bool = False):
         res_info: Dict[str, Any] = {}
 
         # strategy (观测 攻略)
@@ -209,15 +372,16 @@ class Crawler(AbstractCrawler):
             icon=None,
             img_path=self.config.img_path,
             html_path=self.config.html_path,
+            scheduler=self.scheduler,
         )
-        strategy_res_info = await strategy_parser.parse(self.browser_context)
+        strategy_res_info = await self._crawl(strategy_parser, listings_only)
         logger.info(f'Strategy: {strategy_res_info}')
 
         res_info.update(strategy_res_info)
 
         return res_info
 
-    async def _parse_summon(self):
+    async def _parse_summon(self, listings_only: bool = False):
         res_info: Dict[str, Any] = {}
 
         # summon (观测 七圣召唤)
@@ -232,21 +396,32 @@ class Crawler(AbstractCrawler):
             icon=None,
             img_path=self.config.img_path,
             html_path=self.config.html_path,
+            scheduler=self.scheduler,
         )
-        summon_res_info = await summon_parser.parse(self.browser_context)
+        summon_res_info = await self._crawl(summon_parser, listings_only)
         logger.info(f'Summon: {summon_res_info}')
 
         res_info.update(summon_res_info)
 
         return res_info
 
-    async def search(self):
-        # wiki
-        wiki_res_info = await self._parse_wiki()
-        logger.info(f'Wiki: {wiki_res_info}')
+    async def search(self, listings_only: bool = False):
+        res_info: Dict[str, Any] = {}
 
-        # # strategy
-        # strategy_res_info = await self._parse_strategy()
-        #
-        # # summon
-        # summon_res_info = await self._parse_summon()
+        jobs = {
+            'wiki': self._parse_wiki,
+            'strategy': self._parse_strategy,
+            'summon': self._parse_summon,
+        }
+        targets = [target for target in jobs if target in self.config.crawl_targets]
+
+        # Every target is an independent job, all of them run concurrently
+        results = await asyncio.gather(
+            *[jobs[target](listings_only) for target in targets]
+        )
+
+        for target, target_res_info in zip(targets, results, strict=True):
+            logger.info(f'{target.capitalize()}: {target_res_info}')
+            res_info[target] = target_res_info
+
+        return res_info
@@ -0,0 +1,29 @@
+import os
+from typing import Any, Dict
+
+from mmengine import Config
+
+from crawler.core.shard import run_workers
+from crawler.logger import logger
+
+__all__ = ['run_reparse']
+
+
+def run_reparse(config: Config) -> Dict[str, Any]:
+    """
+    Parse the HTML archived by an earlier crawl again, with the parsers of
+    this tree and without a browser. The entries are sharded across a pool
+    of processes the same way a multi-process crawl shards them.
+    :param config: config.exp_path is the experiment that is re-parsed
+    :return: merged result
+    """
+    config.offline = True
+    config.workers = config.reparse_workers or os.cpu_count() or 1
+
+    # The archive lives in the layout of configs/exp.py under the experiment
+    config.html_path = os.path.join(config.exp_path, 'html')
+    config.img_path = os.path.join(config.exp_path, 'img')
+
+    logger.info(f'| Re-parse {config.exp_path} with {config.workers} processes...')
+
+    return run_workers(config)
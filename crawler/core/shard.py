@@ -0,0 +1,92 @@
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+from mmengine import Config
+
+from crawler.core.core import Crawler
+from crawler.logger import logger
+from crawler.utils.merge import merge_results
+
+__all__ = ['run_workers', 'merge_shards']
+
+
+def _shard_path(exp_path: str, worker_index: int) -> str:
+    return os.path.join(exp_path, 'shards', f'worker_{worker_index:02d}.json')
+
+
+def _run_worker(cfg_dict: Dict[str, Any], worker_index: int) -> str:
+    """
+    Entry point of a worker process, crawl one shard with its own Chromium
+    :param cfg_dict:
+    :param worker_index:
+    :return: path of the shard result
+    """
+    config = Config(cfg_dict)
+    config.worker_index = worker_index
+    # Chromium locks its profile, every worker needs its own user data dir
+    config.user_data_dir = f'{config.user_data_dir}_worker_{worker_index:02d}'
+
+    logger.info(f'| Worker {worker_index}/{config.workers} start crawling...')
+
+    crawler = Crawler(config=config)
+    res_info = asyncio.run(crawler.start())
+
+    shard_path = _shard_path(config.exp_path, worker_index)
+    os.makedirs(os.path.dirname(shard_path), exist_ok=True)
+    with open(shard_path, 'w', encoding='utf-8') as f:
+        json.dump(res_info, f, ensure_ascii=False, indent=4)
+
+    logger.info(f'| Worker {worker_index}/{config.workers} saved shard: {shard_path}')
+
+    return shard_path
+
+
+def merge_shards(shards: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge the results of the workers into the layout of a single-process run.
+    Every entry is parsed in exactly one shard, the other shards hold its
+    summary at its place in the listing, so the merged entries are in listing
+    order. The listing level fields are the same in every shard and the first
+    shard that has them wins.
+    :param shards: results in the order of the worker index
+    :return:
+    """
+    res_info: Dict[str, Any] = dict()
+    for shard in shards:
+        merge_results(res_info, shard)
+    return res_info
+
+
+def run_workers(config: Config) -> Dict[str, Any]:
+    """
+    Shard the entries across config.workers processes by a stable hash of
+    their id, every process runs its own browser, then merge the shards
+    :param config:
+    :return: merged result
+    """
+    workers = config.workers
+    cfg_dict = config.to_dict()
+
+    logger.info(f'| Start {workers} crawl workers...')
+
+    # spawn, playwright and asyncio do not survive a fork
+    mp_context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+        futures = [
+            executor.submit(_run_worker, cfg_dict, worker_index)
+            for worker_index in range(workers)
+        ]
+        shard_paths = [future.result() for future in futures]
+
+    shards = []
+    for shard_path in shard_paths:
+        with open(shard_path, encoding='utf-8') as f:
+            shards.append(json.load(f))
+
+    logger.info(f'| Merge {len(shards)} shards...')
+
+    return merge_shards(shards)
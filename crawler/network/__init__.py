@@ -0,0 +1,4 @@
+from crawler.network.recorder import NetworkRecorder, network_recorder
+from crawler.network.route import RouteBlocker, route_blocker
+
+__all__ = ['RouteBlocker', 'route_blocker', 'NetworkRecorder', 'network_recorder']
@@ -0,0 +1,201 @@
+import asyncio
+import glob
+import hashlib
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from playwright.async_api import BrowserContext, Page, Request, Route
+
+from crawler.logger import logger
+from crawler.utils.file_utils import assemble_project_path
+
+__all__ = ['NetworkRecorder', 'network_recorder']
+
+# Headers that describe the transfer, not the body route.fetch hands back
+TRANSFER_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+class NetworkRecorder:
+    def __init__(self):
+        """
+        Record every response of a live crawl into an archive on disk, or
+        serve the archived responses back so that a crawl runs offline:
+
+            network_archive/
+                index_worker_00.jsonl   one line per recorded response
+                bodies/<sha1 of key>    the body of the response
+
+        Requests are keyed by method, url and post data, the query params in
+        config.replay_ignore_params (cache busters) are left out of the key.
+        The files are read and written in threads, off the event loop, and a
+        key is recorded once even when its requests run concurrently.
+        """
+        self.mode: Optional[str] = None
+        self.path: Optional[str] = None
+        self._index: Dict[str, Dict[str, Any]] = dict()
+        self._index_file: Optional[str] = None
+        # Keys whose response is being written
+        self._in_flight: Set[str] = set()
+        self._index_lock = threading.Lock()
+        self._ignore_params: set = set()
+
+        self.recorded: Dict[str, int] = defaultdict(int)
+        self.replayed: Dict[str, int] = defaultdict(int)
+        self.missed: Dict[str, int] = defaultdict(int)
+
+    @property
+    def active(self) -> bool:
+        return self.mode is not None
+
+    async def attach(self, target: Union[BrowserContext, Page], config) -> None:
+        """
+        Record or replay the requests of a browser context or page, following
+        config.network_mode
+        :param target: browser context or page
+        :param config:
+        :return:
+        """
+        mode = config.network_mode
+        if not mode:
+            return
+        if mode not in ('record', 'replay'):
+            raise ValueError(f'Unknown network mode: {mode}')
+
+        self.mode = mode
+        self.path = assemble_project_path(config.network_archive)
+        self._ignore_params = set(config.replay_ignore_params)
+        os.makedirs(os.path.join(self.path, 'bodies'), exist_ok=True)
+
+        if mode == 'replay':
+            self._load()
+        else:
+            # Every worker process appends to its own index
+            self._index_file = os.path.join(
+                self.path, f'index_worker_{config.worker_index:02d}.jsonl'
+            )
+
+        # The route blocker hands the requests it allows over to handle, the
+        # route only sees the requests of targets without a blocker
+        await target.route('**/*', self.handle)
+
+    def _load(self) -> None:
+        for index_file in sorted(glob.glob(os.path.join(self.path, 'index_*.jsonl'))):
+            with open(index_file, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._index.setdefault(entry['key'], entry)
+
+        logger.info(f'| Replay {len(self._index)} responses from {self.path}')
+
+    def _key(self, request: Request) -> str:
+        parts = urlsplit(request.url)
+        query = urlencode(
+            [
+                (name, value)
+                for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                if name not in self._ignore_params
+            ]
+        )
+        key = f'{request.method} {urlunsplit(parts._replace(query=query, fragment=""))}'
+
+        post_data = request.post_data_buffer
+        if post_data:
+            key += f' {hashlib.sha1(post_data).hexdigest()}'
+        return key
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(
+            self.path, 'bodies', hashlib.sha1(key.encode('utf-8')).hexdigest()
+        )
+
+    async def handle(self, route: Route, request: Request) -> None:
+        if self.mode == 'replay':
+            await self._replay(route, request)
+        else:
+            await self._record(route, request)
+
+    async def _record(self, route: Route, request: Request) -> None:
+        try:
+            response = await route.fetch()
+        except Exception as e:
+            logger.info(f'| Error: {e} - record {request.url}')
+            await route.abort()
+            return
+
+        key = self._key(request)
+        if key not in self._index and key not in self._in_flight:
+            self._in_flight.add(key)
+            try:
+                body = await response.body()
+                body_path = self._body_path(key)
+                entry = {
+                    'key': key,
+                    'url': request.url,
+                    'status': response.status,
+                    'headers': {
+                        name: value
+                        for name, value in response.headers.items()
+                        if name.lower() not in TRANSFER_HEADERS
+                    },
+                    'body': os.path.basename(body_path),
+                }
+                await asyncio.to_thread(self._write, body_path, body, entry)
+                self._index[key] = entry
+                self.recorded[request.resource_type] += 1
+            except Exception as e:
+                logger.info(f'| Error: {e} - record {request.url}')
+            finally:
+                self._in_flight.discard(key)
+
+        await route.fulfill(response=response)
+
+    def _write(self, body_path: str, body: bytes, entry: Dict[str, Any]) -> None:
+        with open(body_path, 'wb') as f:
+            f.write(body)
+        # The body is complete before the index points to it
+        with self._index_lock, open(self._index_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def _read(self, entry: Dict[str, Any]) -> bytes:
+        with open(os.path.join(self.path, 'bodies', entry['body']), 'rb') as f:
+            return f.read()
+
+    async def _replay(self, route: Route, request: Request) -> None:
+        entry = self._index.get(self._key(request))
+        if entry is None:
+            # Nothing is fetched in a replay, the crawl stays offline
+            self.missed[request.resource_type] += 1
+            await route.abort()
+            return
+
+        body = await asyncio.to_thread(self._read, entry)
+
+        self.replayed[request.resource_type] += 1
+        await route.fulfill(status=entry['status'], headers=entry['headers'], body=body)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'mode': self.mode,
+            'recorded': dict(self.recorded),
+            'replayed': dict(self.replayed),
+            'missed': dict(self.missed),
+        }
+
+    def log_stats(self) -> None:
+        if not self.active:
+            return
+        stats = self.stats()
+        logger.info(
+            f'| Network {self.mode}: recorded {sum(self.recorded.values())} '
+            f'{stats["recorded"]}, replayed {sum(self.replayed.values())} '
+            f'{stats["replayed"]}, missed {sum(self.missed.values())} '
+            f'{stats["missed"]}'
+        )
+
+
+network_recorder = NetworkRecorder()
@@ -0,0 +1,130 @@
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Union
+
+from playwright.async_api import BrowserContext, Page, Request, Response, Route
+
+from crawler.logger import logger
+from crawler.network.recorder import network_recorder
+
+__all__ = ['RouteBlocker', 'route_blocker']
+
+# Rough transfer sizes (bytes) used for the types never seen in the run
+DEFAULT_SIZES = {
+    'image': 60 * 1024,
+    'media': 512 * 1024,
+    'font': 40 * 1024,
+    'stylesheet': 20 * 1024,
+    'script': 30 * 1024,
+    'xhr': 2 * 1024,
+    'fetch': 2 * 1024,
+    'other': 4 * 1024,
+}
+
+
+class RouteBlocker:
+    def __init__(self):
+        """
+        Abort the requests a crawl does not need, following the route
+        profiles of the config:
+
+            route_profiles = dict(
+                data=dict(resource_types=['image', ...], url_patterns=[...]),
+            )
+
+        The profile of the browser context applies to every page, a parser
+        can override it for its own pages.
+        """
+        self.blocked: Dict[str, int] = defaultdict(int)
+        self.allowed: Dict[str, int] = defaultdict(int)
+        self._sizes: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+
+    async def attach(
+        self,
+        target: Union[BrowserContext, Page],
+        config,
+        profile: Optional[str] = None,
+    ) -> None:
+        """
+        Route every request of a browser context or page through a profile
+        :param target: browser context or page
+        :param config:
+        :param profile: name of the profile in config.route_profiles
+        :return:
+        """
+        if not profile:
+            return
+        if profile not in config.route_profiles:
+            raise ValueError(f'Unknown route profile: {profile}')
+
+        rules = config.route_profiles[profile]
+        resource_types = set(rules.get('resource_types', []))
+        url_patterns = [
+            re.compile(pattern) for pattern in rules.get('url_patterns', [])
+        ]
+
+        async def handle(route: Route, request: Request) -> None:
+            if self._should_block(request, resource_types, url_patterns):
+                self.blocked[request.resource_type] += 1
+                await route.abort()
+            else:
+                self.allowed[request.resource_type] += 1
+                if network_recorder.active:
+                    # Record or replay the request instead of fetching it
+                    await network_recorder.handle(route, request)
+                else:
+                    await route.continue_()
+
+        # Page routes take precedence over the routes of the context
+        await target.route('**/*', handle)
+
+        if isinstance(target, BrowserContext):
+            target.on('response', self._on_response)
+
+    @staticmethod
+    def _should_block(
+        request: Request, resource_types: set, url_patterns: List[re.Pattern]
+    ) -> bool:
+        if request.resource_type in resource_types:
+            return True
+        return any(pattern.search(request.url) for pattern in url_patterns)
+
+    def _on_response(self, response: Response) -> None:
+        # Learn the average size of every resource type from the allowed ones
+        content_length = response.headers.get('content-length')
+        if content_length and content_length.isdigit():
+            sizes = self._sizes[response.request.resource_type]
+            sizes[0] += int(content_length)
+            sizes[1] += 1
+
+    def _average_size(self, resource_type: str) -> int:
+        total, count = self._sizes.get(resource_type, [0, 0])
+        if count:
+            return total // count
+        return DEFAULT_SIZES.get(resource_type, DEFAULT_SIZES['other'])
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the blocked and allowed counts and the estimated bytes saved
+        :return:
+        """
+        bytes_saved = sum(
+            count * self._average_size(resource_type)
+            for resource_type, count in self.blocked.items()
+        )
+        return {
+            'blocked': dict(self.blocked),
+            'allowed': dict(self.allowed),
+            'bytes_saved': bytes_saved,
+        }
+
+    def log_stats(self) -> None:
+        stats = self.stats()
+        logger.info(
+            f'| Route blocked: {sum(self.blocked.values())} {stats["blocked"]}, '
+            f'allowed: {sum(self.allowed.values())}, '
+            f'saved: ~{stats["bytes_saved"] / 1024 / 1024:.2f}MB'
+        )
+
+
+route_blocker = RouteBlocker()
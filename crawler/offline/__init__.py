@@ -0,0 +1,3 @@
+from crawler.offline.page import OfflineLocator, OfflinePage
+
+__all__ = ['OfflineLocator', 'OfflinePage']
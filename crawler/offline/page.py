@@ -0,0 +1,150 @@
+from typing import Any, Dict, List, Optional
+
+from parsel.csstranslator import HTMLTranslator
+from scrapy.selector import Selector, SelectorList
+
+__all__ = ['OfflineLocator', 'OfflinePage']
+
+_translator = HTMLTranslator()
+
+
+def _css_to_xpath(css: str) -> str:
+    """Translate a css selector to an xpath that, like the locators of a
+    browser, only matches the descendants of an element
+    """
+    return _translator.css_to_xpath(css, prefix='descendant::')
+
+
+class OfflineLocator:
+    def __init__(self, selectors: List[Selector]) -> None:
+        """
+        Locator over archived HTML, backed by scrapy selectors. It has the
+        part of the playwright Locator api the parsers use, so that a parser
+        runs unchanged on a page saved by an earlier crawl.
+        :param selectors: the elements matched by the locator
+        """
+        self.selectors = list(selectors)
+
+    def locator(self, selector: str) -> 'OfflineLocator':
+        xpath = _css_to_xpath(selector)
+        matches: List[Selector] = []
+        for element in self.selectors:
+            matches.extend(element.xpath(xpath))
+        return OfflineLocator(matches)
+
+    @property
+    def first(self) -> 'OfflineLocator':
+        return OfflineLocator(self.selectors[:1])
+
+    @property
+    def last(self) -> 'OfflineLocator':
+        return OfflineLocator(self.selectors[-1:])
+
+    def nth(self, index: int) -> 'OfflineLocator':
+        return OfflineLocator(self.selectors[index : index + 1 or None])
+
+    async def all(self) -> List['OfflineLocator']:
+        return [OfflineLocator([element]) for element in self.selectors]
+
+    async def count(self) -> int:
+        return len(self.selectors)
+
+    def _element(self) -> Selector:
+        if not self.selectors:
+            raise LookupError('No element matches the offline locator')
+        return self.selectors[0]
+
+    async def text_content(self, **kwargs) -> str:
+        return ''.join(self._element().xpath('.//text()').getall())
+
+    async def inner_html(self, **kwargs) -> str:
+        return ''.join(self._element().xpath('./node()').getall())
+
+    async def outer_html(self) -> str:
+        return self._element().get()
+
+    async def get_attribute(self, name: str, **kwargs) -> Optional[str]:
+        return self._element().attrib.get(name)
+
+    async def evaluate(self, expression: str, arg: Any = None) -> Any:
+        # Archived HTML has no javascript, only the outer HTML can be read
+        if expression.replace(' ', '') == 'el=>el.outerHTML':
+            return await self.outer_html()
+        raise NotImplementedError(f'Offline pages can not evaluate: {expression}')
+
+    async def index_parts(
+        self, part_selector: str, title_selectors: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Offline counterpart of the script the section index is built with"""
+        sections = []
+        for part in self.locator(part_selector).selectors:
+            titles = dict()
+            for title_selector in title_selectors:
+                title = part.xpath(_css_to_xpath(title_selector))
+                titles[title_selector] = (
+                    ''.join(title[0].xpath('.//text()').getall()) if title else None
+                )
+            sections.append(
+                {
+                    'tag': part.root.tag,
+                    'classes': part.attrib.get('class', '').split(),
+                    'titles': titles,
+                    'html': part.get(),
+                }
+            )
+        return sections
+
+    async def read_swiper(self) -> List[Dict[str, Any]]:
+        """Offline counterpart of read_swiper, slides that were populated
+        lazily in the browser have no HTML in the archive either
+        """
+        swiper = self.locator('div.mhy-swiper')
+        if not swiper.selectors:
+            return []
+        bullets = swiper.locator('li.swiper-pagination-bullet').selectors
+        slides = swiper.locator('div.swiper-slide').selectors
+        return [
+            {
+                'label': ''.join(bullets[idx].xpath('.//text()').getall())
+                if idx < len(bullets)
+                else None,
+                'html': ''.join(slide.xpath('./node()').getall()),
+            }
+            for idx, slide in enumerate(slides)
+        ]
+
+
+class OfflinePage(OfflineLocator):
+    def __init__(self, content: str, url: Optional[str] = None) -> None:
+        """
+        Page loaded from archived HTML, nothing is rendered or requested
+        :param content: HTML of the page
+        :param url: url the page was crawled from
+        """
+        super().__init__(SelectorList([Selector(text=content)]))
+        self._content = content
+        self.url = url
+        self.viewport_size: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_file(cls, path: str, url: Optional[str] = None) -> 'OfflinePage':
+        with open(path, encoding='utf-8') as f:
+            return cls(f.read(), url=url)
+
+    def set_default_timeout(self, timeout: float) -> None:
+        pass
+
+    async def wait_for_selector(
+        self, selector: str, **kwargs
+    ) -> Optional[OfflineLocator]:
+        element = self.locator(selector).first
+        return element if element.selectors else None
+
+    async def wait_for_load_state(self, *args, **kwargs) -> None:
+        pass
+
+    async def content(self) -> str:
+        return self._content
+
+    async def close(self) -> None:
+        pass
@@ -6,7 +6,7 @@ from scrapy.selector import Selector
 
 from crawler.base import AbstractParser
 from crawler.logger import logger
-from crawler.utils.element import save_element_overleaf
+from crawler.scheduler import WorkQueue
 from crawler.utils.url import add_url
 
 __all__ = [
@@ -25,6 +25,7 @@ class StrategyParser(AbstractParser):
         id: str = 'strategy',
         name: str = 'strategy',
         icon: Optional[str] = None,
+        scheduler: Optional[WorkQueue] = None,
         **kwargs,
     ) -> None:
         # Initialize the parent class
@@ -36,6 +37,7 @@ class StrategyParser(AbstractParser):
             icon=icon,
             img_path=img_path,
             html_path=html_path,
+            scheduler=scheduler,
         )
 
     async def _parse_quick_navigation(
@@ -53,14 +55,8 @@ class StrategyParser(AbstractParser):
         element = context_page.locator('ul.home__map').nth(0)
 
         # Capture a screenshot of the element
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -109,14 +105,8 @@ class StrategyParser(AbstractParser):
         element = element.locator('li.home__position').nth(0)
 
         # Capture a screenshot of the element
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -142,14 +132,8 @@ class StrategyParser(AbstractParser):
         element = element.locator('li.home__position').nth(1)
 
         # Capture a screenshot of the element
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -175,14 +159,8 @@ class StrategyParser(AbstractParser):
         element = element.locator('li.home__position').nth(2)
 
         # Capture a screenshot of the element
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -208,14 +186,8 @@ class StrategyParser(AbstractParser):
         element = element.locator('li.home__position').nth(3)
 
         # Capture a screenshot of the element
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -241,14 +213,8 @@ class StrategyParser(AbstractParser):
         element = element.locator('li.home__position').nth(4)
 
         # Capture a screenshot of the element
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -275,14 +241,8 @@ class StrategyParser(AbstractParser):
         element = element.locator('li.home__position').nth(5)
 
         # Capture a screenshot of the element
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -5,7 +5,7 @@ from scrapy.selector import Selector
 
 from crawler.base import AbstractParser
 from crawler.logger import logger
-from crawler.utils.element import save_element_overleaf
+from crawler.scheduler import WorkQueue
 from crawler.utils.url import add_url
 
 __all__ = [
@@ -24,6 +24,7 @@ class SummonParser(AbstractParser):
         id: str = 'summon',
         name: str = 'summon',
         icon: Optional[str] = None,
+        scheduler: Optional[WorkQueue] = None,
         **kwargs,
     ) -> None:
         # Initialize the parent class
@@ -35,6 +36,7 @@ class SummonParser(AbstractParser):
             icon=icon,
             img_path=img_path,
             html_path=html_path,
+            scheduler=scheduler,
         )
 
     async def _parse_quick_navigation(
@@ -54,14 +56,8 @@ class SummonParser(AbstractParser):
         element = element.locator('div.summon-king').nth(0)
 
         # Capture a screenshot of the element
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -111,14 +107,8 @@ class SummonParser(AbstractParser):
         element = element.locator('div.home-channel').nth(0)
 
         # Capture a screenshot of the element
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -147,14 +137,8 @@ class SummonParser(AbstractParser):
         element = element.locator('div.home-channel').nth(1)
 
         # Capture a screenshot of the element
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -183,14 +167,8 @@ class SummonParser(AbstractParser):
         element = element.locator('div.home-channel').nth(2)
 
         # Capture a screenshot of the element
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
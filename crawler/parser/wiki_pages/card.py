@@ -1,6 +1,5 @@
-import asyncio
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from playwright.async_api import BrowserContext, Page
 from scrapy.selector import Selector
@@ -12,6 +11,7 @@ from crawler.parser.wiki_pages.card_pages import (
     CharacterCardParser,
     MonsterCardParser,
 )
+from crawler.scheduler import WorkQueue
 from crawler.utils.url import add_url
 
 __all__ = [
@@ -20,6 +20,9 @@ __all__ = [
 
 
 class CardParser(AbstractParser):
+    ready_selector = 'div.position-list.position-list--cardFilter a.card-filter__box'
+    incremental = False
+
     def __init__(
         self,
         *args,
@@ -30,6 +33,7 @@ class CardParser(AbstractParser):
         id: str = 'card',
         name: str = 'card',
         icon: Optional[str] = None,
+        scheduler: Optional[WorkQueue] = None,
         **kwargs,
     ) -> None:
         # Initialize the parent class
@@ -41,6 +45,7 @@ class CardParser(AbstractParser):
             icon=icon,
             img_path=img_path,
             html_path=html_path,
+            scheduler=scheduler,
         )
 
     async def _parse_character_card(
@@ -52,25 +57,16 @@ class CardParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/231/233?bbs_presentation_style=no_header&visit_device=pc'
 
-        logger.info(f'| Go to the page {url}')
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'character_card',
+            url,
+            browser_context,
+            ready_selector='div.position-list.position-list--cardFilter a.card-filter__box',
+        )
 
         # start parsing
         logger.info('| Start parsing character card...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -91,8 +87,7 @@ class CardParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'character_card')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        character_cards_info = []
+        parsers = []
         for idx, character_card in enumerate(character_card_list):
             href = character_card.xpath('./@href').extract_first()
             id = href.split('/')[4]  # Extract the character ID from the URL
@@ -120,15 +115,11 @@ class CardParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(character_card_parser.parse(browser_context))
+            parsers.append(character_card_parser)
 
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                character_cards_info.extend(await self._run_batch(tasks))
-                tasks = []  # Reset tasks for the next batch
-
-        if tasks:
-            character_cards_info.extend(await self._run_batch(tasks))
+        character_cards_info = await self._run_entries(
+            'character_card', parsers, browser_context
+        )
 
         res_info['data'].update({item['name']: item for item in character_cards_info})
 
@@ -145,25 +136,16 @@ class CardParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/231/234?bbs_presentation_style=no_header&visit_device=pc'
 
-        logger.info(f'| Go to the page {url}')
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'action_card',
+            url,
+            browser_context,
+            ready_selector='div.position-list.position-list--cardFilter a.card-filter__box',
+        )
 
         # start parsing
         logger.info('| Start parsing action card...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -184,8 +166,7 @@ class CardParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'action_card')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        action_cards_info = []
+        parsers = []
         for idx, action_card in enumerate(action_card_list):
             href = action_card.xpath('./@href').extract_first()
             id = href.split('/')[4]
@@ -212,15 +193,11 @@ class CardParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(action_card_parser.parse(browser_context))
-
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                action_cards_info.extend(await self._run_batch(tasks))
-                tasks = []
+            parsers.append(action_card_parser)
 
-        if tasks:
-            action_cards_info.extend(await self._run_batch(tasks))
+        action_cards_info = await self._run_entries(
+            'action_card', parsers, browser_context
+        )
 
         res_info['data'].update({item['name']: item for item in action_cards_info})
 
@@ -237,25 +214,16 @@ class CardParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/231/235?bbs_presentation_style=no_header&visit_device=pc'
 
-        logger.info(f'| Go to the page {url}')
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'monster_card',
+            url,
+            browser_context,
+            ready_selector='div.position-list.position-list--cardFilter a.card-filter__box',
+        )
 
         # start parsing
         logger.info('| Start parsing action card...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -276,8 +244,7 @@ class CardParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'monster_card')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        monster_cards_info = []
+        parsers = []
         for idx, action_card in enumerate(action_card_list):
             href = action_card.xpath('./@href').extract_first()
             id = href.split('/')[4]
@@ -304,15 +271,11 @@ class CardParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(action_card_parser.parse(browser_context))
-
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                monster_cards_info.extend(await self._run_batch(tasks))
-                tasks = []
+            parsers.append(action_card_parser)
 
-        if tasks:
-            monster_cards_info.extend(await self._run_batch(tasks))
+        monster_cards_info = await self._run_entries(
+            'monster_card', parsers, browser_context
+        )
 
         res_info['data'].update({item['name']: item for item in monster_cards_info})
 
@@ -320,11 +283,12 @@ class CardParser(AbstractParser):
 
         return res_info
 
-    async def _run_batch(self, tasks):
-        """
-        Run a batch of tasks and handle any potential errors.
-        """
-        return await asyncio.gather(*tasks)
+    def categories(self) -> Dict[str, Callable[..., Awaitable[Dict[str, Any]]]]:
+        return {
+            '角色牌': self._parse_character_card,
+            '行动牌': self._parse_action_card,
+            '魔物牌': self._parse_monster_card,
+        }
 
     async def _parse(
         self,
@@ -336,18 +300,8 @@ class CardParser(AbstractParser):
         :return: res_info: Dict[str, Any]
         """
 
-        res_info: Dict[str, Any] = dict()
-
-        res_info['角色牌'] = await self._parse_character_card(
-            context_page, browser_context
-        )
-
-        res_info['行动牌'] = await self._parse_action_card(
-            context_page, browser_context
-        )
-
-        res_info['魔物牌'] = await self._parse_monster_card(
-            context_page, browser_context
-        )
+        # Every category is an independent job, the listing pages and the
+        # entries of all categories share the global concurrency budget
+        res_info = await self._run_categories(self.categories(), browser_context)
 
         return res_info
@@ -1,4 +1,3 @@
-import asyncio
 from typing import Any, Dict, Optional
 
 from playwright.async_api import BrowserContext, Page
@@ -6,7 +5,7 @@ from scrapy.selector import Selector
 
 from crawler.base import AbstractParser
 from crawler.logger import logger
-from crawler.utils.element import element_exists, save_element_overleaf
+from crawler.utils.element import element_exists
 
 __all__ = [
     'CharacterCardParser',
@@ -14,6 +13,8 @@ __all__ = [
 
 
 class CharacterCardParser(AbstractParser):
+    ready_selector = 'div.wiki-consumer-content-tab'
+
     def __init__(
         self,
         *args,
@@ -53,14 +54,8 @@ class CharacterCardParser(AbstractParser):
         if not await element_exists(element):
             return res_info
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -107,14 +102,8 @@ class CharacterCardParser(AbstractParser):
         if not await element_exists(element):
             return res_info
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -178,14 +167,8 @@ class CharacterCardParser(AbstractParser):
         if not await element_exists(element):
             return res_info
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -240,19 +223,19 @@ class CharacterCardParser(AbstractParser):
 
         logger.info('| Start parsing page - 卡牌故事 - element...')
 
-        # Locate the matching element
-        elements = await element.locator(
-            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel'
-        ).all()
+        # Locate the matching element in the section index
+        sections = await self._sections(element)
 
-        if not await element_exists(elements):
+        if not sections.exists(
+            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel'
+        ):
             return res_info
 
-        for ele in elements:
-            title = await ele.locator('div.obc-tmpl-fold__title').text_content()
-            if '卡牌故事' in title:
-                element = ele
-                break
+        section = sections.find(
+            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel', '卡牌故事'
+        )
+        if section is not None:
+            element = section
 
         if (
             await element.locator(
@@ -263,20 +246,13 @@ class CharacterCardParser(AbstractParser):
             button = element.locator(
                 'div.el-tooltip.obc-tmpl__fold-tag.show-expand.undefined'
             ).first
-            await button.click()
-            await asyncio.sleep(1)
+            await self._switch(button, watch=element)
 
         save_name = f'{self.save_id:04d}_卡牌故事'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
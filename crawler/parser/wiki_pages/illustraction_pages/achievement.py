@@ -5,7 +5,6 @@ from scrapy.selector import Selector
 
 from crawler.base import AbstractParser
 from crawler.logger import logger
-from crawler.utils.element import save_element_overleaf
 from crawler.utils.url import add_url
 
 __all__ = [
@@ -14,6 +13,8 @@ __all__ = [
 
 
 class AchievementParser(AbstractParser):
+    ready_selector = '.obc-tmpl-part'
+
     def __init__(
         self,
         *args,
@@ -46,19 +47,12 @@ class AchievementParser(AbstractParser):
         save_name = f'{self.save_id:04d}_基础信息'
         self.save_id += 1
 
-        # Locate the matching element
-        element = context_page.locator(
-            'table.obc-tmpl-part.obc-tmpl-materialBaseInfo'
-        ).first  # type: ignore
-
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('table.obc-tmpl-part.obc-tmpl-materialBaseInfo')
+
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -161,21 +155,16 @@ class AchievementParser(AbstractParser):
         try:
             context_page.set_default_timeout(2000)
 
-            element = context_page.locator(
+            sections = await self._sections(context_page)
+            element = sections.find(
                 'div.wiki-consumer-module-strategy.obc-tmpl-part.obc-tmpl-strategy'
-            ).first  # type: ignore
+            )
 
             save_name = f'{self.save_id:04d}_攻略推荐'
             self.save_id += 1
 
-            content, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
+            content, img_path, html_path = await self._capture(
+                context_page, element, save_name
             )
 
             # Save the results to the dictionary
@@ -185,14 +174,8 @@ class AchievementParser(AbstractParser):
 
             item_info: Dict[str, Any] = dict()
 
-            content, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
+            content, img_path, html_path = await self._capture(
+                context_page, element, save_name
             )
 
             item_info['img_path'] = img_path
@@ -5,7 +5,6 @@ from scrapy.selector import Selector
 
 from crawler.base import AbstractParser
 from crawler.logger import logger
-from crawler.utils.element import save_element_overleaf
 
 __all__ = [
     'ActivityParser',
@@ -13,6 +12,8 @@ __all__ = [
 
 
 class ActivityParser(AbstractParser):
+    ready_selector = '.obc-tmpl-part'
+
     def __init__(
         self,
         *args,
@@ -43,30 +44,18 @@ class ActivityParser(AbstractParser):
 
         logger.info('| Start parsing page - 基础信息 - element...')
 
-        # Locate the matching element
-        elements = await context_page.locator(
-            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel'
-        ).all()
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
 
-        # filter the element
-        element = None
-        for ele in elements:
-            title = await ele.locator('div.obc-tmpl-fold__title').text_content()
-            if self.name in title:
-                element = ele
-                break
+        element = sections.find(
+            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel', self.name
+        )
 
         save_name = f'{self.save_id:04d}_基础信息'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
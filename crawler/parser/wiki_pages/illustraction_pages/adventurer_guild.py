@@ -1,4 +1,3 @@
-import asyncio
 from itertools import zip_longest
 from typing import Any, Dict, Optional
 
@@ -7,8 +6,6 @@ from scrapy.selector import Selector
 
 from crawler.base import AbstractParser
 from crawler.logger import logger
-from crawler.utils.element import save_element_overleaf
-from crawler.utils.html_files import save_html_file
 from crawler.utils.url import add_url
 
 __all__ = [
@@ -17,6 +14,8 @@ __all__ = [
 
 
 class AdventurerGuildParser(AbstractParser):
+    ready_selector = '.obc-tmpl-part'
+
     def __init__(
         self,
         *args,
@@ -48,20 +47,15 @@ class AdventurerGuildParser(AbstractParser):
         logger.info('| Start parsing page - 基础信息 - element...')
 
         if not element:
-            # Locate the matching element
-            element = context_page.locator('div.obc-tmpl-part.obc-tmpl-baseInfo')
+            # Locate the matching element in the section index
+            sections = await self._sections(context_page)
+            element = sections.find('div.obc-tmpl-part.obc-tmpl-baseInfo')
 
         save_name = f'{self.save_id:04d}_基础信息'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -102,16 +96,12 @@ class AdventurerGuildParser(AbstractParser):
         logger.info('| Start parsing page - 任务过程 - element...')
 
         if not element:
-            # Locate the matching element
-            elements = await context_page.locator(
-                'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel'
-            ).all()
+            # Locate the matching element in the section index
+            sections = await self._sections(context_page)
 
-            for ele in elements:
-                title = await ele.locator('div.obc-tmpl-fold__title').text_content()
-                if '任务过程' in title:
-                    element = ele
-                    break
+            element = sections.find(
+                'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel', '任务过程'
+            )
 
         if (
             await element.locator(
@@ -122,20 +112,13 @@ class AdventurerGuildParser(AbstractParser):
             button = element.locator(
                 'div.el-tooltip.obc-tmpl__fold-tag.show-expand.undefined'
             ).first
-            await button.click()
-            await asyncio.sleep(1)
+            await self._switch(button, watch=element)
 
         save_name = f'{self.save_id:04d}_任务过程'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -161,29 +144,18 @@ class AdventurerGuildParser(AbstractParser):
         logger.info('| Start parsing page - 任务奖励 - element...')
 
         if not element:
-            # Locate the matching element
-            elements = await context_page.locator(
-                'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel'
-            ).all()
-
-            # filter the element
-            for ele in elements:
-                title = await ele.locator('div.obc-tmpl-fold__title').text_content()
-                if '任务奖励' in title:
-                    element = ele
-                    break
+            # Locate the matching element in the section index
+            sections = await self._sections(context_page)
+
+            element = sections.find(
+                'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel', '任务奖励'
+            )
 
         save_name = f'{self.save_id:04d}_任务奖励'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -251,20 +223,15 @@ class AdventurerGuildParser(AbstractParser):
         logger.info('| Start parsing page - 地图说明 - element...')
 
         if not element:
-            # Locate the matching element
-            element = context_page.locator('div.obc-tmpl-part.obc-tmpl-mapDesc')
+            # Locate the matching element in the section index
+            sections = await self._sections(context_page)
+            element = sections.find('div.obc-tmpl-part.obc-tmpl-mapDesc')
 
         save_name = f'{self.save_id:04d}_地图说明'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -279,31 +246,23 @@ class AdventurerGuildParser(AbstractParser):
         slides_data = (
             await element.locator('div.mhy-swiper').locator('div.swiper-slide').all()
         )
+        # Read every slide in one round trip, no slide switching needed
+        slides_info = await self._read_slides(element)
 
         for idx, (slide, slide_data) in enumerate(zip(slides, slides_data)):
             item_info: Dict[str, Any] = dict()
 
-            name = await slide.text_content()
-
-            await slide.click()
-            await asyncio.sleep(1)
+            name = slides_info[idx]['label']
 
-            # Capture a screenshot of the element
-            content, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
+            content, img_path, html_path = await self._capture_slide(
+                context_page,
+                element,
+                slide,
+                slide_data,
+                slides_info[idx]['html'],
+                save_name,
             )
 
-            content = await slide_data.inner_html()
-
-            # Overwrite the HTML content to a file
-            save_html_file(content, html_path)
-
             item_info['img_path'] = img_path
             item_info['html_path'] = html_path
 
@@ -324,10 +283,9 @@ class AdventurerGuildParser(AbstractParser):
         logger.info('| Start parsing page - 剧情对话 - element...')
 
         if not element:
-            # Locate the matching element
-            element = context_page.locator(
-                'div.obc-tmpl-part.obc-tmpl-interactiveDialogue'
-            )
+            # Locate the matching element in the section index
+            sections = await self._sections(context_page)
+            element = sections.find('div.obc-tmpl-part.obc-tmpl-interactiveDialogue')
 
         if (
             await element.locator(
@@ -338,20 +296,13 @@ class AdventurerGuildParser(AbstractParser):
             button = element.locator(
                 'div.el-tooltip.obc-tmpl__fold-tag.show-expand.undefined'
             ).first
-            await button.click()
-            await asyncio.sleep(1)
+            await self._switch(button, watch=element)
 
         save_name = f'{self.save_id:04d}_剧情对话'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -373,35 +324,25 @@ class AdventurerGuildParser(AbstractParser):
     ) -> Dict[str, Any]:
         res_info: Dict[str, Any] = dict()
 
+        # Locate the sections of every task in the section index
+        sections = await self._sections(context_page)
+
         # 基础信息个数
-        base_info_elements = await context_page.locator(
-            'div.obc-tmpl-part.obc-tmpl-baseInfo'
-        ).all()
+        base_info_elements = sections.find_all('div.obc-tmpl-part.obc-tmpl-baseInfo')
         # 任务过程个数
-        elements = await context_page.locator(
-            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel'
-        ).all()
-        task_process_elements = [
-            ele
-            for ele in elements
-            if '任务过程'
-            in await ele.locator('div.obc-tmpl-fold__title').text_content()
-        ]
+        task_process_elements = sections.find_all(
+            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel', '任务过程'
+        )
         # 任务奖励个数
-        task_reward_elements = [
-            ele
-            for ele in elements
-            if '任务奖励'
-            in await ele.locator('div.obc-tmpl-fold__title').text_content()
-        ]
+        task_reward_elements = sections.find_all(
+            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel', '任务奖励'
+        )
         # 地图说明个数
-        map_text_elements = await context_page.locator(
-            'div.obc-tmpl-part.obc-tmpl-mapDesc'
-        ).all()
+        map_text_elements = sections.find_all('div.obc-tmpl-part.obc-tmpl-mapDesc')
         # 剧情对话个数
-        story_dialogue_elements = await context_page.locator(
+        story_dialogue_elements = sections.find_all(
             'div.obc-tmpl-part.obc-tmpl-interactiveDialogue'
-        ).all()
+        )
 
         for idx, (
             base_info_element,
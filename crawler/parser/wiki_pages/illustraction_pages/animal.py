@@ -5,7 +5,6 @@ from scrapy.selector import Selector
 
 from crawler.base import AbstractParser
 from crawler.logger import logger
-from crawler.utils.element import save_element_overleaf
 from crawler.utils.url import add_url
 
 __all__ = [
@@ -14,6 +13,8 @@ __all__ = [
 
 
 class AnimalParser(AbstractParser):
+    ready_selector = '.obc-tmpl-part'
+
     def __init__(
         self,
         *args,
@@ -44,22 +45,15 @@ class AnimalParser(AbstractParser):
 
         logger.info('| Start parsing page - 基础信息 - element...')
 
-        # Locate the matching element
-        element = context_page.locator(
-            'div.obc-tmpl-part.obc-tmpl-monsterBaseInfo'
-        ).first
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-monsterBaseInfo')
 
         save_name = f'{self.save_id:04d}_基础信息'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -95,20 +89,15 @@ class AnimalParser(AbstractParser):
 
         logger.info('| Start parsing page - 背景故事 - element...')
 
-        # Locate the matching element
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-goodDesc').first
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-goodDesc')
 
         save_name = f'{self.save_id:04d}_背景故事'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -134,30 +123,16 @@ class AnimalParser(AbstractParser):
 
         logger.info('| Start parsing page - 攻略方法 - element...')
 
-        # Locate the matching element
-        elements = await context_page.locator(
-            'div.obc-tmpl-part.obc-tmpl-collapsePanel'
-        ).all()
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
 
-        # filter the element
-        element = None
-        for ele in elements:
-            title = await ele.locator('div.obc-tmpl-fold__title').text_content()
-            if '攻略方法' in title:
-                element = ele
-                break
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-collapsePanel', '攻略方法')
 
         save_name = f'{self.save_id:04d}_攻略方法'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -5,7 +5,6 @@ from scrapy.selector import Selector
 
 from crawler.base import AbstractParser
 from crawler.logger import logger
-from crawler.utils.element import save_element_overleaf
 from crawler.utils.parse_utils import get_item
 from crawler.utils.url import add_url
 
@@ -15,6 +14,8 @@ __all__ = [
 
 
 class ArtifactParser(AbstractParser):
+    ready_selector = '.obc-tmpl-part'
+
     def __init__(
         self,
         *args,
@@ -47,17 +48,12 @@ class ArtifactParser(AbstractParser):
         save_name = f'{self.save_id:04d}_基础信息'
         self.save_id += 1
 
-        # Locate the matching element
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-richBaseInfo').first  # type: ignore
-
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-richBaseInfo')
+
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -102,14 +98,8 @@ class ArtifactParser(AbstractParser):
         ).all()
 
         for element in elements:
-            content, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
+            content, img_path, html_path = await self._capture(
+                context_page, element, save_name
             )
 
             # Convert the element to scrapy selector
@@ -151,15 +141,14 @@ class ArtifactParser(AbstractParser):
         save_name = f'{self.save_id:04d}_搭配推荐'
         self.save_id += 1
 
-        # Locate the matching element
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-multiTable').first
-
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-multiTable')
+
+        content, img_path, html_path = await self._capture(
+            context_page,
+            element,
+            save_name,
             set_width_scale=1.0,
             set_height_scale=4.0,
         )
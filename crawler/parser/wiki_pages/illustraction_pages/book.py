@@ -5,7 +5,6 @@ from scrapy.selector import Selector
 
 from crawler.base import AbstractParser
 from crawler.logger import logger
-from crawler.utils.element import save_element_overleaf
 from crawler.utils.url import add_url
 
 __all__ = [
@@ -14,6 +13,8 @@ __all__ = [
 
 
 class BookParser(AbstractParser):
+    ready_selector = '.obc-tmpl-part'
+
     def __init__(
         self,
         *args,
@@ -48,22 +49,15 @@ class BookParser(AbstractParser):
         logger.info('| Start parsing page - 基础信息 - element...')
 
         if element is None:
-            # Locate the matching element
-            element = context_page.locator(
-                'table.obc-tmpl-part.obc-tmpl-materialBaseInfo'
-            ).first
+            # Locate the matching element in the section index
+            sections = await self._sections(context_page)
+            element = sections.find('table.obc-tmpl-part.obc-tmpl-materialBaseInfo')
 
         save_name = f'{self.save_id:04d}_基础信息'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -138,22 +132,17 @@ class BookParser(AbstractParser):
         logger.info('| Start parsing page - 背景故事 - element...')
 
         if element is None:
-            # Locate the matching element
-            element = context_page.locator(
+            # Locate the matching element in the section index
+            sections = await self._sections(context_page)
+            element = sections.find(
                 'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel'
-            ).first
+            )
 
         save_name = f'{self.save_id:04d}_背景故事'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
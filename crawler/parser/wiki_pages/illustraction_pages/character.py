@@ -1,4 +1,3 @@
-import asyncio
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
@@ -7,8 +6,6 @@ from scrapy.selector import Selector
 
 from crawler.base import AbstractParser
 from crawler.logger import logger
-from crawler.utils.element import save_element_overleaf
-from crawler.utils.html_files import save_html_file
 from crawler.utils.url import add_url
 
 __all__ = [
@@ -42,6 +39,8 @@ class Voice:
 
 
 class CharacterParser(AbstractParser):
+    ready_selector = 'div.obc-tmp-character__pc, .obc-tmpl-part'
+
     def __init__(
         self,
         *args,
@@ -77,14 +76,8 @@ class CharacterParser(AbstractParser):
         # Locate the matching element
         element = context_page.locator('div.obc-tmp-character__pc').first  # type: ignore
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -142,16 +135,11 @@ class CharacterParser(AbstractParser):
 
         logger.info('| Start parsing page - 角色突破 - element...')
 
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-roleAscension').first
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-roleAscension')
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -167,39 +155,28 @@ class CharacterParser(AbstractParser):
         slides_data = (
             await element.locator('div.mhy-swiper').locator('div.swiper-slide').all()
         )
+        # Read every slide in one round trip, no slide switching needed
+        slides_info = await self._read_slides(element)
 
         for idx, (slide, slide_data) in enumerate(zip(slides, slides_data)):
             item_info: Dict[str, Any] = dict()
 
-            role_ascension_level = await slide.text_content()
+            role_ascension_level = slides_info[idx]['label']
             role_ascension_level = role_ascension_level.strip().replace('/', '')
             item_info['突破等级'] = role_ascension_level
 
             save_name = f'{self.save_id:04d}_角色突破_{role_ascension_level}'
             self.save_id += 1
 
-            await slide.click()
-            await asyncio.sleep(1)
-
-            element = context_page.locator(
-                'div.obc-tmpl-part.obc-tmpl-roleAscension'
-            ).first
-
-            # Capture a screenshot of the element
-            content, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
+            content, img_path, html_path = await self._capture_slide(
+                context_page,
+                element,
+                slide,
+                slide_data,
+                slides_info[idx]['html'],
+                save_name,
             )
 
-            content = await slide_data.inner_html()
-
-            # Overwrite the HTML content to a file
-            save_html_file(content, html_path)
             item_info['img_path'] = img_path
             item_info['html_path'] = html_path
 
@@ -275,16 +252,11 @@ class CharacterParser(AbstractParser):
 
         logger.info('| Start parsing page - 推荐装备 - element...')
 
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-recommend').first
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-recommend')
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -300,6 +272,8 @@ class CharacterParser(AbstractParser):
         slides_data = (
             await element.locator('div.mhy-swiper').locator('div.swiper-slide').all()
         )
+        # Read every slide in one round trip, no slide switching needed
+        slides_info = await self._read_slides(element)
 
         # 武器推荐
         slide = slides[0]
@@ -307,27 +281,20 @@ class CharacterParser(AbstractParser):
 
         item_info: Dict[str, Any] = dict()
 
-        await slide.click()
-        await asyncio.sleep(1)
-
         save_name = f'{self.save_id:04d}_推荐装备_武器推荐'
 
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-recommend').first
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-recommend')
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture_slide(
+            context_page,
+            element,
+            slide,
+            slide_data,
+            slides_info[0]['html'],
+            save_name,
         )
 
-        content = await slide_data.inner_html()
-
-        save_html_file(content, html_path)
-
         item_info['img_path'] = img_path
         item_info['html_path'] = html_path
 
@@ -363,27 +330,20 @@ class CharacterParser(AbstractParser):
 
         item_info: Dict[str, Any] = dict()
 
-        await slide.click()
-        await asyncio.sleep(1)
-
         save_name = f'{self.save_id:04d}_推荐装备_圣遗物推荐'
 
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-recommend').first
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-recommend')
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture_slide(
+            context_page,
+            element,
+            slide,
+            slide_data,
+            slides_info[1]['html'],
+            save_name,
         )
 
-        content = await slide_data.inner_html()
-
-        save_html_file(content, html_path)
-
         item_info['img_path'] = img_path
         item_info['html_path'] = html_path
 
@@ -428,18 +388,13 @@ class CharacterParser(AbstractParser):
 
         logger.info('| Start parsing page - 推荐攻略 - element...')
 
-        element = context_page.locator(
+        sections = await self._sections(context_page)
+        element = sections.find(
             'div.wiki-consumer-module-strategy.obc-tmpl-part.obc-tmpl-strategy'
-        ).first
-
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        )
+
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -449,14 +404,8 @@ class CharacterParser(AbstractParser):
 
         item_info: Dict[str, Any] = dict()
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         item_info['img_path'] = img_path
@@ -497,16 +446,11 @@ class CharacterParser(AbstractParser):
 
         logger.info('| Start parsing page - 天赋 - element...')
 
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-roleTalent').first
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-roleTalent')
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -522,37 +466,30 @@ class CharacterParser(AbstractParser):
         slides_data = (
             await element.locator('div.mhy-swiper').locator('div.swiper-slide').all()
         )
+        # Read every slide in one round trip, no slide switching needed
+        slides_info = await self._read_slides(element)
 
         for idx, (slide, slide_data) in enumerate(zip(slides, slides_data)):
             item_info: Dict[str, Any] = dict()
 
-            talent_level = await slide.text_content()
+            talent_level = slides_info[idx]['label']
             talent_level = talent_level.strip().replace('/', '')
             item_info['天赋等级'] = talent_level
 
             save_name = f'{self.save_id:04d}_天赋_{talent_level}'
             self.save_id += 1
 
-            await slide.click()
-            await asyncio.sleep(1)
-
-            element = context_page.locator(
-                'div.obc-tmpl-part.obc-tmpl-roleTalent'
-            ).first
-
-            content, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
-            )
-
-            content = await slide_data.inner_html()
+            sections = await self._sections(context_page)
+            element = sections.find('div.obc-tmpl-part.obc-tmpl-roleTalent')
 
-            save_html_file(content, html_path)
+            content, img_path, html_path = await self._capture_slide(
+                context_page,
+                element,
+                slide,
+                slide_data,
+                slides_info[idx]['html'],
+                save_name,
+            )
 
             item_info['img_path'] = img_path
             item_info['html_path'] = html_path
@@ -684,16 +621,11 @@ class CharacterParser(AbstractParser):
 
         logger.info('| Start parsing page - 命之座 - element...')
 
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-multiTable').first
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-multiTable')
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -745,14 +677,8 @@ class CharacterParser(AbstractParser):
         save_name = f'{self.save_id:04d}_角色展示_1'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_element_1_info['img_path'] = img_path
@@ -773,14 +699,8 @@ class CharacterParser(AbstractParser):
         save_name = f'{self.save_id:04d}_角色展示_2'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_element_2_info['img_path'] = img_path
@@ -795,13 +715,12 @@ class CharacterParser(AbstractParser):
         slides_data = (
             await element.locator('div.mhy-swiper').locator('div.swiper-slide').all()
         )
+        # Read every slide in one round trip, no slide switching needed
+        slides_info = await self._read_slides(element)
 
         for idx, (slide, slide_data) in enumerate(zip(slides, slides_data)):
             item_info: Dict[str, Any] = dict()
 
-            await slide.click()
-            await asyncio.sleep(1)
-
             save_name = f'{self.save_id:04d}_角色展示_2_{idx}'
             self.save_id += 1
 
@@ -810,22 +729,19 @@ class CharacterParser(AbstractParser):
             ).all()
             element = element[1]
 
-            _, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
+            content, img_path, html_path = await self._capture_slide(
+                context_page,
+                element,
+                slide,
+                slide_data,
+                slides_info[idx]['html'],
+                save_name,
             )
 
-            save_html_file(content, html_path)
-
             item_info['img_path'] = img_path
             item_info['html_path'] = html_path
-            name = await slide.text_content()
-            image_url = await slide_data.locator('source').first.get_attribute('srcset')
+            name = slides_info[idx]['label']
+            image_url = Selector(text=content).xpath('.//source/@srcset').get()
 
             item_info['name'] = name
             item_info['image_url'] = image_url
@@ -840,14 +756,8 @@ class CharacterParser(AbstractParser):
         save_name = f'{self.save_id:04d}_角色展示_3'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_element_3_info['img_path'] = img_path
@@ -862,13 +772,12 @@ class CharacterParser(AbstractParser):
         slides_data = (
             await element.locator('div.mhy-swiper').locator('div.swiper-slide').all()
         )
+        # Read every slide in one round trip, no slide switching needed
+        slides_info = await self._read_slides(element)
 
         for idx, (slide, slide_data) in enumerate(zip(slides, slides_data)):
             item_info: Dict[str, Any] = dict()
 
-            await slide.click()
-            await asyncio.sleep(1)
-
             save_name = f'{self.save_id:04d}_角色展示_3_{idx}'
             self.save_id += 1
 
@@ -877,23 +786,19 @@ class CharacterParser(AbstractParser):
             ).all()
             element = element[2]
 
-            _, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
+            content, img_path, html_path = await self._capture_slide(
+                context_page,
+                element,
+                slide,
+                slide_data,
+                slides_info[idx]['html'],
+                save_name,
             )
 
-            save_html_file(content, html_path)
-
             item_info['img_path'] = img_path
             item_info['html_path'] = html_path
-
-            name = await slide.text_content()
-            image_url = await slide_data.locator('source').first.get_attribute('srcset')
+            name = slides_info[idx]['label']
+            image_url = Selector(text=content).xpath('.//source/@srcset').get()
 
             item_info['name'] = name
             item_info['image_url'] = image_url
@@ -918,16 +823,11 @@ class CharacterParser(AbstractParser):
 
         logger.info('| Start parsing page - 名片 - element...')
 
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-businessCard').first
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-businessCard')
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -957,25 +857,14 @@ class CharacterParser(AbstractParser):
 
         logger.info('| Start parsing page - 特殊料理 - element...')
 
-        elements = await context_page.locator(
-            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel'
-        ).all()
-        # filter the element
-        element = None
-        for ele in elements:
-            title = await ele.locator('div.obc-tmpl-fold__title').first.text_content()
-            if '特殊料理' in title:
-                element = ele
-                break
-
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find(
+            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel', '特殊料理'
+        )
+
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -1007,26 +896,15 @@ class CharacterParser(AbstractParser):
 
         logger.info('| Start parsing page - 角色CV - element...')
 
-        elements = await context_page.locator(
-            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel'
-        ).all()
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
 
-        # filter the element
-        element = None
-        for ele in elements:
-            title = await ele.locator('div.obc-tmpl-fold__title').first.text_content()
-            if '角色CV' in title:
-                element = ele
-                break
-
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        element = sections.find(
+            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel', '角色CV'
+        )
+
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -1076,19 +954,16 @@ class CharacterParser(AbstractParser):
                 button = element.locator(
                     'div.el-tooltip.obc-tmpl__fold-tag.show-expand.undefined'
                 ).first
-                await button.click()
-                await asyncio.sleep(1)
+                await self._switch(button, watch=element)
 
             if button:
                 save_name = f'{self.save_id:04d}_{title}'
                 self.save_id += 1
 
-                content, img_path, html_path = await save_element_overleaf(
-                    page=context_page,
-                    element=element,
-                    save_name=save_name,
-                    img_path=self.img_path,
-                    html_path=self.html_path,
+                content, img_path, html_path = await self._capture(
+                    context_page,
+                    element,
+                    save_name,
                     set_width_scale=1.0,
                     set_height_scale=3.0,
                 )
@@ -1121,14 +996,13 @@ class CharacterParser(AbstractParser):
 
         logger.info('| Start parsing page - 配音展示 - element...')
 
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-roleVoice').first
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-roleVoice')
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
+        content, img_path, html_path = await self._capture(
+            context_page,
+            element,
+            save_name,
             set_width_scale=1.0,
             set_height_scale=3.0,
         )
@@ -1146,6 +1020,8 @@ class CharacterParser(AbstractParser):
         slides_data = (
             await element.locator('div.mhy-swiper').locator('div.swiper-slide').all()
         )
+        # Read every slide in one round trip, no slide switching needed
+        slides_info = await self._read_slides(element)
 
         # voices = []
         # async def log_request(request, name, language, content, lan_idx, but_idx):
@@ -1165,12 +1041,11 @@ class CharacterParser(AbstractParser):
         for lan_idx, (slide, slide_data) in enumerate(zip(slides, slides_data)):
             item_info: Dict[str, Any] = dict()
 
-            language = await slide.text_content()
-
-            await slide.click()
-            await asyncio.sleep(1)
+            language = slides_info[lan_idx]['label']
 
-            content = await slide_data.inner_html()
+            content = await self._slide_content(
+                slide, slide_data, slides_info[lan_idx]['html']
+            )
 
             buttons = await slide_data.locator(
                 'div.obc-tmpl-character__voice-btn'
@@ -1217,24 +1092,17 @@ class CharacterParser(AbstractParser):
 
         logger.info('| Start parsing page - 角色关联语音 - element...')
 
-        elements = await context_page.locator(
-            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel'
-        ).all()
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+
+        element = sections.find(
+            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel', '角色关联语音'
+        )
 
-        # filter the element
-        element = None
-        for ele in elements:
-            title = await ele.locator('div.obc-tmpl-fold__title').first.text_content()
-            if '角色关联语音' in title:
-                element = ele
-                break
-
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
+        content, img_path, html_path = await self._capture(
+            context_page,
+            element,
+            save_name,
             set_width_scale=1.0,
             set_height_scale=3.0,
         )
@@ -1287,16 +1155,13 @@ class CharacterParser(AbstractParser):
 
         logger.info('| Start parsing page - 角色宣发时间轴 - element...')
 
-        element = context_page.locator(
-            'div.obc-tmpl-part.obc-tmpl-timelineBaseInfo'
-        ).first
-
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-timelineBaseInfo')
+
+        content, img_path, html_path = await self._capture(
+            context_page,
+            element,
+            save_name,
             set_width_scale=1.0,
             set_height_scale=4.0,
         )
@@ -1355,14 +1220,8 @@ class CharacterParser(AbstractParser):
             'div.wiki-consumer-module-strategy.obc-tmpl-part.obc-tmpl-strategy'
         ).last
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -1401,24 +1260,17 @@ class CharacterParser(AbstractParser):
 
         logger.info('| Start parsing page - 关联词条 - element...')
 
-        elements = await context_page.locator(
-            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel'
-        ).all()
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+
+        element = sections.find(
+            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel', '关联词条'
+        )
 
-        # filter the element
-        element = None
-        for ele in elements:
-            title = await ele.locator('div.obc-tmpl-fold__title').first.text_content()
-            if '关联词条' in title:
-                element = ele
-                break
-
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
+        content, img_path, html_path = await self._capture(
+            context_page,
+            element,
+            save_name,
             set_width_scale=1.0,
             set_height_scale=3.0,
         )
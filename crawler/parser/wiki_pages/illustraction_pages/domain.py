@@ -1,4 +1,3 @@
-import asyncio
 from typing import Any, Dict, Optional
 
 from playwright.async_api import BrowserContext, Page
@@ -6,7 +5,6 @@ from scrapy.selector import Selector
 
 from crawler.base import AbstractParser
 from crawler.logger import logger
-from crawler.utils.element import save_element_overleaf, save_html_file
 from crawler.utils.url import add_url
 
 __all__ = [
@@ -15,6 +13,8 @@ __all__ = [
 
 
 class DomainParser(AbstractParser):
+    ready_selector = '.obc-tmpl-part'
+
     def __init__(
         self,
         *args,
@@ -45,20 +45,15 @@ class DomainParser(AbstractParser):
 
         logger.info('| Start parsing page - 基础信息 - element...')
 
-        # Locate the matching element
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-baseInfo').first
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-baseInfo')
 
         save_name = f'{self.save_id:04d}_基础信息'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -91,20 +86,15 @@ class DomainParser(AbstractParser):
 
         logger.info('| Start parsing page - 地图说明 - element...')
 
-        # Locate the matching element
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-mapDesc')
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-mapDesc')
 
         save_name = f'{self.save_id:04d}_地图说明'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -119,31 +109,23 @@ class DomainParser(AbstractParser):
         slides_data = (
             await element.locator('div.mhy-swiper').locator('div.swiper-slide').all()
         )
+        # Read every slide in one round trip, no slide switching needed
+        slides_info = await self._read_slides(element)
 
         for idx, (slide, slide_data) in enumerate(zip(slides, slides_data)):
             item_info: Dict[str, Any] = dict()
 
-            name = await slide.text_content()
-
-            await slide.click()
-            await asyncio.sleep(1)
+            name = slides_info[idx]['label']
 
-            # Capture a screenshot of the element
-            content, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
+            content, img_path, html_path = await self._capture_slide(
+                context_page,
+                element,
+                slide,
+                slide_data,
+                slides_info[idx]['html'],
+                save_name,
             )
 
-            content = await slide_data.inner_html()
-
-            # Overwrite the HTML content to a file
-            save_html_file(content, html_path)
-
             item_info['img_path'] = img_path
             item_info['html_path'] = html_path
 
@@ -166,17 +148,12 @@ class DomainParser(AbstractParser):
         try:
             context_page.set_default_timeout(2000)
 
-            element = None
-            # Locate the matching element
-            elements = await context_page.locator(
-                'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel'
-            ).all()
+            # Locate the matching element in the section index
+            sections = await self._sections(context_page)
 
-            for ele in elements:
-                title = await ele.locator('div.obc-tmpl-fold__title').text_content()
-                if '任务过程' in title:
-                    element = ele
-                    break
+            element = sections.find(
+                'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel', '任务过程'
+            )
 
             if element:
                 if (
@@ -188,20 +165,13 @@ class DomainParser(AbstractParser):
                     button = element.locator(
                         'div.el-tooltip.obc-tmpl__fold-tag.show-expand.undefined'
                     ).first
-                    await button.click()
-                    await asyncio.sleep(1)
+                    await self._switch(button, watch=element)
 
                 save_name = f'{self.save_id:04d}_任务过程'
                 self.save_id += 1
 
-                content, img_path, html_path = await save_element_overleaf(
-                    page=context_page,
-                    element=element,
-                    save_name=save_name,
-                    img_path=self.img_path,
-                    html_path=self.html_path,
-                    set_width_scale=self.config.set_width_scale,
-                    set_height_scale=self.config.set_height_scale,
+                content, img_path, html_path = await self._capture(
+                    context_page, element, save_name
                 )
 
                 res_info['img_path'] = img_path
@@ -237,31 +207,21 @@ class DomainParser(AbstractParser):
         try:
             context_page.set_default_timeout(2000)
 
-            element = None
-            # Locate the matching element
-            elements = await context_page.locator(
-                'div.obc-tmpl-part.obc-tmpl-multiTable'
-            ).all()
+            # Locate the matching element in the section index
+            sections = await self._sections(context_page)
 
-            for ele in elements:
-                # h2.wiki-h2
-                title = await ele.locator('h2.wiki-h2').text_content()
-                if '秘境入口' in title:
-                    element = ele
-                    break
+            element = sections.find(
+                'div.obc-tmpl-part.obc-tmpl-multiTable',
+                '秘境入口',
+                title_selector='h2.wiki-h2',
+            )
 
             if element:
                 save_name = f'{self.save_id:04d}_秘境入口'
                 self.save_id += 1
 
-                content, img_path, html_path = await save_element_overleaf(
-                    page=context_page,
-                    element=element,
-                    save_name=save_name,
-                    img_path=self.img_path,
-                    html_path=self.html_path,
-                    set_width_scale=self.config.set_width_scale,
-                    set_height_scale=self.config.set_height_scale,
+                content, img_path, html_path = await self._capture(
+                    context_page, element, save_name
                 )
 
                 res_info['img_path'] = img_path
@@ -305,30 +265,19 @@ class DomainParser(AbstractParser):
         try:
             context_page.set_default_timeout(2000)
 
-            element = None
-            # Locate the matching element
-            elements = await context_page.locator(
-                'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel'
-            ).all()
+            # Locate the matching element in the section index
+            sections = await self._sections(context_page)
 
-            for ele in elements:
-                title = await ele.locator('div.obc-tmpl-fold__title').text_content()
-                if '秘境奖励' in title:
-                    element = ele
-                    break
+            element = sections.find(
+                'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel', '秘境奖励'
+            )
 
             if element:
                 save_name = f'{self.save_id:04d}_秘境奖励'
                 self.save_id += 1
 
-                content, img_path, html_path = await save_element_overleaf(
-                    page=context_page,
-                    element=element,
-                    save_name=save_name,
-                    img_path=self.img_path,
-                    html_path=self.html_path,
-                    set_width_scale=self.config.set_width_scale,
-                    set_height_scale=self.config.set_height_scale,
+                content, img_path, html_path = await self._capture(
+                    context_page, element, save_name
                 )
 
                 res_info['img_path'] = img_path
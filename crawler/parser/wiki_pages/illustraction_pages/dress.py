@@ -1,4 +1,3 @@
-import asyncio
 from typing import Any, Dict, Optional
 
 from playwright.async_api import BrowserContext, Page
@@ -6,7 +5,6 @@ from scrapy.selector import Selector
 
 from crawler.base import AbstractParser
 from crawler.logger import logger
-from crawler.utils.element import save_element_overleaf, save_html_file
 from crawler.utils.url import add_url
 
 __all__ = [
@@ -15,6 +13,8 @@ __all__ = [
 
 
 class DressParser(AbstractParser):
+    ready_selector = '.obc-tmpl-part'
+
     def __init__(
         self,
         *args,
@@ -45,28 +45,19 @@ class DressParser(AbstractParser):
 
         logger.info('| Start parsing page - 基础信息 - element...')
 
-        elements = await context_page.locator(
-            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel'
-        ).all()
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
 
-        element = None
-        for ele in elements:
-            title = await ele.locator('div.obc-tmpl-fold__title').text_content()
-            if title in self.name:
-                element = ele
-                break
+        element = sections.find(
+            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel',
+            lambda title: title in self.name,
+        )
 
         save_name = f'{self.save_id:04d}_基础信息'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -95,19 +86,14 @@ class DressParser(AbstractParser):
 
         logger.info('| Start parsing page - 角色信息 - element...')
 
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-dressBaseInfo')
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-dressBaseInfo')
 
         save_name = f'{self.save_id:04d}_角色信息'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -147,27 +133,17 @@ class DressParser(AbstractParser):
 
         logger.info('| Start parsing page - 衣装简介 - element...')
 
-        elements = await context_page.locator(
-            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel'
-        ).all()
-        element = None
-        for ele in elements:
-            title = await ele.locator('div.obc-tmpl-fold__title').text_content()
-            if '衣装简介' in title:
-                element = ele
-                break
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find(
+            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel', '衣装简介'
+        )
 
         save_name = f'{self.save_id:04d}_衣装简介'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -194,20 +170,15 @@ class DressParser(AbstractParser):
 
         logger.info('| Start parsing page - 地图说明 - element...')
 
-        # Locate the matching element
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-mapDesc')
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-mapDesc')
 
         save_name = f'{self.save_id:04d}_地图说明'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -222,31 +193,23 @@ class DressParser(AbstractParser):
         slides_data = (
             await element.locator('div.mhy-swiper').locator('div.swiper-slide').all()
         )
+        # Read every slide in one round trip, no slide switching needed
+        slides_info = await self._read_slides(element)
 
         for idx, (slide, slide_data) in enumerate(zip(slides, slides_data)):
             item_info: Dict[str, Any] = dict()
 
-            name = await slide.text_content()
-
-            await slide.click()
-            await asyncio.sleep(1)
+            name = slides_info[idx]['label']
 
-            # Capture a screenshot of the element
-            content, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
+            content, img_path, html_path = await self._capture_slide(
+                context_page,
+                element,
+                slide,
+                slide_data,
+                slides_info[idx]['html'],
+                save_name,
             )
 
-            content = await slide_data.inner_html()
-
-            # Overwrite the HTML content to a file
-            save_html_file(content, html_path)
-
             item_info['img_path'] = img_path
             item_info['html_path'] = html_path
 
@@ -266,27 +229,17 @@ class DressParser(AbstractParser):
 
         logger.info('| Start parsing page - 衣装故事 - element...')
 
-        elements = await context_page.locator(
-            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel'
-        ).all()
-        element = None
-        for ele in elements:
-            title = await ele.locator('div.obc-tmpl-fold__title').text_content()
-            if '衣装故事' in title:
-                element = ele
-                break
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find(
+            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel', '衣装故事'
+        )
 
         save_name = f'{self.save_id:04d}_衣装故事'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -1,4 +1,3 @@
-import asyncio
 from typing import Any, Dict, List, Optional, Union
 
 from playwright.async_api import BrowserContext, Page
@@ -6,7 +5,6 @@ from scrapy.selector import Selector
 
 from crawler.base import AbstractParser
 from crawler.logger import logger
-from crawler.utils.element import save_element_overleaf
 
 __all__ = [
     'EnemyParser',
@@ -14,6 +12,8 @@ __all__ = [
 
 
 class EnemyParser(AbstractParser):
+    ready_selector = '.obc-tmpl-part'
+
     def __init__(
         self,
         *args,
@@ -46,19 +46,12 @@ class EnemyParser(AbstractParser):
         save_name = f'{self.save_id:04d}_基础信息'
         self.save_id += 1
 
-        # Locate the matching element
-        element = context_page.locator(
-            'div.obc-tmpl-part.obc-tmpl-monsterBaseInfo'
-        ).first  # type: ignore
-
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-monsterBaseInfo')
+
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -74,16 +67,18 @@ class EnemyParser(AbstractParser):
         slides_data = (
             await element.locator('div.mhy-swiper').locator('div.swiper-slide').all()
         )
+        # Read every slide in one round trip, no slide switching needed
+        slides_info = await self._read_slides(element)
 
         item_info: Dict[str, Any] = dict()
 
         for idx, (slide, slide_data) in enumerate(zip(slides, slides_data)):
-            skill_name = await slide.text_content()
-
-            await slide.click()
-            await asyncio.sleep(1)
+            skill_name = slides_info[idx]['label']
 
-            selector = Selector(text=await slide_data.inner_html())
+            content = await self._slide_content(
+                slide, slide_data, slides_info[idx]['html']
+            )
+            selector = Selector(text=content)
 
             image_url = selector.xpath('.//source/@srcset').get().strip()
 
@@ -139,25 +134,14 @@ class EnemyParser(AbstractParser):
 
         logger.info('| Start parsing page - 攻略方法 - element...')
 
-        elements = await context_page.locator(
-            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel'
-        ).all()
-        # filter the element
-        element = None
-        for ele in elements:
-            title = await ele.locator('div.obc-tmpl-fold__title').first.text_content()
-            if '攻略方法' in title:
-                element = ele
-                break
-
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find(
+            'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel', '攻略方法'
+        )
+
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -190,16 +174,11 @@ class EnemyParser(AbstractParser):
 
         logger.info('| Start parsing page - 背景故事 - element...')
 
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-goodDesc').first
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-goodDesc')
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -231,18 +210,11 @@ class EnemyParser(AbstractParser):
         try:
             context_page.set_default_timeout(2000)
 
-            element = context_page.locator(
-                'div.obc-tmpl-part.obc-tmpl-equipmentGrowthInfo'
-            ).first  # type: ignore
-
-            content, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
+            sections = await self._sections(context_page)
+            element = sections.find('div.obc-tmpl-part.obc-tmpl-equipmentGrowthInfo')
+
+            content, img_path, html_path = await self._capture(
+                context_page, element, save_name
             )
 
             res_info['img_path'] = img_path
@@ -286,19 +258,14 @@ class EnemyParser(AbstractParser):
         try:
             context_page.set_default_timeout(2000)
 
-            element = context_page.locator('div.obc-tmpl-part.obc-tmpl-mapDesc').first  # type: ignore
+            sections = await self._sections(context_page)
+            element = sections.find('div.obc-tmpl-part.obc-tmpl-mapDesc')
 
             save_name = f'{self.save_id:04d}_立绘展示'
             self.save_id += 1
 
-            content, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
+            content, img_path, html_path = await self._capture(
+                context_page, element, save_name
             )
 
             # Save the results to the dictionary
@@ -317,16 +284,18 @@ class EnemyParser(AbstractParser):
                 .locator('div.swiper-slide')
                 .all()
             )
+            # Read every slide in one round trip, no slide switching needed
+            slides_info = await self._read_slides(element)
 
             item_info: Dict[str, Any] = dict()
 
             for idx, (slide, slide_data) in enumerate(zip(slides, slides_data)):
-                name = await slide.text_content()
+                name = slides_info[idx]['label']
 
-                await slide.click()
-                await asyncio.sleep(1)
-
-                selector = Selector(text=await slide_data.inner_html())
+                content = await self._slide_content(
+                    slide, slide_data, slides_info[idx]['html']
+                )
+                selector = Selector(text=content)
 
                 image_url = selector.xpath('.//source/@srcset').get().strip()
 
@@ -355,21 +324,14 @@ class EnemyParser(AbstractParser):
         try:
             context_page.set_default_timeout(2000)
 
-            element = context_page.locator(
-                'div.obc-tmpl-part.obc-tmpl-timelineBaseInfo'
-            ).first  # type: ignore
+            sections = await self._sections(context_page)
+            element = sections.find('div.obc-tmpl-part.obc-tmpl-timelineBaseInfo')
 
             save_name = f'{self.save_id:04d}_位置导览'
             self.save_id += 1
 
-            content, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
+            content, img_path, html_path = await self._capture(
+                context_page, element, save_name
             )
 
             res_info['img_path'] = img_path
@@ -5,7 +5,7 @@ from scrapy.selector import Selector
 
 from crawler.base import AbstractParser
 from crawler.logger import logger
-from crawler.utils.element import save_element_overleaf, save_html_file
+from crawler.utils.artifact_writer import artifact_writer
 from crawler.utils.url import add_url
 
 __all__ = [
@@ -14,6 +14,8 @@ __all__ = [
 
 
 class FairylandParser(AbstractParser):
+    ready_selector = '.obc-tmpl-part'
+
     def __init__(
         self,
         *args,
@@ -44,20 +46,15 @@ class FairylandParser(AbstractParser):
 
         logger.info('| Start parsing page - 基础信息 - element...')
 
-        # Locate the matching element
-        element = context_page.locator('table.obc-tmpl-part.obc-tmpl-caveBaseInfo')
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('table.obc-tmpl-part.obc-tmpl-caveBaseInfo')
 
         save_name = f'{self.save_id:04d}_基础信息'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -113,20 +110,15 @@ class FairylandParser(AbstractParser):
 
         logger.info('| Start parsing page - 物品描述 - element...')
 
-        # Locate the matching element
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-goodDesc')
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-goodDesc')
 
         save_name = f'{self.save_id:04d}_物品描述'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -152,20 +144,15 @@ class FairylandParser(AbstractParser):
 
         logger.info('| Start parsing page - 基础属性 - element...')
 
-        # Locate the matching element
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-richBaseInfo')
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-richBaseInfo')
 
         save_name = f'{self.save_id:04d}_基础属性'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -199,20 +186,15 @@ class FairylandParser(AbstractParser):
 
         logger.info('| Start parsing page - 地图说明 - element...')
 
-        # Locate the matching element
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-mapDesc')
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-mapDesc')
 
         save_name = f'{self.save_id:04d}_地图说明'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -230,20 +212,14 @@ class FairylandParser(AbstractParser):
             name = slide
 
             # Capture a screenshot of the element
-            content, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
+            content, img_path, html_path = await self._capture(
+                context_page, element, save_name
             )
 
             content = await slide_data.inner_html()
 
             # Overwrite the HTML content to a file
-            save_html_file(content, html_path)
+            await artifact_writer.write_html(html_path, content)
 
             item_info['img_path'] = img_path
             item_info['html_path'] = html_path
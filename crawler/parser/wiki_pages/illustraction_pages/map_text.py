@@ -1,4 +1,3 @@
-import asyncio
 from typing import Any, Dict, List, Optional
 
 from playwright.async_api import BrowserContext, Page
@@ -6,7 +5,6 @@ from scrapy.selector import Selector
 
 from crawler.base import AbstractParser
 from crawler.logger import logger
-from crawler.utils.element import save_element_overleaf
 from crawler.utils.url import add_url
 
 __all__ = [
@@ -15,6 +13,8 @@ __all__ = [
 
 
 class MapTextParser(AbstractParser):
+    ready_selector = '.obc-tmpl-part'
+
     def __init__(
         self,
         *args,
@@ -48,19 +48,14 @@ class MapTextParser(AbstractParser):
         try:
             context_page.set_default_timeout(2000)
 
-            element = context_page.locator('div.obc-tmpl-part.obc-tmpl-mapDesc').first  # type: ignore
+            sections = await self._sections(context_page)
+            element = sections.find('div.obc-tmpl-part.obc-tmpl-mapDesc')
 
             save_name = f'{self.save_id:04d}_图片展示'
             self.save_id += 1
 
-            content, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
+            content, img_path, html_path = await self._capture(
+                context_page, element, save_name
             )
 
             # Save the results to the dictionary
@@ -79,16 +74,18 @@ class MapTextParser(AbstractParser):
                 .locator('div.swiper-slide')
                 .all()
             )
+            # Read every slide in one round trip, no slide switching needed
+            slides_info = await self._read_slides(element)
 
             item_info: Dict[str, Any] = dict()
 
             for idx, (slide, slide_data) in enumerate(zip(slides, slides_data)):
-                name = await slide.text_content()
-
-                await slide.click()
-                await asyncio.sleep(1)
+                name = slides_info[idx]['label']
 
-                selector = Selector(text=await slide_data.inner_html())
+                content = await self._slide_content(
+                    slide, slide_data, slides_info[idx]['html']
+                )
+                selector = Selector(text=content)
 
                 image_url = selector.xpath('.//source/@srcset').get().strip()
 
@@ -117,21 +114,16 @@ class MapTextParser(AbstractParser):
         try:
             context_page.set_default_timeout(2000)
 
-            element = context_page.locator(
+            sections = await self._sections(context_page)
+            element = sections.find(
                 'div.obc-tmpl-fold.obc-tmpl-part.obc-tmpl-collapsePanel'
-            ).first  # type: ignore
+            )
 
             save_name = f'{self.save_id:04d}_相关任务'
             self.save_id += 1
 
-            content, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
+            content, img_path, html_path = await self._capture(
+                context_page, element, save_name
             )
 
             # Save the results to the dictionary
@@ -202,21 +194,14 @@ class MapTextParser(AbstractParser):
         try:
             context_page.set_default_timeout(2000)
 
-            element = context_page.locator(
-                'div.obc-tmpl-part.obc-tmpl-interactiveDialogue'
-            ).first  # type: ignore
+            sections = await self._sections(context_page)
+            element = sections.find('div.obc-tmpl-part.obc-tmpl-interactiveDialogue')
 
             save_name = f'{self.save_id:04d}_交互文本'
             self.save_id += 1
 
-            content, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
+            content, img_path, html_path = await self._capture(
+                context_page, element, save_name
             )
 
             # Save the results to the dictionary
@@ -1,4 +1,3 @@
-import asyncio
 from typing import Any, Dict, Optional
 
 from playwright.async_api import BrowserContext, Page
@@ -6,7 +5,6 @@ from scrapy.selector import Selector
 
 from crawler.base import AbstractParser
 from crawler.logger import logger
-from crawler.utils.element import save_element_overleaf
 
 __all__ = [
     'NpcParser',
@@ -14,6 +12,8 @@ __all__ = [
 
 
 class NpcParser(AbstractParser):
+    ready_selector = '.obc-tmpl-part'
+
     def __init__(
         self,
         *args,
@@ -44,20 +44,15 @@ class NpcParser(AbstractParser):
 
         logger.info('| Start parsing page - 基础信息 - element...')
 
-        # Locate the matching element
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-npcBaseInfo').first
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-npcBaseInfo')
 
         save_name = f'{self.save_id:04d}_基础信息'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -127,19 +122,14 @@ class NpcParser(AbstractParser):
         try:
             context_page.set_default_timeout(2000)
 
-            element = context_page.locator('div.obc-tmpl-part.obc-tmpl-mapDesc').first  # type: ignore
+            sections = await self._sections(context_page)
+            element = sections.find('div.obc-tmpl-part.obc-tmpl-mapDesc')
 
             save_name = f'{self.save_id:04d}_NPC展示'
             self.save_id += 1
 
-            content, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
+            content, img_path, html_path = await self._capture(
+                context_page, element, save_name
             )
 
             # Save the results to the dictionary
@@ -158,16 +148,18 @@ class NpcParser(AbstractParser):
                 .locator('div.swiper-slide')
                 .all()
             )
+            # Read every slide in one round trip, no slide switching needed
+            slides_info = await self._read_slides(element)
 
             item_info: Dict[str, Any] = dict()
 
             for idx, (slide, slide_data) in enumerate(zip(slides, slides_data)):
-                name = await slide.text_content()
-
-                await slide.click()
-                await asyncio.sleep(1)
+                name = slides_info[idx]['label']
 
-                selector = Selector(text=await slide_data.inner_html())
+                content = await self._slide_content(
+                    slide, slide_data, slides_info[idx]['html']
+                )
+                selector = Selector(text=content)
 
                 image_url = selector.xpath('.//source/@srcset').get().strip()
 
@@ -194,10 +186,9 @@ class NpcParser(AbstractParser):
         logger.info('| Start parsing page - NPC对话 - element...')
 
         if not element:
-            # Locate the matching element
-            element = context_page.locator(
-                'div.obc-tmpl-part.obc-tmpl-interactiveDialogue'
-            )
+            # Locate the matching element in the section index
+            sections = await self._sections(context_page)
+            element = sections.find('div.obc-tmpl-part.obc-tmpl-interactiveDialogue')
 
         if (
             await element.locator(
@@ -208,20 +199,13 @@ class NpcParser(AbstractParser):
             button = element.locator(
                 'div.el-tooltip.obc-tmpl__fold-tag.show-expand.undefined'
             ).first
-            await button.click()
-            await asyncio.sleep(1)
+            await self._switch(button, watch=element)
 
         save_name = f'{self.save_id:04d}_NPC对话'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
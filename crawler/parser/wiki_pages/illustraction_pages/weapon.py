@@ -1,4 +1,3 @@
-import asyncio
 from typing import Any, Dict, Optional
 
 from playwright.async_api import BrowserContext, Page
@@ -6,8 +5,6 @@ from scrapy.selector import Selector
 
 from crawler.base import AbstractParser
 from crawler.logger import logger
-from crawler.utils.element import save_element_overleaf
-from crawler.utils.html_files import save_html_file
 from crawler.utils.url import add_url
 
 __all__ = [
@@ -16,6 +13,8 @@ __all__ = [
 
 
 class WeaponParser(AbstractParser):
+    ready_selector = '.obc-tmpl-part'
+
     def __init__(
         self,
         *args,
@@ -48,19 +47,12 @@ class WeaponParser(AbstractParser):
         save_name = f'{self.save_id:04d}_基础信息'
         self.save_id += 1
 
-        # Locate the matching element
-        element = context_page.locator(
-            'table.obc-tmpl-part.obc-tmpl-equipmentBaseInfo'
-        ).first  # type: ignore
-
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('table.obc-tmpl-part.obc-tmpl-equipmentBaseInfo')
+
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -107,17 +99,12 @@ class WeaponParser(AbstractParser):
         save_name = f'{self.save_id:04d}_装备展示'
         self.save_id += 1
 
-        # Locate the matching element
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-mapDesc').first
-
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-mapDesc')
+
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -133,36 +120,33 @@ class WeaponParser(AbstractParser):
         slides_data = (
             await element.locator('div.mhy-swiper').locator('div.swiper-slide').all()
         )
+        # Read every slide in one round trip, no slide switching needed
+        slides_info = await self._read_slides(element)
 
         for idx, (slide, slide_data) in enumerate(zip(slides, slides_data)):
             item_info: Dict[str, Any] = dict()
 
-            await slide.click()
-            await asyncio.sleep(1)
-
             save_name = f'{self.save_id:04d}_装备展示_{idx}'
             self.save_id += 1
 
-            element = context_page.locator('div.obc-tmpl-part.obc-tmpl-mapDesc').first
+            sections = await self._sections(context_page)
+            element = sections.find('div.obc-tmpl-part.obc-tmpl-mapDesc')
 
-            _, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
+            content, img_path, html_path = await self._capture_slide(
+                context_page,
+                element,
+                slide,
+                slide_data,
+                slides_info[idx]['html'],
+                save_name,
             )
 
-            save_html_file(content, html_path)
-
             item_info['img_path'] = img_path
             item_info['html_path'] = html_path
-            item_info['name'] = await slide.text_content()
-            item_info['image_url'] = await slide_data.locator(
-                'source'
-            ).first.get_attribute('srcset')
+            item_info['name'] = slides_info[idx]['label']
+            item_info['image_url'] = (
+                Selector(text=content).xpath('.//source/@srcset').get()
+            )
 
             res_info['data'][item_info['name']] = item_info
 
@@ -181,19 +165,12 @@ class WeaponParser(AbstractParser):
         save_name = f'{self.save_id:04d}_成长数值'
         self.save_id += 1
 
-        # Locate the matching element
-        element = context_page.locator(
-            'div.obc-tmpl-part.obc-tmpl-equipmentGrowthInfo'
-        ).first
-
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-equipmentGrowthInfo')
+
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -209,38 +186,29 @@ class WeaponParser(AbstractParser):
         slides_data = (
             await element.locator('div.mhy-swiper').locator('div.swiper-slide').all()
         )
+        # Read every slide in one round trip, no slide switching needed
+        slides_info = await self._read_slides(element)
 
         for idx, (slide, slide_data) in enumerate(zip(slides, slides_data)):
             item_info: Dict[str, Any] = dict()
 
-            level = await slide.text_content()
+            level = slides_info[idx]['label']
             item_info['等级'] = level
 
             save_name = f'{self.save_id:04d}_成长数值_{level}'
             self.save_id += 1
 
-            await slide.click()
-            await asyncio.sleep(1)
-
-            element = context_page.locator(
-                'div.obc-tmpl-part.obc-tmpl-equipmentGrowthInfo'
-            ).first
-
-            # Capture a screenshot of the element
-            _, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
-            )
-
-            content = await slide_data.inner_html()
+            sections = await self._sections(context_page)
+            element = sections.find('div.obc-tmpl-part.obc-tmpl-equipmentGrowthInfo')
 
-            # Overwrite the HTML content to a file
-            save_html_file(content, html_path)
+            content, img_path, html_path = await self._capture_slide(
+                context_page,
+                element,
+                slide,
+                slide_data,
+                slides_info[idx]['html'],
+                save_name,
+            )
             item_info['img_path'] = img_path
             item_info['html_path'] = html_path
 
@@ -324,21 +292,14 @@ class WeaponParser(AbstractParser):
                 button = element.locator(
                     'div.el-tooltip.obc-tmpl__fold-tag.show-expand.undefined'
                 ).first
-                await button.click()
-                await asyncio.sleep(1)
+                await self._switch(button, watch=element)
 
             if button:
                 save_name = f'{self.save_id:04d}_{title}'
                 self.save_id += 1
 
-                content, img_path, html_path = await save_element_overleaf(
-                    page=context_page,
-                    element=element,
-                    save_name=save_name,
-                    img_path=self.img_path,
-                    html_path=self.html_path,
-                    set_width_scale=self.config.set_width_scale,
-                    set_height_scale=self.config.set_height_scale,
+                content, img_path, html_path = await self._capture(
+                    context_page, element, save_name
                 )
 
                 res_info[title]: Dict[str, Any] = dict()
@@ -366,17 +327,12 @@ class WeaponParser(AbstractParser):
         logger.info('| Start parsing page - 装备描述 - element...')
         save_name = f'{self.save_id:04d}_装备描述'
 
-        # Locate the matching element
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-goodDesc').first
-
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-goodDesc')
+
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -415,17 +371,12 @@ class WeaponParser(AbstractParser):
         save_name = f'{self.save_id:04d}_推荐角色'
         self.save_id += 1
 
-        # Locate the matching element
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-multiTable').first
-
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-multiTable')
+
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -1,6 +1,5 @@
-import asyncio
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from playwright.async_api import BrowserContext, Page
 from scrapy.selector import Selector
@@ -30,6 +29,7 @@ from crawler.parser.wiki_pages.illustraction_pages import (
     TutorialParser,
     WeaponParser,
 )
+from crawler.scheduler import WorkQueue
 from crawler.utils.url import add_url
 
 __all__ = [
@@ -38,6 +38,9 @@ __all__ = [
 
 
 class IllustrationParser(AbstractParser):
+    ready_selector = 'a.collection-avatar__item'
+    incremental = False
+
     def __init__(
         self,
         *args,
@@ -48,6 +51,7 @@ class IllustrationParser(AbstractParser):
         id: str = 'illustration',
         name: str = 'illustration',
         icon: Optional[str] = None,
+        scheduler: Optional[WorkQueue] = None,
         **kwargs,
     ) -> None:
         # Initialize the parent class
@@ -59,6 +63,7 @@ class IllustrationParser(AbstractParser):
             icon=icon,
             img_path=img_path,
             html_path=html_path,
+            scheduler=scheduler,
         )
 
     async def _parse_character(
@@ -70,25 +75,16 @@ class IllustrationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/25?bbs_presentation_style=no_header&visit_device=pc'
 
-        logger.info(f'| Go to the page {url}')
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'character',
+            url,
+            browser_context,
+            ready_selector='a.collection-avatar__item',
+        )
 
         # start parsing
         logger.info('| Start parsing character...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -107,8 +103,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'character')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        characters_info = []
+        parsers = []
         for idx, character in enumerate(character_list):
             href = character.xpath('./@href').extract_first()
             id = href.split('/')[4]  # Extract the character ID from the URL
@@ -133,15 +128,9 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(character_parser.parse(browser_context))
+            parsers.append(character_parser)
 
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                characters_info.extend(await self._run_batch(tasks))
-                tasks = []  # Reset tasks for the next batch
-
-        if tasks:
-            characters_info.extend(await self._run_batch(tasks))
+        characters_info = await self._run_entries('character', parsers, browser_context)
 
         res_info['data'].update({item['name']: item for item in characters_info})
 
@@ -164,24 +153,16 @@ class IllustrationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/5?bbs_presentation_style=no_header&visit_device=pc'
 
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'weapon',
+            url,
+            browser_context,
+            ready_selector='a.collection-avatar__item',
+        )
 
         # start parsing
         logger.info('| Start parsing weapon...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -200,8 +181,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'weapon')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        weapons_info = []
+        parsers = []
         for idx, weapon in enumerate(weapon_list):
             href = weapon.xpath('./@href').extract_first()
             id = href.split('/')[4]
@@ -225,15 +205,9 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(weapon_parser.parse(browser_context))
+            parsers.append(weapon_parser)
 
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                weapons_info.extend(await self._run_batch(tasks))
-                tasks = []  # Reset tasks for the next batch
-
-        if tasks:
-            weapons_info.extend(await self._run_batch(tasks))
+        weapons_info = await self._run_entries('weapon', parsers, browser_context)
 
         res_info['data'].update({item['name']: item for item in weapons_info})
 
@@ -255,24 +229,16 @@ class IllustrationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/218?bbs_presentation_style=no_header&visit_device=pc'
 
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'artifact',
+            url,
+            browser_context,
+            ready_selector='a.relic-describe',
+        )
 
         # start parsing
         logger.info('| Start parsing artifact...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -291,8 +257,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'artifact')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        artifacts_info = []
+        parsers = []
         for idx, artifact in enumerate(artifact_list):
             href = artifact.xpath('./@href').extract_first()
             id = href.split('/')[4]
@@ -319,15 +284,9 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(artifact_parser.parse(browser_context))
+            parsers.append(artifact_parser)
 
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                artifacts_info.extend(await self._run_batch(tasks))
-                tasks = []
-
-        if tasks:
-            artifacts_info.extend(await self._run_batch(tasks))
+        artifacts_info = await self._run_entries('artifact', parsers, browser_context)
 
         res_info['data'].update({item['name']: item for item in artifacts_info})
 
@@ -342,24 +301,16 @@ class IllustrationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/252?bbs_presentation_style=no_header&visit_device=pc'
 
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'achievement',
+            url,
+            browser_context,
+            ready_selector='ul.position-list__list.position-list__list--default li',
+        )
 
         # start parsing
         logger.info('| Start parsing achievement...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -380,8 +331,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'achievement')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        achievements_info = []
+        parsers = []
         for idx, achievement in enumerate(achievement_list):
             achievement = achievement.xpath('.//a')
             href = achievement.xpath('./@href').extract_first()
@@ -403,15 +353,11 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(achievement_parser.parse(browser_context))
+            parsers.append(achievement_parser)
 
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                achievements_info.extend(await self._run_batch(tasks))
-                tasks = []
-
-        if tasks:
-            achievements_info.extend(await self._run_batch(tasks))
+        achievements_info = await self._run_entries(
+            'achievement', parsers, browser_context
+        )
 
         res_info['data'].update({item['name']: item for item in achievements_info})
 
@@ -426,26 +372,17 @@ class IllustrationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/6?bbs_presentation_style=no_header&visit_device=pc'
 
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'enemy',
+            url,
+            browser_context,
+            ready_selector='a.monster-image',
+        )
 
         # start parsing
         logger.info('| Start parsing enemy...')
 
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
-
         # Save the results to the dictionary
         res_info['url'] = self.url
         res_info['id'] = 'enemy'
@@ -463,8 +400,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'enemy')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        enemies_info = []
+        parsers = []
 
         for idx, enemy in enumerate(enemy_list):
             href = enemy.xpath('./@href').extract_first()
@@ -489,15 +425,9 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(enemy_parser.parse(browser_context))
-
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                enemies_info.extend(await self._run_batch(tasks))
-                tasks = []
+            parsers.append(enemy_parser)
 
-        if tasks:
-            enemies_info.extend(await self._run_batch(tasks))
+        enemies_info = await self._run_entries('enemy', parsers, browser_context)
 
         res_info['data'].update({item['name']: item for item in enemies_info})
 
@@ -521,24 +451,16 @@ class IllustrationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/251?bbs_presentation_style=no_header&visit_device=pc'
 
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'map_text',
+            url,
+            browser_context,
+            ready_selector='ul.position-list__list.position-list__list--default li',
+        )
 
         # start parsing
         logger.info('| Start parsing map text...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -559,8 +481,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'map_text')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        map_texts_info = []
+        parsers = []
         for idx, map_text in enumerate(map_text_list):
             map_text = map_text.xpath('.//a')
             href = map_text.xpath('./@href').extract_first()
@@ -581,15 +502,9 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(map_text_parser.parse(browser_context))
-
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                map_texts_info.extend(await self._run_batch(tasks))
-                tasks = []
+            parsers.append(map_text_parser)
 
-        if tasks:
-            map_texts_info.extend(await self._run_batch(tasks))
+        map_texts_info = await self._run_entries('map_text', parsers, browser_context)
 
         res_info['data'].update({item['name']: item for item in map_texts_info})
 
@@ -606,24 +521,16 @@ class IllustrationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/21?bbs_presentation_style=no_header&visit_device=pc'
 
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'food',
+            url,
+            browser_context,
+            ready_selector='a.monster-image',
+        )
 
         # start parsing
         logger.info('| Start parsing food...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -642,8 +549,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'food')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        foods_info = []
+        parsers = []
         for idx, food in enumerate(food_list):
             href = food.xpath('./@href').extract_first()
             id = href.split('/')[4]
@@ -667,15 +573,9 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(food_parser.parse(browser_context))
+            parsers.append(food_parser)
 
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                foods_info.extend(await self._run_batch(tasks))
-                tasks = []
-
-        if tasks:
-            foods_info.extend(await self._run_batch(tasks))
+        foods_info = await self._run_entries('food', parsers, browser_context)
 
         res_info['data'].update({item['name']: item for item in foods_info})
 
@@ -690,26 +590,17 @@ class IllustrationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/244?bbs_presentation_style=no_header&visit_device=pc'
 
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'avatar',
+            url,
+            browser_context,
+            ready_selector='ul.position-list__list.position-list__list--avatar li',
+        )
 
         # start parsing
         logger.info('| Start parsing avatar...')
 
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
-
         # Save the results to the dictionary
         res_info['url'] = self.url
         res_info['id'] = 'avatar'
@@ -729,8 +620,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'avatar')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        avatars_info = []
+        parsers = []
         for idx, avatar in enumerate(avatar_list):
             avatar = avatar.xpath('.//a')
             href = avatar.xpath('./@href').extract_first()
@@ -751,15 +641,9 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(avatar_parser.parse(browser_context))
+            parsers.append(avatar_parser)
 
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                avatars_info.extend(await self._run_batch(tasks))
-                tasks = []
-
-        if tasks:
-            avatars_info.extend(await self._run_batch(tasks))
+        avatars_info = await self._run_entries('avatar', parsers, browser_context)
 
         res_info['data'].update({item['name']: item for item in avatars_info})
 
@@ -774,26 +658,17 @@ class IllustrationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/13?bbs_presentation_style=no_header&visit_device=pc'
 
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'backpack',
+            url,
+            browser_context,
+            ready_selector='ul.position-list__list.position-list__list--default li',
+        )
 
         # start parsing
         logger.info('| Start parsing backpack...')
 
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
-
         # Save the results to the dictionary
         res_info['url'] = self.url
         res_info['id'] = 'backpack'
@@ -814,8 +689,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'backpack')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        backpacks_info = []
+        parsers = []
 
         for idx, backpack in enumerate(backpack_list):
             backpack = backpack.xpath('.//a')
@@ -837,15 +711,9 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(backpack_parser.parse(browser_context))
+            parsers.append(backpack_parser)
 
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                backpacks_info.extend(await self._run_batch(tasks))
-                tasks = []
-
-        if tasks:
-            backpacks_info.extend(await self._run_batch(tasks))
+        backpacks_info = await self._run_entries('backpack', parsers, browser_context)
 
         res_info['data'].update({item['name']: item for item in backpacks_info})
 
@@ -860,24 +728,16 @@ class IllustrationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/105?bbs_presentation_style=no_header&visit_device=pc'
 
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'activity',
+            url,
+            browser_context,
+            ready_selector='ul.position-list__list.position-list__list--default li',
+        )
 
         # start parsing
         logger.info('| Start parsing activity...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -898,8 +758,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'activity')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        activities_info = []
+        parsers = []
         for idx, activity in enumerate(activity_list):
             activity = activity.xpath('.//a')
 
@@ -921,15 +780,9 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(activity_parser.parse(browser_context))
-
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                activities_info.extend(await self._run_batch(tasks))
-                tasks = []
+            parsers.append(activity_parser)
 
-        if tasks:
-            activities_info.extend(await self._run_batch(tasks))
+        activities_info = await self._run_entries('activity', parsers, browser_context)
 
         res_info['data'].update({item['name']: item for item in activities_info})
 
@@ -944,24 +797,16 @@ class IllustrationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/43?bbs_presentation_style=no_header&visit_device=pc'
 
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'task',
+            url,
+            browser_context,
+            ready_selector='ul.position-list__list.position-list__list--default li',
+        )
 
         # start parsing
         logger.info('| Start parsing task...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -982,8 +827,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'task')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        tasks_info = []
+        parsers = []
         for idx, task in enumerate(task_list):
             task = task.xpath('.//a')
 
@@ -1005,15 +849,9 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(task_parser.parse(browser_context))
-
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                tasks_info.extend(await self._run_batch(tasks))
-                tasks = []
+            parsers.append(task_parser)
 
-        if tasks:
-            tasks_info.extend(await self._run_batch(tasks))
+        tasks_info = await self._run_entries('task', parsers, browser_context)
 
         res_info['data'].update({item['name']: item for item in tasks_info})
 
@@ -1028,24 +866,16 @@ class IllustrationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/49?bbs_presentation_style=no_header&visit_device=pc'
 
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'animal',
+            url,
+            browser_context,
+            ready_selector='ul.position-list__list.position-list__list--default li',
+        )
 
         # start parsing
         logger.info('| Start parsing animal...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -1066,8 +896,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'animal')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        animals_info = []
+        parsers = []
         for idx, animal in enumerate(animal_list):
             animal = animal.xpath('.//a')
 
@@ -1089,15 +918,9 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(animal_parser.parse(browser_context))
-
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                animals_info.extend(await self._run_batch(tasks))
-                tasks = []
+            parsers.append(animal_parser)
 
-        if tasks:
-            animals_info.extend(await self._run_batch(tasks))
+        animals_info = await self._run_entries('animal', parsers, browser_context)
 
         res_info['data'].update({item['name']: item for item in animals_info})
 
@@ -1112,24 +935,16 @@ class IllustrationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/68?bbs_presentation_style=no_header&visit_device=pc'
 
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'book',
+            url,
+            browser_context,
+            ready_selector='ul.position-list__list.position-list__list--default li',
+        )
 
         # start parsing
         logger.info('| Start parsing book...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -1150,8 +965,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'book')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        books_info = []
+        parsers = []
         for idx, book in enumerate(book_list):
             book = book.xpath('.//a')
 
@@ -1173,15 +987,9 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(book_parser.parse(browser_context))
-
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                books_info.extend(await self._run_batch(tasks))
-                tasks = []
+            parsers.append(book_parser)
 
-        if tasks:
-            books_info.extend(await self._run_batch(tasks))
+        books_info = await self._run_entries('book', parsers, browser_context)
 
         res_info['data'].update({item['name']: item for item in books_info})
 
@@ -1196,24 +1004,16 @@ class IllustrationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/55?bbs_presentation_style=no_header&visit_device=pc'
 
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'adventurer_guild',
+            url,
+            browser_context,
+            ready_selector='ul.position-list__list.position-list__list--default li',
+        )
 
         # start parsing
         logger.info('| Start parsing adventurer guild...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -1234,8 +1034,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'adventurer_guild')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        adventurer_guilds_info = []
+        parsers = []
         for idx, adventurer_guild in enumerate(adventurer_guild_list):
             adventurer_guild = adventurer_guild.xpath('.//a')
 
@@ -1257,15 +1056,11 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(adventurer_guild_parser.parse(browser_context))
+            parsers.append(adventurer_guild_parser)
 
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                adventurer_guilds_info.extend(await self._run_batch(tasks))
-                tasks = []
-
-        if tasks:
-            adventurer_guilds_info.extend(await self._run_batch(tasks))
+        adventurer_guilds_info = await self._run_entries(
+            'adventurer_guild', parsers, browser_context
+        )
 
         res_info['data'].update({item['name']: item for item in adventurer_guilds_info})
 
@@ -1280,24 +1075,16 @@ class IllustrationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/20?bbs_presentation_style=no_header&visit_device=pc'
 
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'npc',
+            url,
+            browser_context,
+            ready_selector='ul.position-list__list.position-list__list--avatar li',
+        )
 
         # start parsing
         logger.info('| Start parsing npc...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -1318,8 +1105,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'npc')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        npcs_info = []
+        parsers = []
         for idx, npc in enumerate(npc_list):
             npc = npc.xpath('.//a')
 
@@ -1341,15 +1127,9 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(npc_parser.parse(browser_context))
-
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                npcs_info.extend(await self._run_batch(tasks))
-                tasks = []
+            parsers.append(npc_parser)
 
-        if tasks:
-            npcs_info.extend(await self._run_batch(tasks))
+        npcs_info = await self._run_entries('npc', parsers, browser_context)
 
         res_info['data'].update({item['name']: item for item in npcs_info})
 
@@ -1364,24 +1144,16 @@ class IllustrationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/54?bbs_presentation_style=no_header&visit_device=pc'
 
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'domain',
+            url,
+            browser_context,
+            ready_selector='ul.position-list__list.position-list__list--default li',
+        )
 
         # start parsing
         logger.info('| Start parsing domain...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -1402,8 +1174,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'domain')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        domains_info = []
+        parsers = []
         for idx, domain in enumerate(domain_list):
             domain = domain.xpath('.//a')
 
@@ -1425,15 +1196,9 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(domain_parser.parse(browser_context))
-
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                domains_info.extend(await self._run_batch(tasks))
-                tasks = []
+            parsers.append(domain_parser)
 
-        if tasks:
-            domains_info.extend(await self._run_batch(tasks))
+        domains_info = await self._run_entries('domain', parsers, browser_context)
 
         res_info['data'].update({item['name']: item for item in domains_info})
 
@@ -1448,26 +1213,17 @@ class IllustrationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/130?bbs_presentation_style=no_header&visit_device=pc'
 
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'fairyland',
+            url,
+            browser_context,
+            ready_selector='ul.position-list__list.position-list__list--default li',
+        )
 
         # start parsing
         logger.info('| Start parsing fairyland...')
 
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
-
         # Save the results to the dictionary
         res_info['url'] = self.url
         res_info['id'] = 'fairyland'
@@ -1487,8 +1243,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'fairyland')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        fairylands_info = []
+        parsers = []
         for idx, fairyland in enumerate(fairyland_list):
             fairyland = fairyland.xpath('.//a')
 
@@ -1510,15 +1265,9 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(fairyland_parser.parse(browser_context))
-
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                fairylands_info.extend(await self._run_batch(tasks))
-                tasks = []
+            parsers.append(fairyland_parser)
 
-        if tasks:
-            fairylands_info.extend(await self._run_batch(tasks))
+        fairylands_info = await self._run_entries('fairyland', parsers, browser_context)
 
         res_info['data'].update({item['name']: item for item in fairylands_info})
 
@@ -1533,26 +1282,17 @@ class IllustrationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/65?bbs_presentation_style=no_header&visit_device=pc'
 
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'abyss',
+            url,
+            browser_context,
+            ready_selector='ul.position-list__list.position-list__list--default li',
+        )
 
         # start parsing
         logger.info('| Start parsing abyss...')
 
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
-
         # Save the results to the dictionary
         res_info['url'] = self.url
         res_info['id'] = 'abyss'
@@ -1572,8 +1312,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'abyss')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        abysses_info = []
+        parsers = []
         for idx, abyss in enumerate(abyss_list):
             abyss = abyss.xpath('.//a')
 
@@ -1595,15 +1334,9 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(abyss_parser.parse(browser_context))
-
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                abysses_info.extend(await self._run_batch(tasks))
-                tasks = []
+            parsers.append(abyss_parser)
 
-        if tasks:
-            abysses_info.extend(await self._run_batch(tasks))
+        abysses_info = await self._run_entries('abyss', parsers, browser_context)
 
         res_info['data'].update({item['name']: item for item in abysses_info})
 
@@ -1618,24 +1351,16 @@ class IllustrationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/109?bbs_presentation_style=no_header&visit_device=pc'
 
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'card',
+            url,
+            browser_context,
+            ready_selector='ul.position-list__list.position-list__list--default li',
+        )
 
         # start parsing
         logger.info('| Start parsing card...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -1657,8 +1382,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'card')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        cards_info = []
+        parsers = []
         for idx, card in enumerate(card_list):
             card = card.xpath('.//a')
 
@@ -1680,15 +1404,9 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(card_parser.parse(browser_context))
-
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                cards_info.extend(await self._run_batch(tasks))
-                tasks = []
+            parsers.append(card_parser)
 
-        if tasks:
-            cards_info.extend(await self._run_batch(tasks))
+        cards_info = await self._run_entries('card', parsers, browser_context)
 
         res_info['data'].update({item['name']: item for item in cards_info})
 
@@ -1703,24 +1421,16 @@ class IllustrationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/211?bbs_presentation_style=no_header&visit_device=pc'
 
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'dress',
+            url,
+            browser_context,
+            ready_selector='ul.position-list__list.position-list__list--default li',
+        )
 
         # start parsing
         logger.info('| Start parsing dress...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -1742,8 +1452,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'dress')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        dresses_info = []
+        parsers = []
         for idx, dress in enumerate(dress_list):
             dress = dress.xpath('.//a')
 
@@ -1765,15 +1474,9 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(dress_parser.parse(browser_context))
+            parsers.append(dress_parser)
 
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                dresses_info.extend(await self._run_batch(tasks))
-                tasks = []
-
-        if tasks:
-            dresses_info.extend(await self._run_batch(tasks))
+        dresses_info = await self._run_entries('dress', parsers, browser_context)
 
         res_info['data'].update({item['name']: item for item in dresses_info})
 
@@ -1786,24 +1489,16 @@ class IllustrationParser(AbstractParser):
     ) -> Dict[str, Any]:
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/189/227?bbs_presentation_style=no_header&visit_device=pc'
 
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'tutorial',
+            url,
+            browser_context,
+            ready_selector='ul.position-list__list.position-list__list--default li',
+        )
 
         # start parsing
         logger.info('| Start parsing tutorial...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info: Dict[str, Any] = dict()
@@ -1825,8 +1520,7 @@ class IllustrationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'tutorial')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        tutorials_info = []
+        parsers = []
         for idx, tutorial in enumerate(tutorial_list):
             tutorial = tutorial.xpath('.//a')
 
@@ -1848,15 +1542,9 @@ class IllustrationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(tutorial_parser.parse(browser_context))
+            parsers.append(tutorial_parser)
 
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                tutorials_info.extend(await self._run_batch(tasks))
-                tasks = []
-
-        if tasks:
-            tutorials_info.extend(await self._run_batch(tasks))
+        tutorials_info = await self._run_entries('tutorial', parsers, browser_context)
 
         res_info['data'].update({item['name']: item for item in tutorials_info})
 
@@ -1864,11 +1552,31 @@ class IllustrationParser(AbstractParser):
 
         return res_info
 
-    async def _run_batch(self, tasks):
-        """
-        Run a batch of tasks and handle any potential errors.
-        """
-        return await asyncio.gather(*tasks)
+    def categories(self) -> Dict[str, Callable[..., Awaitable[Dict[str, Any]]]]:
+        return {
+            '角色': self._parse_character,
+            '武器': self._parse_weapon,
+            '圣遗物': self._parse_artifact,
+            '成就': self._parse_achievement,
+            '敌人': self._parse_enemy,
+            '地图文本': self._parse_map_text,
+            '食物': self._parse_food,
+            '头像': self._parse_avatar,
+            '背包': self._parse_backpack,
+            # TODO: 各个组件和元素未统一，暂时不详细解析，只解析了基础信息
+            '活动': self._parse_activity,
+            '任务': self._parse_task,
+            '动物': self._parse_animal,
+            '书籍': self._parse_book,
+            '冒险家协会': self._parse_adventurer_guild,
+            'NPC&商店': self._parse_npc,
+            '秘境': self._parse_domain,
+            '洞天': self._parse_fairyland,
+            '深境螺旋': self._parse_abyss,
+            '名片': self._parse_card,
+            '装扮': self._parse_dress,
+            '教程': self._parse_tutorial,
+        }
 
     async def _parse(
         self,
@@ -1880,52 +1588,9 @@ class IllustrationParser(AbstractParser):
         :return: res_info: Dict[str, Any]
         """
 
-        res_info: Dict[str, Any] = dict()
-
-        res_info['角色'] = await self._parse_character(context_page, browser_context)
-
-        res_info['武器'] = await self._parse_weapon(context_page, browser_context)
-
-        res_info['圣遗物'] = await self._parse_artifact(context_page, browser_context)
-
-        res_info['成就'] = await self._parse_achievement(context_page, browser_context)
-
-        res_info['敌人'] = await self._parse_enemy(context_page, browser_context)
-
-        res_info['地图文本'] = await self._parse_map_text(context_page, browser_context)
-
-        res_info['食物'] = await self._parse_food(context_page, browser_context)
-
-        res_info['头像'] = await self._parse_avatar(context_page, browser_context)
-
-        res_info['背包'] = await self._parse_backpack(context_page, browser_context)
-
-        # TODO: 各个组件和元素未统一，暂时不详细解析，只解析了基础信息
-        res_info['活动'] = await self._parse_activity(context_page, browser_context)
-
-        res_info['任务'] = await self._parse_task(context_page, browser_context)
-
-        res_info['动物'] = await self._parse_animal(context_page, browser_context)
-
-        res_info['书籍'] = await self._parse_book(context_page, browser_context)
-
-        res_info['冒险家协会'] = await self._parse_adventurer_guild(
-            context_page, browser_context
-        )
-
-        res_info['NPC&商店'] = await self._parse_npc(context_page, browser_context)
-
-        res_info['秘境'] = await self._parse_domain(context_page, browser_context)
-
-        res_info['洞天'] = await self._parse_fairyland(context_page, browser_context)
-
-        res_info['深境螺旋'] = await self._parse_abyss(context_page, browser_context)
-
-        res_info['名片'] = await self._parse_card(context_page, browser_context)
-
-        res_info['装扮'] = await self._parse_dress(context_page, browser_context)
-
-        res_info['教程'] = await self._parse_tutorial(context_page, browser_context)
+        # Every category is an independent job, the listing pages and the
+        # entries of all categories share the global concurrency budget
+        res_info = await self._run_categories(self.categories(), browser_context)
 
         # TODO: 各个组件和元素未统一，暂时不解析
         # 幻想真境剧诗
@@ -1,6 +1,5 @@
-import asyncio
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from playwright.async_api import BrowserContext, Page
 from scrapy.selector import Selector
@@ -11,6 +10,7 @@ from crawler.parser.wiki_pages.observation_pages import (
     MethodologyParser,
     RegionParser,
 )
+from crawler.scheduler import WorkQueue
 from crawler.utils.url import add_url
 
 __all__ = [
@@ -19,6 +19,9 @@ __all__ = [
 
 
 class ObservationParser(AbstractParser):
+    ready_selector = 'ul.position-list__list.position-list__list--card li'
+    incremental = False
+
     def __init__(
         self,
         *args,
@@ -29,6 +32,7 @@ class ObservationParser(AbstractParser):
         id: str = 'observation',
         name: str = 'observation',
         icon: Optional[str] = None,
+        scheduler: Optional[WorkQueue] = None,
         **kwargs,
     ) -> None:
         # Initialize the parent class
@@ -40,6 +44,7 @@ class ObservationParser(AbstractParser):
             icon=icon,
             img_path=img_path,
             html_path=html_path,
+            scheduler=scheduler,
         )
 
     async def _parse_region(
@@ -51,25 +56,16 @@ class ObservationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/190/7?bbs_presentation_style=no_header&visit_device=pc'
 
-        logger.info(f'| Go to the page {url}')
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'region',
+            url,
+            browser_context,
+            ready_selector='ul.position-list__list.position-list__list--card li',
+        )
 
         # start parsing
         logger.info('| Start parsing region...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -90,8 +86,7 @@ class ObservationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'region')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        regions_info = []
+        parsers = []
         for idx, region in enumerate(region_list):
             region = region.xpath('.//a')
 
@@ -113,15 +108,9 @@ class ObservationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(region_parser.parse(browser_context))
+            parsers.append(region_parser)
 
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                regions_info.extend(await self._run_batch(tasks))
-                tasks = []  # Reset tasks for the next batch
-
-        if tasks:
-            regions_info.extend(await self._run_batch(tasks))
+        regions_info = await self._run_entries('region', parsers, browser_context)
 
         res_info['data'].update({item['name']: item for item in regions_info})
 
@@ -138,25 +127,16 @@ class ObservationParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/190/62?bbs_presentation_style=no_header&visit_device=pc'
 
-        logger.info(f'| Go to the page {url}')
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'methodology',
+            url,
+            browser_context,
+            ready_selector='ul.position-list__list.position-list__list--default li',
+        )
 
         # start parsing
         logger.info('| Start parsing methodology...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -177,8 +157,7 @@ class ObservationParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'methodology')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        methdologies_info = []
+        parsers = []
         for idx, methodology in enumerate(methodology_list):
             methodology = methodology.xpath('.//a')
 
@@ -201,15 +180,11 @@ class ObservationParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(methodology_parser.parse(browser_context))
+            parsers.append(methodology_parser)
 
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                methdologies_info.extend(await self._run_batch(tasks))
-                tasks = []
-
-        if tasks:
-            methdologies_info.extend(await self._run_batch(tasks))
+        methdologies_info = await self._run_entries(
+            'methodology', parsers, browser_context
+        )
 
         res_info['data'].update({item['name']: item for item in methdologies_info})
 
@@ -217,11 +192,11 @@ class ObservationParser(AbstractParser):
 
         return res_info
 
-    async def _run_batch(self, tasks):
-        """
-        Run a batch of tasks and handle any potential errors.
-        """
-        return await asyncio.gather(*tasks)
+    def categories(self) -> Dict[str, Callable[..., Awaitable[Dict[str, Any]]]]:
+        return {
+            '区域': self._parse_region,
+            '考据': self._parse_methodology,
+        }
 
     async def _parse(
         self,
@@ -233,10 +208,8 @@ class ObservationParser(AbstractParser):
         :return: res_info: Dict[str, Any]
         """
 
-        res_info: Dict[str, Any] = dict()
-
-        res_info['区域'] = await self._parse_region(context_page, browser_context)
-
-        res_info['考据'] = await self._parse_methodology(context_page, browser_context)
+        # Every category is an independent job, the listing pages and the
+        # entries of all categories share the global concurrency budget
+        res_info = await self._run_categories(self.categories(), browser_context)
 
         return res_info
@@ -15,6 +15,8 @@ __all__ = [
 
 
 class MethodologyParser(AbstractParser):
+    ready_selector = '.obc-tmpl-part'
+
     def __init__(
         self,
         *args,
@@ -47,10 +49,11 @@ class MethodologyParser(AbstractParser):
         # save_name = f'{self.save_id:04d}_基础信息'
         # self.save_id += 1
 
-        # Locate the matching element
-        element = context_page.locator(
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find(
             'div.obc-tmpl-fold.obc-tmpl-part.without-border.obc-tmpl-collapsePanel'
-        ).first
+        )
         if not await element_exists(element):
             return res_info
 
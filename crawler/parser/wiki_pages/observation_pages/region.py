@@ -5,7 +5,8 @@ from scrapy.selector import Selector
 
 from crawler.base import AbstractParser
 from crawler.logger import logger
-from crawler.utils.element import element_exists, save_element_overleaf, save_html_file
+from crawler.utils.artifact_writer import artifact_writer
+from crawler.utils.element import element_exists
 from crawler.utils.url import add_url
 
 __all__ = [
@@ -14,6 +15,8 @@ __all__ = [
 
 
 class RegionParser(AbstractParser):
+    ready_selector = '.obc-tmpl-part'
+
     def __init__(
         self,
         *args,
@@ -46,19 +49,14 @@ class RegionParser(AbstractParser):
         save_name = f'{self.save_id:04d}_基础信息'
         self.save_id += 1
 
-        # Locate the matching element
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-baseInfo').first
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-baseInfo')
         if not await element_exists(element):
             return res_info
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -94,29 +92,20 @@ class RegionParser(AbstractParser):
         save_name = f'{self.save_id:04d}_系列任务'
         self.save_id += 1
 
-        # Locate the matching element
-        elements = await context_page.locator(
-            'div.obc-tmpl-part.obc-tmpl-richBaseInfo'
-        ).all()
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
 
-        if not await element_exists(elements):
+        if not sections.exists('div.obc-tmpl-part.obc-tmpl-richBaseInfo'):
             return res_info
 
-        element = None
-        for ele in elements:
-            title = await ele.locator('h2.wiki-h2').text_content()
-            if '系列任务' in title:
-                element = ele
-                break
-
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        element = sections.find(
+            'div.obc-tmpl-part.obc-tmpl-richBaseInfo',
+            '系列任务',
+            title_selector='h2.wiki-h2',
+        )
+
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
@@ -178,20 +167,15 @@ class RegionParser(AbstractParser):
 
         logger.info('| Start parsing page - 描述 - element...')
 
-        # Locate the matching element
-        element = context_page.locator('div.obc-tmpl-part.obc-tmpl-mapDesc')
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find('div.obc-tmpl-part.obc-tmpl-mapDesc')
 
         save_name = f'{self.save_id:04d}_描述'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -209,20 +193,14 @@ class RegionParser(AbstractParser):
             name = slide
 
             # Capture a screenshot of the element
-            content, img_path, html_path = await save_element_overleaf(
-                page=context_page,
-                element=element,
-                save_name=save_name,
-                img_path=self.img_path,
-                html_path=self.html_path,
-                set_width_scale=self.config.set_width_scale,
-                set_height_scale=self.config.set_height_scale,
+            content, img_path, html_path = await self._capture(
+                context_page, element, save_name
             )
 
             content = await slide_data.inner_html()
 
             # Overwrite the HTML content to a file
-            save_html_file(content, html_path)
+            await artifact_writer.write_html(html_path, content)
 
             item_info['img_path'] = img_path
             item_info['html_path'] = html_path
@@ -245,28 +223,19 @@ class RegionParser(AbstractParser):
 
         logger.info('| Start parsing page - 怪物分布 - element...')
 
-        # Locate the matching element
-        elements = await context_page.locator(
-            'div.obc-tmpl-part.obc-tmpl-richBaseInfo'
-        ).all()
-        element = None
-        for ele in elements:
-            title = await ele.locator('h2.wiki-h2').text_content()
-            if '怪物分布' in title:
-                element = ele
-                break
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find(
+            'div.obc-tmpl-part.obc-tmpl-richBaseInfo',
+            '怪物分布',
+            title_selector='h2.wiki-h2',
+        )
 
         save_name = f'{self.save_id:04d}_怪物分布'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -322,28 +291,19 @@ class RegionParser(AbstractParser):
 
         logger.info('| Start parsing page - 机关 - element...')
 
-        # Locate the matching element
-        elements = await context_page.locator(
-            'div.obc-tmpl-part.obc-tmpl-richBaseInfo'
-        ).all()
-        element = None
-        for ele in elements:
-            title = await ele.locator('h2.wiki-h2').text_content()
-            if '机关' in title:
-                element = ele
-                break
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find(
+            'div.obc-tmpl-part.obc-tmpl-richBaseInfo',
+            '机关',
+            title_selector='h2.wiki-h2',
+        )
 
         save_name = f'{self.save_id:04d}_机关'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -403,28 +363,19 @@ class RegionParser(AbstractParser):
 
         logger.info('| Start parsing page - 地图资源 - element...')
 
-        # Locate the matching element
-        elements = await context_page.locator(
-            'div.obc-tmpl-part.obc-tmpl-richBaseInfo'
-        ).all()
-        element = None
-        for ele in elements:
-            title = await ele.locator('h2.wiki-h2').text_content()
-            if '地图资源' in title:
-                element = ele
-                break
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find(
+            'div.obc-tmpl-part.obc-tmpl-richBaseInfo',
+            '地图资源',
+            title_selector='h2.wiki-h2',
+        )
 
         save_name = f'{self.save_id:04d}_地图资源'
         self.save_id += 1
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         res_info['img_path'] = img_path
@@ -1,6 +1,5 @@
-import asyncio
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from playwright.async_api import BrowserContext, Page
 from scrapy.selector import Selector
@@ -12,6 +11,7 @@ from crawler.parser.wiki_pages.video_gallery_pages import (
     OtherVideoParser,
     TransitionAnimationParser,
 )
+from crawler.scheduler import WorkQueue
 from crawler.utils.url import add_url
 
 __all__ = [
@@ -20,6 +20,9 @@ __all__ = [
 
 
 class VideoGalleryParser(AbstractParser):
+    ready_selector = 'ul.summary-verti-list.summary-verti-list--summaryVideo li'
+    incremental = False
+
     def __init__(
         self,
         *args,
@@ -30,6 +33,7 @@ class VideoGalleryParser(AbstractParser):
         id: str = 'video_gallery',
         name: str = 'video_gallery',
         icon: Optional[str] = None,
+        scheduler: Optional[WorkQueue] = None,
         **kwargs,
     ) -> None:
         # Initialize the parent class
@@ -41,6 +45,7 @@ class VideoGalleryParser(AbstractParser):
             icon=icon,
             img_path=img_path,
             html_path=html_path,
+            scheduler=scheduler,
         )
 
     async def _parse_character_video(
@@ -52,25 +57,16 @@ class VideoGalleryParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/80/212?bbs_presentation_style=no_header&visit_device=pc'
 
-        logger.info(f'| Go to the page {url}')
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'character_video',
+            url,
+            browser_context,
+            ready_selector='ul.summary-verti-list.summary-verti-list--summaryVideo li',
+        )
 
         # start parsing
         logger.info('| Start parsing character video...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -91,8 +87,7 @@ class VideoGalleryParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'character_video')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        character_videos_info = []
+        parsers = []
         for idx, character_video in enumerate(character_video_list):
             character_video = character_video.xpath('.//a')
 
@@ -122,15 +117,11 @@ class VideoGalleryParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(character_video_parser.parse(browser_context))
+            parsers.append(character_video_parser)
 
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                character_videos_info.extend(await self._run_batch(tasks))
-                tasks = []  # Reset tasks for the next batch
-
-        if tasks:
-            character_videos_info.extend(await self._run_batch(tasks))
+        character_videos_info = await self._run_entries(
+            'character_video', parsers, browser_context
+        )
 
         res_info['data'].update({item['name']: item for item in character_videos_info})
 
@@ -147,25 +138,16 @@ class VideoGalleryParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/80/81?bbs_presentation_style=no_header&visit_device=pc'
 
-        logger.info(f'| Go to the page {url}')
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'transition_animation',
+            url,
+            browser_context,
+            ready_selector='ul.summary-verti-list.summary-verti-list--summaryVideo li',
+        )
 
         # start parsing
         logger.info('| Start parsing transition animation...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -186,8 +168,7 @@ class VideoGalleryParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'transition_animation')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        transition_animations_info = []
+        parsers = []
         for idx, transition_animation in enumerate(transition_animation_list):
             transition_animation = transition_animation.xpath('.//a')
 
@@ -218,15 +199,11 @@ class VideoGalleryParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(transition_animation_parser.parse(browser_context))
-
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                transition_animations_info.extend(await self._run_batch(tasks))
-                tasks = []
+            parsers.append(transition_animation_parser)
 
-        if tasks:
-            transition_animations_info.extend(await self._run_batch(tasks))
+        transition_animations_info = await self._run_entries(
+            'transition_animation', parsers, browser_context
+        )
 
         res_info['data'].update(
             {item['name']: item for item in transition_animations_info}
@@ -245,25 +222,16 @@ class VideoGalleryParser(AbstractParser):
 
         url = 'https://bbs.mihoyo.com/ys/obc/channel/map/80/238?bbs_presentation_style=no_header&visit_device=pc'
 
-        logger.info(f'| Go to the page {url}')
-        # Open the page
-        await context_page.goto(url)
-
-        # Ensure all network activity is complete
-        await context_page.wait_for_load_state('networkidle')
+        # Open the listing page in its own tab and save a screenshot of it
+        content, img_path, html_path = await self._load_listing(
+            'other_video',
+            url,
+            browser_context,
+            ready_selector='ul.summary-verti-list.summary-verti-list--summaryVideo li',
+        )
 
         # start parsing
         logger.info('| Start parsing other video...')
-        save_name = f'{self.save_id:04d}_full'
-        self.save_id += 1
-
-        # Save a screenshot of the page
-        content, img_path, html_path = await self._save_screenshot(
-            context_page=context_page,
-            save_name=save_name,
-            browser_context=browser_context,
-            save_screen=self.save_screen,
-        )
 
         # Save the results to the dictionary
         res_info['url'] = self.url
@@ -284,8 +252,7 @@ class VideoGalleryParser(AbstractParser):
         html_dir = os.path.join(self.html_path, 'other_video')
         os.makedirs(html_dir, exist_ok=True)
 
-        tasks = []
-        other_videos_info = []
+        parsers = []
         for idx, other_video in enumerate(other_video_list):
             other_video = other_video.xpath('.//a')
 
@@ -312,15 +279,11 @@ class VideoGalleryParser(AbstractParser):
                 html_path=html_dir,
             )
 
-            tasks.append(other_video_parser.parse(browser_context))
-
-            # If batch size is reached, execute the tasks
-            if len(tasks) == self.config.batch_size:
-                other_videos_info.extend(await self._run_batch(tasks))
-                tasks = []
+            parsers.append(other_video_parser)
 
-        if tasks:
-            other_videos_info.extend(await self._run_batch(tasks))
+        other_videos_info = await self._run_entries(
+            'other_video', parsers, browser_context
+        )
 
         res_info['data'].update({item['name']: item for item in other_videos_info})
 
@@ -328,11 +291,12 @@ class VideoGalleryParser(AbstractParser):
 
         return res_info
 
-    async def _run_batch(self, tasks):
-        """
-        Run a batch of tasks and handle any potential errors.
-        """
-        return await asyncio.gather(*tasks)
+    def categories(self) -> Dict[str, Callable[..., Awaitable[Dict[str, Any]]]]:
+        return {
+            '角色视频': self._parse_character_video,
+            '过场动画': self._parse_transition_animation,
+            '其他视频': self._parse_other_video,
+        }
 
     async def _parse(
         self,
@@ -344,18 +308,8 @@ class VideoGalleryParser(AbstractParser):
         :return: res_info: Dict[str, Any]
         """
 
-        res_info: Dict[str, Any] = dict()
-
-        res_info['角色视频'] = await self._parse_character_video(
-            context_page, browser_context
-        )
-
-        res_info['过场动画'] = await self._parse_transition_animation(
-            context_page, browser_context
-        )
-
-        res_info['其他视频'] = await self._parse_other_video(
-            context_page, browser_context
-        )
+        # Every category is an independent job, the listing pages and the
+        # entries of all categories share the global concurrency budget
+        res_info = await self._run_categories(self.categories(), browser_context)
 
         return res_info
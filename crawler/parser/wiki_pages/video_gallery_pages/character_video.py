@@ -5,7 +5,7 @@ from scrapy.selector import Selector
 
 from crawler.base import AbstractParser
 from crawler.logger import logger
-from crawler.utils.element import element_exists, save_element_overleaf
+from crawler.utils.element import element_exists
 
 __all__ = [
     'CharacterVideoParser',
@@ -13,6 +13,8 @@ __all__ = [
 
 
 class CharacterVideoParser(AbstractParser):
+    ready_selector = '.obc-tmpl-part'
+
     def __init__(
         self,
         *args,
@@ -45,21 +47,16 @@ class CharacterVideoParser(AbstractParser):
         save_name = f'{self.save_id:04d}_基础信息'
         self.save_id += 1
 
-        # Locate the matching element
-        element = context_page.locator(
+        # Locate the matching element in the section index
+        sections = await self._sections(context_page)
+        element = sections.find(
             'div.obc-tmpl-fold.obc-tmpl-part.without-border.obc-tmpl-collapsePanel'
-        ).first
+        )
         if not await element_exists(element):
             return res_info
 
-        content, img_path, html_path = await save_element_overleaf(
-            page=context_page,
-            element=element,
-            save_name=save_name,
-            img_path=self.img_path,
-            html_path=self.html_path,
-            set_width_scale=self.config.set_width_scale,
-            set_height_scale=self.config.set_height_scale,
+        content, img_path, html_path = await self._capture(
+            context_page, element, save_name
         )
 
         # Save the results to the dictionary
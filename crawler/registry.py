@@ -3,3 +3,5 @@ from mmengine.registry import Registry
 LOGGER = Registry('logger', locations=['crawler.logger'])
 
 CORE = Registry('core', locations=['crawler.core'])
+
+SINK = Registry('sink', locations=['crawler.sink'])
@@ -0,0 +1,21 @@
+from crawler.scheduler.crawl_state import (
+    CrawlState,
+    crawl_state,
+    fingerprint_of,
+    normalize_html,
+)
+from crawler.scheduler.listing_watch import ListingWatcher, listing_watcher
+from crawler.scheduler.shard import shard_of
+from crawler.scheduler.work_queue import CategoryStats, WorkQueue
+
+__all__ = [
+    'WorkQueue',
+    'CategoryStats',
+    'shard_of',
+    'CrawlState',
+    'crawl_state',
+    'fingerprint_of',
+    'normalize_html',
+    'ListingWatcher',
+    'listing_watcher',
+]
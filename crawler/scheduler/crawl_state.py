@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from lxml import html as lxml_html
+
+from crawler.logger import logger
+from crawler.utils.file_utils import assemble_project_path, link_tree
+
+__all__ = ['CrawlState', 'crawl_state', 'fingerprint_of', 'normalize_html']
+
+# Attributes that change between loads of the same content: the swiper and
+# lazy load state lives in the classes, inline styles, data and aria attributes
+DYNAMIC_ATTRIBUTE_RE = re.compile(r'^(class|style|data-.*|aria-.*)$')
+
+
+def normalize_html(content: str) -> str:
+    """HTML of a section without the attributes that change between loads"""
+    if not content.strip():
+        return content
+
+    parts = []
+    for part in lxml_html.fragments_fromstring(content):
+        if isinstance(part, str):
+            parts.append(part)
+            continue
+        for element in part.iter():
+            # Comments and processing instructions have no attributes
+            if not isinstance(element.tag, str):
+                continue
+            # A lazy image swaps its placeholder src for the one in data-src
+            source = element.get('data-src')
+            for name in list(element.attrib):
+                if DYNAMIC_ATTRIBUTE_RE.match(name):
+                    del element.attrib[name]
+            if element.tag == 'img' and source:
+                element.set('src', source)
+        parts.append(lxml_html.tostring(part, encoding='unicode', method='html'))
+    return ''.join(parts)
+
+
+def fingerprint_of(contents: List[str]) -> str:
+    """Fingerprint of the rendered HTML of the sections of an entry, normalized"""
+    digest = hashlib.sha1()
+    for content in contents:
+        digest.update(normalize_html(content).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _move_paths(value: Any, moves: List[Tuple[str, str]]) -> Any:
+    """Move the paths under the directories of the last crawl to this crawl"""
+    if isinstance(value, dict):
+        return {key: _move_paths(item, moves) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_move_paths(item, moves) for item in value]
+    if isinstance(value, str):
+        for source, target in moves:
+            if value == source or value.startswith(source + os.sep):
+                return target + value[len(source) :]
+    return value
+
+
+class CrawlState:
+    def __init__(self):
+        """
+        Persistent state of the entries crawled so far, one file per entry:
+
+            crawl_state_path/<category>/<id>.json  {'fingerprint': ...,
+                'res_info': ..., 'img_path': ..., 'html_path': ...}
+
+        An entry whose sections render the same as in the last crawl reuses
+        the result of that crawl instead of being parsed again. Its files are
+        linked from the directories of that crawl into the ones of this crawl,
+        and the paths in the result are moved along. One file per entry keeps
+        the store safe to share between worker processes.
+        """
+        self.path: Optional[str] = None
+        self.unchanged = 0
+        self.changed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def open(self, config) -> None:
+        if not config.incremental:
+            return
+        self.path = assemble_project_path(config.crawl_state_path)
+        os.makedirs(self.path, exist_ok=True)
+        logger.info(f'| Incremental crawl, state in {self.path}')
+
+    def _entry_path(self, category: Optional[str], id: str) -> str:
+        # Containers are not in a category
+        return os.path.join(self.path, category or '', f'{id}.json')
+
+    def get(
+        self,
+        category: Optional[str],
+        id: str,
+        fingerprint: str,
+        img_path: str,
+        html_path: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the result of the last crawl of an entry if it is unchanged, with
+        its files linked into the directories of this crawl
+        :param category:
+        :param id: entry id
+        :param fingerprint: fingerprint of the sections of the entry now
+        :param img_path: image directory of the entry in this crawl
+        :param html_path: html directory of the entry in this crawl
+        :return: the previous res_info, None if the entry is new or changed
+            or the files of the last crawl are gone
+        """
+        path = self._entry_path(category, id)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+            # The html of the last crawl holds its archive, without it the
+            # entry could not be re-parsed
+            if state.get('fingerprint') == fingerprint and os.path.isdir(
+                state.get('html_path') or ''
+            ):
+                link_tree(state['html_path'], html_path)
+                if os.path.isdir(state['img_path']):
+                    link_tree(state['img_path'], img_path)
+                self.unchanged += 1
+                return _move_paths(
+                    state['res_info'],
+                    [(state['img_path'], img_path), (state['html_path'], html_path)],
+                )
+
+        self.changed += 1
+        return None
+
+    def set(
+        self,
+        category: Optional[str],
+        id: str,
+        fingerprint: str,
+        res_info: Dict[str, Any],
+        img_path: str,
+        html_path: str,
+    ) -> None:
+        path = self._entry_path(category, id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {
+                    'fingerprint': fingerprint,
+                    'res_info': res_info,
+                    'img_path': img_path,
+                    'html_path': html_path,
+                },
+                f,
+                ensure_ascii=False,
+            )
+        # Replace the state in one step, a crash never leaves half a file
+        os.replace(tmp_path, path)
+
+    def log_stats(self) -> None:
+        if not self.enabled:
+            return
+        logger.info(
+            f'| Incremental crawl: {self.unchanged} unchanged entries reused, '
+            f'{self.changed} new or changed entries parsed'
+        )
+
+
+crawl_state = CrawlState()
@@ -0,0 +1,89 @@
+import json
+import os
+from typing import Dict, List, Optional, Set
+
+from crawler.logger import logger
+from crawler.utils.file_utils import assemble_project_path
+
+__all__ = ['ListingWatcher', 'listing_watcher']
+
+
+class ListingWatcher:
+    def __init__(self):
+        """
+        Snapshot of the entry ids of every listing, for the watch mode:
+
+            watch_state_path/listings.json  {category: [id, ...]}
+
+        A poll only crawls the entries missing from the snapshot. Preview
+        entries are skipped by the listings and never enter the snapshot,
+        so they are crawled on the first poll after they go live.
+        """
+        self.path: Optional[str] = None
+        self.baseline = False
+        self._snapshot: Dict[str, Set[str]] = dict()
+        self.added: Dict[str, int] = dict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def open(self, config) -> None:
+        if not config.watch:
+            return
+        self.path = os.path.join(
+            assemble_project_path(config.watch_state_path), 'listings.json'
+        )
+        self.baseline = config.watch_baseline
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                self._snapshot = {
+                    category: set(ids) for category, ids in json.load(f).items()
+                }
+        logger.info(f'| Watch listings, snapshot in {self.path}')
+
+    def new_ids(self, category: str, ids: List[str]) -> Set[str]:
+        """
+        Get the ids of a listing that are not in the snapshot. With
+        watch_baseline the first poll of a category only records its ids.
+        :param category:
+        :param ids: ids of the listing now
+        :return:
+        """
+        if category not in self._snapshot and self.baseline:
+            logger.info(f'| Watch baseline of {category}: {len(ids)} entries')
+            self.commit(category, ids)
+            return set()
+
+        new_ids = set(ids) - self._snapshot.get(category, set())
+        self.added[category] = self.added.get(category, 0) + len(new_ids)
+        if new_ids:
+            logger.info(f'| Watch found {len(new_ids)} new entries of {category}')
+        return new_ids
+
+    def commit(self, category: str, ids: List[str]) -> None:
+        """Add the ids of the entries crawled to the snapshot and save it"""
+        self._snapshot.setdefault(category, set()).update(ids)
+        if self.path is None:
+            # Not watching, the snapshot is only kept in memory
+            return
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {category: sorted(ids) for category, ids in self._snapshot.items()},
+                f,
+                ensure_ascii=False,
+                indent=4,
+            )
+        os.replace(tmp_path, self.path)
+
+    def reset_added(self) -> int:
+        """Get the number of entries added since the last call and reset it"""
+        added = sum(self.added.values())
+        self.added.clear()
+        return added
+
+
+listing_watcher = ListingWatcher()
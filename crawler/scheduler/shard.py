@@ -0,0 +1,17 @@
+import hashlib
+
+__all__ = ['shard_of']
+
+
+def shard_of(entry_id: str, workers: int) -> int:
+    """
+    Get the worker an entry belongs to, the hash is stable across processes
+    and runs (unlike the builtin hash, which is salted per process)
+    :param entry_id:
+    :param workers:
+    :return: worker index in [0, workers)
+    """
+    if workers <= 1:
+        return 0
+    digest = hashlib.md5(str(entry_id).encode('utf-8')).hexdigest()
+    return int(digest, 16) % workers
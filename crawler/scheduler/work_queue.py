@@ -0,0 +1,132 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List
+
+from crawler.logger import logger
+
+__all__ = ['WorkQueue', 'CategoryStats']
+
+
+@dataclass
+class CategoryStats:
+    queued: int = 0
+    in_flight: int = 0
+    done: int = 0
+    failed: int = 0
+    busy_time: float = 0.0
+
+
+class WorkQueue:
+    def __init__(self, *args, concurrency: int = 1, **kwargs) -> None:
+        """
+        bounded-concurrency work queue shared by all parsers
+
+        A new job starts as soon as any slot frees, so one slow entry only
+        occupies its own slot instead of holding back a whole batch.
+
+        :param concurrency: max number of jobs running at the same time
+        :return:
+        """
+        self.concurrency = max(1, int(concurrency))
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._stats: Dict[str, CategoryStats] = dict()
+
+    def _category_stats(self, category: str) -> CategoryStats:
+        if category not in self._stats:
+            self._stats[category] = CategoryStats()
+        return self._stats[category]
+
+    async def run(self, category: str, job: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        wait for a free slot and run the job in it
+
+        :param category: category the job is accounted to
+        :param job: coroutine function, called only once a slot is acquired
+        :return: the result of the job
+        """
+        stats = self._category_stats(category)
+
+        stats.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            stats.queued -= 1
+
+        stats.in_flight += 1
+        start_time = time.monotonic()
+        try:
+            result = await job()
+        except BaseException:
+            stats.failed += 1
+            raise
+        else:
+            stats.done += 1
+            return result
+        finally:
+            stats.busy_time += time.monotonic() - start_time
+            stats.in_flight -= 1
+            self._semaphore.release()
+
+    async def map(
+        self, category: str, jobs: Iterable[Callable[[], Awaitable[Any]]]
+    ) -> List[Any]:
+        """
+        run all jobs through the queue and keep the order of the results
+
+        :param category: category the jobs are accounted to
+        :param jobs: coroutine functions
+        :return: results in the same order as the jobs
+        """
+        tasks = [asyncio.ensure_future(self.run(category, job)) for job in jobs]
+        if not tasks:
+            return []
+
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        self.log_stats(category)
+
+        return results
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        get queue depth and in-flight counts per category
+
+        :return:
+        """
+        return {
+            category: {
+                'queued': stats.queued,
+                'in_flight': stats.in_flight,
+                'done': stats.done,
+                'failed': stats.failed,
+                'busy_time': round(stats.busy_time, 2),
+            }
+            for category, stats in self._stats.items()
+        }
+
+    def log_stats(self, category: str) -> None:
+        stats = self._category_stats(category)
+        logger.info(
+            f'| Scheduler [{category}] queued: {stats.queued}, in flight: {stats.in_flight}, '
+            f'done: {stats.done}, failed: {stats.failed}, busy: {stats.busy_time:.2f}s'
+        )
+
+    async def report(self, interval: float = 30) -> None:
+        """
+        log the stats of all active categories every interval seconds,
+        run it as a background task and cancel it when the crawl is done
+
+        :param interval: seconds between two reports
+        :return:
+        """
+        while True:
+            await asyncio.sleep(interval)
+            for category, stats in list(self._stats.items()):
+                if stats.queued or stats.in_flight:
+                    self.log_stats(category)
@@ -0,0 +1,6 @@
+from crawler.sink.es_sink import ElasticsearchSink
+from crawler.sink.jsonl_sink import JsonlSink
+from crawler.sink.parquet_sink import ParquetSink
+from crawler.sink.redis_sink import RedisSink
+
+__all__ = ['JsonlSink', 'ParquetSink', 'ElasticsearchSink', 'RedisSink']
@@ -0,0 +1,46 @@
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+from crawler.base import AbstractSink
+from crawler.logger import logger
+from crawler.registry import SINK
+
+__all__ = ['ElasticsearchSink']
+
+
+@SINK.register_module(force=True)
+class ElasticsearchSink(AbstractSink):
+    def __init__(self, *args, index_prefix: str = 'genshin_impact_', **kwargs):
+        """
+        Index the entries into Elasticsearch with the bulk api, one index per
+        category and the entry id as document id, so a crawl run again
+        replaces the documents instead of adding new ones
+        :param index_prefix: prefix of the index names
+        """
+        super().__init__()
+        self.index_prefix = index_prefix
+        self.client = None
+
+    async def open(self, config) -> None:
+        # The client is only needed, and connected, when the sink is used
+        from crawler.es import es_client
+
+        self.client = es_client.client
+
+    def _bulk(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        from elasticsearch.helpers import bulk
+
+        actions = [
+            {
+                '_index': f'{self.index_prefix}{category}',
+                '_id': str(res_info['id']),
+                '_source': res_info,
+            }
+            for category, res_info in batch
+        ]
+        success, errors = bulk(self.client, actions, raise_on_error=False)
+        if errors:
+            logger.info(f'| Error: {len(errors)} entries not indexed - {errors[0]}')
+
+    async def write_batch(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        await asyncio.to_thread(self._bulk, batch)
@@ -0,0 +1,40 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from crawler.base import AbstractSink
+from crawler.registry import SINK
+from crawler.writer.jsonl_writer import result_writer
+
+__all__ = ['JsonlSink']
+
+
+@SINK.register_module(force=True)
+class JsonlSink(AbstractSink):
+    # The files are what --resume continues and the exports read
+    durable = True
+
+    def __init__(self, *args, **kwargs):
+        """
+        Append the entries to exp_path/results/<category>/worker_XX.jsonl,
+        the files the exports read back, --resume cuts them to the last checkpoint
+        """
+        super().__init__()
+
+    async def open(self, config) -> None:
+        result_writer.open(config)
+
+    def _write(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        for category, res_info in batch:
+            result_writer.write(category, res_info)
+
+    async def write_batch(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        await asyncio.to_thread(self._write, batch)
+
+    async def sync(self) -> Dict[str, int]:
+        return await asyncio.to_thread(result_writer.sync)
+
+    async def restore(self, state: Optional[Dict[str, int]]) -> None:
+        await asyncio.to_thread(result_writer.restore, state)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(result_writer.close)
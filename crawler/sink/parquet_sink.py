@@ -0,0 +1,206 @@
+import asyncio
+import glob
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from crawler.base import AbstractSink
+from crawler.logger import logger
+from crawler.registry import SINK
+from crawler.writer.arrow_export import build_table, section_value
+
+__all__ = ['ParquetSink']
+
+
+def _part_index(path: str) -> int:
+    return int(os.path.basename(path).rsplit('-', 1)[-1].split('.', 1)[0])
+
+
+@SINK.register_module(force=True)
+class ParquetSink(AbstractSink):
+    # Part of the resume checkpoint, the buffered rows are written at every one
+    durable = True
+
+    def __init__(self, *args, rows_per_file: int = 1000, **kwargs):
+        """
+        Write the entries straight to Parquet while the crawl runs, one file
+        every rows_per_file entries of a category, or fewer at a checkpoint:
+
+            exp_path/sinks/parquet/category=<category>/part-<worker>-<n>.parquet
+
+        The first file of a category pins its schema for every file and
+        worker after it, in exp_path/sinks/parquet/_schemas/<category>.arrow.
+        A later entry whose section does not fit the pinned type gets a null
+        there and a section the schema has no column for is left out, the
+        JSONL results and the export keep both.
+        :param rows_per_file: entries kept in memory per category before a file is written
+        """
+        super().__init__()
+        self.rows_per_file = rows_per_file
+        self.path: Optional[str] = None
+        self.worker_index = 0
+        self.compression = 'zstd'
+
+        self._rows: Dict[str, List[Dict[str, Any]]] = dict()
+        self._parts: Dict[str, int] = dict()
+        self._schemas: Dict[str, pa.Schema] = dict()
+
+    async def open(self, config) -> None:
+        self.path = os.path.join(config.exp_path, 'sinks', 'parquet')
+        self.worker_index = config.worker_index
+        self.compression = config.parquet_compression
+
+        # The files of an earlier run of this worker are written again
+        if not config.resume:
+            for path in self._own_parts():
+                os.remove(path)
+
+    def _own_parts(self) -> List[str]:
+        pattern = f'part-{self.worker_index:02d}-*.parquet'
+        return glob.glob(os.path.join(self.path, 'category=*', pattern))
+
+    async def restore(self, state: Optional[Dict[str, int]]) -> None:
+        """
+        Remove the files this worker wrote after the last checkpoint
+        :param state: category -> number of files, returned by sync
+        :return:
+        """
+        self._parts = dict(state or {})
+        for path in self._own_parts():
+            category = os.path.basename(os.path.dirname(path)).split('=', 1)[-1]
+            if _part_index(path) >= self._parts.get(category, 0):
+                os.remove(path)
+
+    def _schema(self, category: str, table: pa.Table) -> pa.Schema:
+        """
+        The schema of a category, the first worker to write one pins it
+        :param category:
+        :param table: first table of the category, a column of nulls is pinned as text
+        :return:
+        """
+        if category in self._schemas:
+            return self._schemas[category]
+
+        path = os.path.join(self.path, '_schemas', f'{category}.arrow')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not os.path.exists(path):
+            schema = pa.schema(
+                [
+                    pa.field(field.name, pa.string())
+                    if pa.types.is_null(field.type)
+                    else field
+                    for field in table.schema
+                ]
+            )
+            tmp_path = f'{path}.{self.worker_index:02d}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(schema.serialize().to_pybytes())
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                # Link fails when another worker pinned the schema first
+                os.link(tmp_path, path)
+            except FileExistsError:
+                pass
+            os.remove(tmp_path)
+
+        with open(path, 'rb') as f:
+            self._schemas[category] = pa.ipc.read_schema(pa.py_buffer(f.read()))
+        return self._schemas[category]
+
+    def _conform(
+        self, category: str, rows: List[Dict[str, Any]], table: pa.Table
+    ) -> pa.Table:
+        """
+        Fit the table of a file to the schema of its category
+        :param category:
+        :param rows: entries of the table
+        :param table: built from the entries
+        :return:
+        """
+        schema = self._schema(category, table)
+        dropped = [name for name in table.column_names if name not in schema.names]
+        if dropped:
+            logger.info(f'| Parquet {category}: no column for {dropped}')
+
+        columns = []
+        for field in schema:
+            if field.name in table.column_names:
+                column = table.column(field.name)
+                if column.type == field.type:
+                    columns.append(column)
+                    continue
+            # The entry fields are always text, only a section gets here
+            values = [
+                section_value(field.name, (row.get('data') or {}).get(field.name))
+                for row in rows
+            ]
+            columns.append(self._refit(values, field.type))
+        return pa.table(columns, schema=schema)
+
+    @staticmethod
+    def _refit(values: List[Any], data_type: pa.DataType) -> pa.Array:
+        """Build a column of the pinned type, a value that does not fit becomes null"""
+        if pa.types.is_string(data_type):
+            # A section pinned as text keeps the other shapes as JSON text
+            return pa.array(
+                [
+                    None if value is None else json.dumps(value, ensure_ascii=False)
+                    for value in values
+                ],
+                type=data_type,
+            )
+        try:
+            return pa.array(values, type=data_type)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            pass
+
+        fitted = []
+        for value in values:
+            try:
+                pa.array([value], type=data_type)
+                fitted.append(value)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                fitted.append(None)
+        return pa.array(fitted, type=data_type)
+
+    def _flush(self, category: str) -> None:
+        rows = self._rows.pop(category, [])
+        if not rows:
+            return
+
+        table = self._conform(category, rows, build_table(rows))
+        part = self._parts.get(category, 0)
+        path = os.path.join(
+            self.path,
+            f'category={category}',
+            f'part-{self.worker_index:02d}-{part:05d}.parquet',
+        )
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            pq.write_table(table, f, compression=self.compression)
+            f.flush()
+            os.fsync(f.fileno())
+        self._parts[category] = part + 1
+
+    async def write_batch(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        for category, res_info in batch:
+            rows = self._rows.setdefault(category, [])
+            rows.append(res_info)
+            if len(rows) >= self.rows_per_file:
+                await asyncio.to_thread(self._flush, category)
+
+    def _flush_all(self) -> Dict[str, int]:
+        for category in list(self._rows.keys()):
+            self._flush(category)
+        return dict(self._parts)
+
+    async def sync(self) -> Dict[str, int]:
+        """Write the buffered rows of every category, returns the files per category"""
+        return await asyncio.to_thread(self._flush_all)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._flush_all)
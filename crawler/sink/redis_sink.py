@@ -0,0 +1,53 @@
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from redis import Redis  # type: ignore
+
+from crawler.base import AbstractSink
+from crawler.registry import SINK
+
+__all__ = ['RedisSink']
+
+
+@SINK.register_module(force=True)
+class RedisSink(AbstractSink):
+    def __init__(
+        self,
+        *args,
+        key_prefix: str = 'genshin_impact:',
+        redis_db_host: str = '127.0.0.1',
+        redis_db_port: int = 6379,
+        redis_db_num: int = 0,
+        redis_db_pwd: Optional[str] = None,
+        **kwargs,
+    ):
+        """
+        Store the entries in redis, one hash per category with the entry id as
+        field and the result as JSON, written with one pipeline per batch
+        :param key_prefix: prefix of the hash keys
+        """
+        super().__init__()
+        self.key_prefix = key_prefix
+        self._redis_client = Redis(
+            host=redis_db_host,
+            port=redis_db_port,
+            db=redis_db_num,
+            password=redis_db_pwd,
+        )
+
+    def _write(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        pipeline = self._redis_client.pipeline(transaction=False)
+        for category, res_info in batch:
+            pipeline.hset(
+                f'{self.key_prefix}{category}',
+                str(res_info['id']),
+                json.dumps(res_info, ensure_ascii=False),
+            )
+        pipeline.execute()
+
+    async def write_batch(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        await asyncio.to_thread(self._write, batch)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._redis_client.close)
@@ -0,0 +1,228 @@
+import asyncio
+import glob
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from crawler.logger import logger
+from crawler.utils.file_utils import assemble_project_path, link_file
+
+__all__ = ['ArtifactStore', 'artifact_store', 'collect_garbage', 'read_runs']
+
+
+def _blob_path(store_path: str, digest: str) -> str:
+    # Two levels of 256 directories keep every directory small
+    return os.path.join(store_path, 'blobs', digest[:2], digest[2:4], digest)
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _runs_path(exp_path: str) -> str:
+    return os.path.join(exp_path, 'runs.json')
+
+
+def read_runs(exp_path: str) -> List[str]:
+    """Ids of the runs whose files are in an exp path, none once it is removed"""
+    path = _runs_path(exp_path)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json(path: str, data: Any) -> None:
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    # Replace the file in one step, a crash never leaves half a file
+    os.replace(tmp_path, path)
+
+
+class ArtifactStore:
+    def __init__(self):
+        """
+        Content-addressed store of the screenshots and HTML files of every
+        crawl, kept out of exp_path:
+
+            artifact_store_path/blobs/<ab>/<cd>/<sha256>
+            artifact_store_path/manifests/<run_id>/worker_<n>.json
+                {'run_id': ..., 'exp_path': ..., 'files': {path in exp_path: sha256}}
+            exp_path/runs.json  [run_id, ...]
+
+        The files of a crawl are hard links to their blobs, so content saved by
+        many entries or crawls is stored once and the paths in the results
+        still resolve. Every run has its own manifests, listing the blobs it
+        references, and is listed in the runs.json of the exp path it wrote
+        to. collect_garbage drops the blobs no retained run references.
+        """
+        self.path: Optional[str] = None
+        self.exp_path: Optional[str] = None
+        self.run_id: Optional[str] = None
+        self.manifest_path: Optional[str] = None
+
+        self.files: Dict[str, str] = dict()
+        # Files the image pool wrote, stored once it is done
+        self._pending: Set[str] = set()
+
+        self.stored = 0
+        self.reused = 0
+        self.bytes_saved = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def open(self, config) -> None:
+        if not config.artifact_store:
+            return
+        self.path = assemble_project_path(config.artifact_store_path)
+        self.exp_path = config.exp_path
+        self.run_id = config.run_id
+        self.manifest_path = os.path.join(
+            self.path,
+            'manifests',
+            self.run_id,
+            f'worker_{config.worker_index:02d}.json',
+        )
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+
+        # The files an earlier run left in the exp path stay in its manifests,
+        # it is retained as long as it is listed here
+        if config.worker_index == 0:
+            run_ids = read_runs(self.exp_path)
+            if self.run_id not in run_ids:
+                _write_json(_runs_path(self.exp_path), run_ids + [self.run_id])
+
+        logger.info(f'| Artifact store in {self.path}, run {self.run_id}')
+
+    def _blob(self, path: str, digest: str, data: Optional[bytes] = None) -> None:
+        """Store the content of path as the blob of digest, unless it is stored"""
+        blob = _blob_path(self.path, digest)
+        if os.path.exists(blob):
+            self.reused += 1
+            self.bytes_saved += os.path.getsize(blob)
+        else:
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            # A blob is complete or absent, workers may store the same one
+            tmp_path = f'{blob}.{uuid.uuid4().hex}.tmp'
+            if data is None:
+                try:
+                    os.link(path, tmp_path)
+                except OSError:
+                    shutil.copyfile(path, tmp_path)
+            else:
+                with open(tmp_path, 'wb') as file:
+                    file.write(data)
+            os.replace(tmp_path, blob)
+            self.stored += 1
+
+        link_file(blob, path)
+        self.files[os.path.relpath(path, self.exp_path)] = digest
+
+    def put(self, path: str, data: bytes) -> None:
+        """Write a file through the store, in the threads of the artifact writer"""
+        self._blob(path, hashlib.sha256(data).hexdigest(), data)
+
+    def ingest(self, path: str) -> None:
+        """Move a file that is already written into the store"""
+        self._blob(path, _file_digest(path))
+
+    def add(self, path: str) -> None:
+        """Store a file of the image pool once the crawl is done"""
+        if self.enabled:
+            self._pending.add(path)
+
+    def _ingest_pending(self) -> None:
+        for path in sorted(self._pending):
+            try:
+                self.ingest(path)
+            except Exception as e:
+                logger.info(f'| Error: {e} - store {path}')
+        self._pending.clear()
+
+    async def close(self) -> None:
+        """Store the files of the image pool and save the manifest of the run"""
+        if not self.enabled:
+            return
+
+        await asyncio.to_thread(self._ingest_pending)
+
+        _write_json(
+            self.manifest_path,
+            {'run_id': self.run_id, 'exp_path': self.exp_path, 'files': self.files},
+        )
+
+        logger.info(
+            f'| Artifact store: {len(self.files)} files, {self.stored} blobs stored, '
+            f'{self.reused} reused ({self.bytes_saved / 1024 / 1024:.2f} MB saved)'
+        )
+        self.path = None
+        self.files.clear()
+
+
+def collect_garbage(store_path: str, keep_runs: int = 0) -> Tuple[int, int, int]:
+    """
+    Drop the manifests of the runs that are not retained and the blobs no
+    retained run references. A run is retained while the runs.json of its exp
+    path lists it, i.e. until the exp path is removed, and only the latest
+    keep_runs of them. Run it between crawls.
+    :param store_path: config.artifact_store_path
+    :param keep_runs: runs retained, 0 retains every run that is listed
+    :return: runs dropped, blobs removed, bytes freed
+    """
+    runs = []
+    for run_path in glob.glob(os.path.join(store_path, 'manifests', '*')):
+        manifests = []
+        for manifest_path in glob.glob(os.path.join(run_path, 'worker_*.json')):
+            with open(manifest_path, encoding='utf-8') as f:
+                manifests.append(json.load(f))
+        runs.append((os.path.basename(run_path), run_path, manifests))
+    # Run ids are start times, the latest runs first
+    runs.sort(key=lambda run: run[0], reverse=True)
+
+    # Number of references of every blob by the retained runs
+    references: Counter = Counter()
+    dropped = 0
+    retained = 0
+    for run_id, run_path, manifests in runs:
+        listed = any(
+            run_id in read_runs(manifest['exp_path']) for manifest in manifests
+        )
+        if listed and (not keep_runs or retained < keep_runs):
+            retained += 1
+            for manifest in manifests:
+                references.update(manifest['files'].values())
+        else:
+            shutil.rmtree(run_path, ignore_errors=True)
+            dropped += 1
+
+    removed = 0
+    freed = 0
+    for directory, _, file_names in os.walk(os.path.join(store_path, 'blobs')):
+        for file_name in file_names:
+            if references[file_name.split('.', 1)[0]] and not file_name.endswith(
+                '.tmp'
+            ):
+                continue
+            path = os.path.join(directory, file_name)
+            stat = os.stat(path)
+            os.remove(path)
+            removed += 1
+            # A blob a crawl still links to only frees its space with that crawl
+            if stat.st_nlink == 1:
+                freed += stat.st_size
+
+    return dropped, removed, freed
+
+
+artifact_store = ArtifactStore()
@@ -0,0 +1,178 @@
+import asyncio
+import os
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Set, Tuple, Union
+
+from crawler.logger import logger
+from crawler.utils.artifact_store import artifact_store
+from crawler.utils.file_utils import link_file, unlink_file
+from crawler.utils.html_files import (
+    save_archive_file,
+    save_html_file,
+    serialize_html,
+)
+from crawler.utils.metrics import timings
+
+__all__ = ['ArtifactWriter', 'artifact_writer']
+
+# kind, path, data, time queued
+Artifact = Tuple[str, str, Union[bytes, str], float]
+
+
+class ArtifactWriter:
+    def __init__(self):
+        """
+        Write the screenshots and HTML files of the parsers in a pool of
+        threads, so that no file io runs on the event loop that drives the
+        pages. The writes are spread over config.artifact_workers lanes by
+        path: the writes of a path keep their order, and a path written twice
+        in one batch is only written once, with its last content. Every lane
+        has a bounded queue, a parser only waits while its lane is full.
+        With config.artifact_store the files are written through the store.
+        """
+        self.batch_size = 16
+        self.html_serializer = 'raw'
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queues: List[asyncio.Queue] = []
+        self._workers: List[asyncio.Task] = []
+        self._dirs: Set[str] = set()
+
+        self.written = 0
+        self.skipped = 0
+        self.failed = 0
+        self.bytes = 0
+        self.max_depth = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._executor is not None
+
+    def open(self, config) -> None:
+        self.batch_size = config.artifact_batch_size
+        self.html_serializer = config.html_serializer
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.artifact_workers, thread_name_prefix='artifact'
+        )
+        for _ in range(config.artifact_workers):
+            queue: asyncio.Queue = asyncio.Queue(maxsize=config.artifact_queue_size)
+            self._queues.append(queue)
+            self._workers.append(asyncio.create_task(self._drain(queue)))
+
+    async def write_bytes(self, path: str, data: bytes) -> None:
+        """Write bytes, e.g. a png screenshot"""
+        await self._put('png', path, data)
+
+    async def write_html(self, path: str, content: str) -> None:
+        """Write HTML with config.html_serializer, serialized in the thread too"""
+        await self._put('html', path, content)
+
+    async def write_text(self, path: str, text: str) -> None:
+        """Write text as it is, e.g. the archived HTML of a page"""
+        await self._put('text', path, text)
+
+    async def write_link(self, path: str, source: str) -> None:
+        """Link path to an existing file, e.g. an unchanged screenshot"""
+        await self._put('link', path, source)
+
+    async def _put(self, kind: str, path: str, data: Union[bytes, str]) -> None:
+        artifact = (kind, path, data, time.monotonic())
+        if not self.enabled:
+            # No writer is open, e.g. a parser used on its own
+            await asyncio.to_thread(self._write_batch, [artifact])
+            return
+
+        queue = self._queues[zlib.crc32(path.encode('utf-8')) % len(self._queues)]
+        await queue.put(artifact)
+        self.max_depth = max(self.max_depth, queue.qsize())
+
+    async def _drain(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            await loop.run_in_executor(self._executor, self._write_batch, batch)
+
+            for _ in batch:
+                queue.task_done()
+
+    def _content(self, kind: str, data: Union[bytes, str]) -> bytes:
+        """Bytes of the file an artifact is written to"""
+        if kind == 'html':
+            data = serialize_html(data, self.html_serializer)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return data
+
+    def _write_batch(self, batch: List[Artifact]) -> None:
+        # Only the last write of a path in the batch is needed
+        last = {path: idx for idx, (_, path, _, _) in enumerate(batch)}
+
+        for idx, (kind, path, data, queued) in enumerate(batch):
+            if last[path] != idx:
+                self.skipped += 1
+                continue
+
+            try:
+                directory = os.path.dirname(path)
+                if directory not in self._dirs:
+                    os.makedirs(directory, exist_ok=True)
+                    self._dirs.add(directory)
+
+                if kind == 'link':
+                    link_file(data, path)
+                    if artifact_store.enabled:
+                        artifact_store.ingest(path)
+                elif artifact_store.enabled:
+                    # Identical content is stored once, the path links to it
+                    artifact_store.put(path, self._content(kind, data))
+                elif kind == 'html':
+                    save_html_file(data, path, self.html_serializer)
+                elif kind == 'text':
+                    save_archive_file(data, path)
+                else:
+                    unlink_file(path)
+                    with open(path, 'wb') as file:
+                        file.write(data)
+            except Exception as e:
+                self.failed += 1
+                logger.info(f'| Error: {e} - write {path}')
+                continue
+
+            self.written += 1
+            if kind != 'link':
+                self.bytes += len(data)
+            timings.record(f'artifact_write/{kind}', time.monotonic() - queued)
+
+    async def flush(self) -> None:
+        """Wait until every queued artifact is written"""
+        for queue in self._queues:
+            await queue.join()
+
+    async def close(self) -> None:
+        """Write what is left in the queues and stop the threads"""
+        if not self.enabled:
+            return
+
+        await self.flush()
+        for worker in self._workers:
+            worker.cancel()
+        self._executor.shutdown(wait=True)
+        self.log_stats()
+
+        self._executor = None
+        self._queues.clear()
+        self._workers.clear()
+
+    def log_stats(self) -> None:
+        logger.info(
+            f'| Artifacts: {self.written} written ({self.bytes / 1024 / 1024:.2f} MB), '
+            f'{self.skipped} superseded, {self.failed} failed, '
+            f'max queue depth {self.max_depth}'
+        )
+
+
+artifact_writer = ArtifactWriter()
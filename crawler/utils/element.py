@@ -1,20 +1,25 @@
 import os
+import time
 from typing import List
 
 from playwright.async_api import Locator
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
-from crawler.utils.html_files import save_html_file
+from crawler.offline import OfflineLocator
+from crawler.utils.artifact_writer import artifact_writer
+from crawler.utils.image_encode import screenshot_encoder
 
 
-async def element_exists(locator: Locator | List[Locator]) -> bool:
+async def element_exists(
+    locator: Locator | OfflineLocator | List[Locator] | None,
+) -> bool:
     try:
         if isinstance(locator, list):
             if len(locator) == 0:
                 return False
             else:
                 return True
-        elif isinstance(locator, Locator):
+        elif isinstance(locator, (Locator, OfflineLocator)):
             count = await locator.count()
             if count > 0:
                 return True
@@ -40,16 +45,15 @@ async def save_element_overleaf(
 
     image = await element.screenshot()
 
-    img_path = os.path.join(img_path, f'{save_name}.png')
-    with open(img_path, 'wb') as file:
-        file.write(image)
+    img_path = screenshot_encoder.path(img_path, save_name)
+    await screenshot_encoder.write(image, img_path)
 
     # Get the inner HTML of the element
     content = await element.evaluate('el => el.outerHTML')
 
     # Save the HTML content to a file
     html_path = os.path.join(html_path, f'{save_name}.html')
-    save_html_file(content, html_path)
+    await artifact_writer.write_html(html_path, content)
 
     await page.set_viewport_size(original_viewport_size)
 
@@ -61,15 +65,151 @@ async def save_element(element, save_name, img_path, html_path):  # type: ignore
 
     image = await element.screenshot()
 
-    img_path = os.path.join(img_path, f'{save_name}.png')
-    with open(img_path, 'wb') as file:
-        file.write(image)
+    img_path = screenshot_encoder.path(img_path, save_name)
+    await screenshot_encoder.write(image, img_path)
 
     # Get the inner HTML of the element
     content = await element.evaluate('el => el.outerHTML')
 
     # Save the HTML content to a file
     html_path = os.path.join(html_path, f'{save_name}.html')
-    save_html_file(content, html_path)
+    await artifact_writer.write_html(html_path, content)
 
     return content, img_path, html_path
+
+
+async def wait_until_ready(
+    page, selector, timeout=10000, min_count=1, stable_ms=300
+) -> bool:  # type: ignore
+    """Wait until at least min_count elements match the selector and their count
+    has not changed for stable_ms, all in the page, without any round trip per poll
+    """
+    try:
+        await page.wait_for_function(
+            """([selector, minCount, stableMs]) => {
+                const count = document.querySelectorAll(selector).length;
+                const now = performance.now();
+                const states = window.__readyStates || (window.__readyStates = {});
+                const state = states[selector];
+                if (!state || state.count !== count) {
+                    states[selector] = {count: count, since: now};
+                    return false;
+                }
+                return count >= minCount && now - state.since >= stableMs;
+            }""",
+            arg=[selector, min_count, stable_ms],
+            timeout=timeout,
+            polling=100,
+        )
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+async def disable_transitions(page) -> None:  # type: ignore
+    """Inject css that turns off the transitions and animations of the page,
+    so that a switched slide or expanded panel is in place right away
+    """
+    await page.add_style_tag(
+        content="""
+            *, *::before, *::after {
+                transition: none !important;
+                transition-duration: 0s !important;
+                animation: none !important;
+            }
+        """
+    )
+
+
+async def switch_to(
+    target, watch=None, active_class=None, timeout=2000, settle_ms=100
+) -> float:  # type: ignore
+    """Click a swiper bullet or tab and wait for the switch instead of a fixed sleep
+
+    :param target: element to click
+    :param watch: element whose content changes after the click, e.g. a panel
+    :param active_class: class the target gets once it is active
+    :param timeout: ms to wait at most
+    :param settle_ms: ms without mutations of the watched element to be settled
+    :return: seconds waited after the click
+    """
+    if watch is not None:
+        # Count the mutations of the watched element from before the click
+        await watch.evaluate("""el => {
+            const state = {count: 0, last: performance.now()};
+            el.__switchObserver && el.__switchObserver.disconnect();
+            el.__switchObserver = new MutationObserver(() => {
+                state.count += 1;
+                state.last = performance.now();
+            });
+            el.__switchObserver.observe(el, {attributes: true, childList: true, subtree: true, characterData: true});
+            el.__switchState = state;
+        }""")
+
+    await target.click()
+    click_time = time.monotonic()
+
+    if active_class:
+        await target.evaluate(
+            """(el, [activeClass, timeout]) => new Promise(resolve => {
+                if (el.classList.contains(activeClass)) {
+                    resolve(true);
+                    return;
+                }
+                const timer = setTimeout(() => { observer.disconnect(); resolve(false); }, timeout);
+                const observer = new MutationObserver(() => {
+                    if (el.classList.contains(activeClass)) {
+                        clearTimeout(timer);
+                        observer.disconnect();
+                        resolve(true);
+                    }
+                });
+                observer.observe(el, {attributes: true, attributeFilter: ['class']});
+            })""",
+            [active_class, timeout],
+        )
+
+    if watch is not None:
+        await watch.evaluate(
+            """(el, [timeout, settleMs]) => new Promise(resolve => {
+                const state = el.__switchState;
+                const start = performance.now();
+                const check = () => {
+                    const now = performance.now();
+                    const settled = state.count > 0 && now - state.last >= settleMs;
+                    if (settled || now - start >= timeout) {
+                        el.__switchObserver.disconnect();
+                        resolve(settled);
+                    } else {
+                        setTimeout(check, 25);
+                    }
+                };
+                check();
+            })""",
+            [timeout, settle_ms],
+        )
+
+    # Let the page paint the switched content before it is captured
+    await target.evaluate(
+        """() => new Promise(resolve =>
+            requestAnimationFrame(() => requestAnimationFrame(resolve)))"""
+    )
+
+    return time.monotonic() - click_time
+
+
+async def read_swiper(element) -> List[dict]:  # type: ignore
+    """Read the bullet label and the inner HTML of every slide of the swipers
+    in an element, in one round trip and without switching slides. The slides
+    of all swipers are in document order, like the bullets and slides the
+    parsers locate with element.locator('div.mhy-swiper')
+    """
+    return await element.evaluate("""el => {
+        const bullets = el.querySelectorAll(
+            ':scope div.mhy-swiper li.swiper-pagination-bullet');
+        const slides = el.querySelectorAll(':scope div.mhy-swiper div.swiper-slide');
+        return Array.from(slides).map((slide, idx) => ({
+            label: bullets[idx] ? bullets[idx].textContent : null,
+            html: slide.innerHTML,
+        }));
+    }""")
@@ -1,4 +1,5 @@
 import os
+import shutil
 
 
 def assemble_project_path(path):
@@ -12,3 +13,30 @@ def get_project_root():
     path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     path = os.path.dirname(path)  # get to parent, outside of project code path"
     return path
+
+
+def unlink_file(path):
+    """Remove a file before writing it again, a link it shares is never written through"""
+    if os.path.lexists(path):
+        os.remove(path)
+
+
+def link_file(source, path):
+    """Point path to the file at source, a hard link where the filesystem allows it"""
+    if os.path.abspath(source) == os.path.abspath(path):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    unlink_file(path)
+    try:
+        os.link(source, path)
+    except OSError:
+        # Another filesystem, or links are not supported
+        shutil.copyfile(source, path)
+
+
+def link_tree(source, target):
+    """Link every file under source to the same path under target"""
+    for directory, _, file_names in os.walk(source):
+        for file_name in file_names:
+            path = os.path.join(directory, file_name)
+            link_file(path, os.path.join(target, os.path.relpath(path, source)))
@@ -1,10 +1,106 @@
+import glob
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
 from bs4 import BeautifulSoup
+from lxml import html as lxml_html
+
+from crawler.utils.file_utils import unlink_file
+
+# 'raw' writes the html as it is, 'lxml' canonicalizes it with lxml,
+# 'prettify' indents it with BeautifulSoup and is by far the slowest
+HTML_SERIALIZERS = ('raw', 'lxml', 'prettify')
+
+DOCUMENT_RE = re.compile(r'\s*<(!doctype|html)', re.IGNORECASE)
+
+
+def _canonicalize(html_content: str) -> str:
+    """parse and serialize html with lxml: tags closed, attributes quoted"""
+    if not html_content.strip():
+        return html_content
+
+    if DOCUMENT_RE.match(html_content):
+        document = lxml_html.document_fromstring(html_content)
+        return lxml_html.tostring(
+            document,
+            encoding='unicode',
+            method='html',
+            doctype=document.getroottree().docinfo.doctype,
+        )
+
+    # A section is a fragment, text before its first tag is kept as it is
+    return ''.join(
+        part
+        if isinstance(part, str)
+        else lxml_html.tostring(part, encoding='unicode', method='html')
+        for part in lxml_html.fragments_fromstring(html_content)
+    )
+
+
+def serialize_html(html_content: str, serializer: str = 'prettify') -> str:
+    """serialize html for a file with one of HTML_SERIALIZERS"""
+    if serializer == 'raw':
+        return html_content
+    if serializer == 'lxml':
+        return _canonicalize(html_content)
+    if serializer == 'prettify':
+        soup = BeautifulSoup(html_content, 'html.parser')
+        return soup.prettify()
+    raise ValueError(f'Unknown html serializer: {serializer}')
 
 
-def save_html_file(html_content: str, path: str):
+def save_html_file(html_content: str, path: str, serializer: str = 'prettify'):
     """save html to file"""
-    soup = BeautifulSoup(html_content, 'html.parser')
-    formatted_html = soup.prettify()
+    formatted_html = serialize_html(html_content, serializer)
 
-    with open(path, 'w') as file:
+    unlink_file(path)
+    with open(path, 'w', encoding='utf-8') as file:
         file.write(formatted_html)
+
+
+def archive_path(html_path: str, save_name: str) -> str:
+    """path of the raw html of a page, kept for --reparse"""
+    return os.path.join(html_path, f'{save_name}.archive.html')
+
+
+def save_archive_file(html_content: str, path: str):
+    """save html to file as it is, parsers read it back unchanged"""
+    unlink_file(path)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(html_content)
+
+
+def format_html_file(path: str, serializer: str = 'prettify'):
+    """format a saved html file in place"""
+    with open(path, encoding='utf-8') as file:
+        html_content = file.read()
+    save_html_file(html_content, path, serializer)
+
+
+def format_html_files(html_path: str, serializer: str = 'prettify', workers: int = 0):
+    """
+    format the html files of a crawl in a pool of processes, after the crawl
+    wrote them raw. The archives --reparse reads are left as they are.
+    :param html_path: html path of the crawl
+    :param serializer: one of HTML_SERIALIZERS
+    :param workers: number of processes, 0 uses every cpu
+    :return: number of files formatted
+    """
+    paths = [
+        path
+        for path in glob.glob(os.path.join(html_path, '**', '*.html'), recursive=True)
+        if not path.endswith('.archive.html')
+    ]
+
+    with ProcessPoolExecutor(max_workers=workers or None) as executor:
+        list(
+            executor.map(
+                partial(format_html_file, serializer=serializer),
+                paths,
+                chunksize=64,
+            )
+        )
+
+    return len(paths)
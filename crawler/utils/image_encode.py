@@ -0,0 +1,233 @@
+import os
+import time
+from collections import defaultdict
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from crawler.logger import logger
+from crawler.utils.artifact_store import artifact_store
+from crawler.utils.artifact_writer import artifact_writer
+from crawler.utils.file_utils import unlink_file
+from crawler.utils.image_pool import image_pool
+from crawler.utils.screenshot_dedup import (
+    Previous,
+    link_if_unchanged,
+    perceptual_hash,
+    screenshot_dedup,
+)
+
+__all__ = [
+    'ScreenshotEncoder',
+    'screenshot_encoder',
+    'save_image',
+    'save_screenshot',
+    'encode_file',
+    'is_plain_png',
+    'EncodeRecord',
+]
+
+# Pillow format name and largest side it can hold of every preset format
+FORMATS = {
+    'png': ('PNG', None),
+    'webp': ('WEBP', 16383),
+    'avif': ('AVIF', None),
+    'jpeg': ('JPEG', 65500),
+}
+
+# path, format ('link' if linked to the last crawl), bytes written, seconds
+# spent and perceptual hash of a saved image
+EncodeRecord = Tuple[str, str, int, float, Optional[str]]
+
+
+def is_plain_png(preset: Dict[str, Any]) -> bool:
+    """A preset that keeps the png of the browser as it is"""
+    return (
+        preset.get('format', 'png') == 'png'
+        and not preset.get('colors')
+        and not preset.get('max_width')
+    )
+
+
+def save_image(image: Image.Image, path: str, preset: Dict[str, Any]) -> EncodeRecord:
+    """
+    Encode an image with a screenshot preset and save it, in the image pool
+    :param image:
+    :param path: path with the extension of the preset format
+    :param preset: format, quality, max_width, colors, see configs/exp.py
+    :return:
+    """
+    start = time.perf_counter()
+
+    fmt = preset.get('format', 'png')
+    pillow_format, max_side = FORMATS[fmt]
+
+    # Scale down to max_width, and to what the format can hold at most
+    scale = 1.0
+    if preset.get('max_width') and image.width > preset['max_width']:
+        scale = preset['max_width'] / image.width
+    if max_side and max(image.size) * scale > max_side:
+        scale = max_side / max(image.size)
+    if scale < 1.0:
+        image = image.resize(
+            (max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+            Image.Resampling.LANCZOS,
+        )
+
+    options: Dict[str, Any] = dict()
+    if fmt == 'png':
+        if preset.get('colors'):
+            # Screenshots have few colors, a palette png is a fraction of the size
+            image = image.quantize(
+                colors=preset['colors'], method=Image.Quantize.FASTOCTREE
+            )
+        options['compress_level'] = preset.get('compress_level', 6)
+    else:
+        options['quality'] = preset.get('quality', 80)
+        if fmt == 'webp':
+            options['method'] = preset.get('method', 4)
+            options['lossless'] = preset.get('lossless', False)
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    unlink_file(path)
+    image.save(path, format=pillow_format, **options)
+
+    return path, fmt, os.path.getsize(path), time.perf_counter() - start, None
+
+
+def save_screenshot(
+    image: Image.Image,
+    path: str,
+    preset: Dict[str, Any],
+    dedup: bool = False,
+    previous: Optional[Previous] = None,
+    png_data: Optional[bytes] = None,
+) -> EncodeRecord:
+    """
+    Save the screenshot of a section, in the image pool. With dedup it is
+    hashed, and linked to the screenshot of the last crawl if it looks the same
+    :param image:
+    :param path:
+    :param preset:
+    :param dedup: hash the screenshot, config.screenshot_dedup
+    :param previous: from screenshot_dedup.previous
+    :param png_data: png of the browser, written as it is by a plain png preset
+    :return:
+    """
+    if not dedup:
+        return save_image(image, path, preset)
+
+    start = time.perf_counter()
+    phash = perceptual_hash(image)
+    if link_if_unchanged(phash, path, previous):
+        return path, 'link', 0, time.perf_counter() - start, phash
+
+    if png_data is not None and is_plain_png(preset):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        unlink_file(path)
+        with open(path, 'wb') as file:
+            file.write(png_data)
+        return path, 'png', len(png_data), time.perf_counter() - start, phash
+
+    _, fmt, size, _, _ = save_image(image, path, preset)
+    return path, fmt, size, time.perf_counter() - start, phash
+
+
+def encode_file(
+    png_data: bytes,
+    path: str,
+    preset: Dict[str, Any],
+    dedup: bool = False,
+    previous: Optional[Previous] = None,
+) -> List[EncodeRecord]:
+    """Encode the png of an element screenshot with a preset, in the image pool"""
+    image = Image.open(BytesIO(png_data))
+    return [save_screenshot(image, path, preset, dedup, previous, png_data)]
+
+
+class ScreenshotEncoder:
+    def __init__(self):
+        """
+        Screenshot preset of the crawl, config.screenshot_presets
+        [config.screenshot_preset], and the size and encode time of every
+        screenshot saved with it
+        """
+        self.name = 'png'
+        self.preset: Dict[str, Any] = dict(format='png')
+
+        self.count: Dict[str, int] = defaultdict(int)
+        self.bytes: Dict[str, int] = defaultdict(int)
+        self.seconds: Dict[str, float] = defaultdict(float)
+
+    def open(self, config) -> None:
+        self.name = config.screenshot_preset
+        if self.name not in config.screenshot_presets:
+            raise ValueError(f'Unknown screenshot preset: {self.name}')
+        self.preset = dict(config.screenshot_presets[self.name])
+
+        fmt = self.preset.get('format', 'png')
+        if fmt not in FORMATS:
+            raise ValueError(f'Unknown screenshot format: {fmt}')
+        # Fail before the crawl, not in the first screenshot
+        Image.init()
+        if FORMATS[fmt][0] not in Image.SAVE:
+            raise ValueError(f'Pillow can not save {fmt}, install its plugin')
+
+    @property
+    def extension(self) -> str:
+        return self.preset.get('format', 'png')
+
+    @property
+    def device_scale_factor(self) -> Optional[float]:
+        return self.preset.get('device_scale_factor')
+
+    def path(self, img_path: str, save_name: str) -> str:
+        """Path of a screenshot, with the extension of the preset format"""
+        return os.path.join(img_path, f'{save_name}.{self.extension}')
+
+    async def write(self, png_data: bytes, path: str) -> None:
+        """
+        Save the png of an element screenshot with the preset, the png goes
+        to disk as it is unless the preset encodes it again or
+        config.screenshot_dedup hashes it in the image pool
+        :param png_data:
+        :param path: path from self.path
+        :return:
+        """
+        if is_plain_png(self.preset) and not screenshot_dedup.enabled:
+            await artifact_writer.write_bytes(path, png_data)
+            return
+        image_pool.submit_background(
+            encode_file,
+            png_data,
+            path,
+            self.preset,
+            screenshot_dedup.enabled,
+            screenshot_dedup.previous(path),
+            on_done=self.record,
+        )
+
+    def record(self, records: List[EncodeRecord]) -> None:
+        for path, fmt, size, seconds, phash in records:
+            self.count[fmt] += 1
+            self.bytes[fmt] += size
+            self.seconds[fmt] += seconds
+            if phash is not None:
+                screenshot_dedup.record(path, phash)
+            artifact_store.add(path)
+
+    def log_stats(self) -> None:
+        for fmt, count in self.count.items():
+            logger.info(
+                f'| Screenshots [{self.name}] {fmt}: {count} images, '
+                f'{self.bytes[fmt] / 1024 / 1024:.2f} MB '
+                f'({self.bytes[fmt] / count / 1024:.1f} KB each), '
+                f'encoded in {self.seconds[fmt]:.2f}s '
+                f'({self.seconds[fmt] / count * 1000:.1f} ms each)'
+            )
+
+
+screenshot_encoder = ScreenshotEncoder()
@@ -0,0 +1,87 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, Set
+
+from crawler.logger import logger
+
+__all__ = ['ImagePool', 'image_pool']
+
+
+class ImagePool:
+    def __init__(self):
+        """
+        Process pool for the cpu bound image work of the screenshots: decode,
+        crop, stitch and encode. The event loop only hands over the png bytes
+        of the captures. Without config.image_workers the work runs in the
+        default thread pool, still off the event loop.
+        """
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._background: Set[asyncio.Future] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self._executor is not None
+
+    def open(self, config) -> None:
+        if config.image_workers <= 0:
+            return
+        # spawn, playwright and asyncio do not survive a fork
+        self._executor = ProcessPoolExecutor(
+            max_workers=config.image_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> asyncio.Future:
+        """
+        Start fn in the pool right away and return its future, so that the
+        next capture can be taken while it runs
+        :param fn: module level function, its arguments are pickled
+        :param args:
+        :return:
+        """
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor, partial(fn, *args))
+
+    def submit_background(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_done: Optional[Callable[[Any], None]] = None,
+    ) -> None:
+        """
+        Start fn in the pool without waiting for it, close waits for it
+        :param fn:
+        :param args:
+        :param on_done: called with the result of fn once it is done
+        :return:
+        """
+        future = self.submit(fn, *args)
+        self._background.add(future)
+        future.add_done_callback(partial(self._done, on_done=on_done))
+
+    def _done(
+        self,
+        future: asyncio.Future,
+        on_done: Optional[Callable[[Any], None]] = None,
+    ) -> None:
+        self._background.discard(future)
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            logger.info(f'| Error: {future.exception()} - image work')
+        elif on_done is not None:
+            on_done(future.result())
+
+    async def close(self) -> None:
+        """Wait for the work in the background and stop the processes"""
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+image_pool = ImagePool()
@@ -0,0 +1,13 @@
+from typing import Any, Dict
+
+__all__ = ['merge_results']
+
+
+def merge_results(dst: Dict[str, Any], src: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge the nested results of two runs into dst, the first value wins"""
+    for key, value in src.items():
+        if isinstance(value, dict) and isinstance(dst.get(key), dict):
+            merge_results(dst[key], value)
+        elif dst.get(key) is None:
+            dst[key] = value
+    return dst
@@ -0,0 +1,38 @@
+from collections import defaultdict
+from typing import Dict, List
+
+from crawler.logger import logger
+
+__all__ = ['Timings', 'timings']
+
+
+class Timings:
+    def __init__(self):
+        """Collect named durations (seconds) over a run, e.g. time-to-ready per parser"""
+        self._records: Dict[str, List[float]] = defaultdict(list)
+
+    def record(self, name: str, seconds: float) -> None:
+        self._records[name].append(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Get count, total, mean and max of every name"""
+        return {
+            name: {
+                'count': len(values),
+                'total': round(sum(values), 3),
+                'mean': round(sum(values) / len(values), 3),
+                'max': round(max(values), 3),
+            }
+            for name, values in sorted(self._records.items())
+        }
+
+    def log_summary(self) -> None:
+        for name, summary in self.summary().items():
+            logger.info(
+                f'| Timings [{name}] count: {summary["count"]}, '
+                f'total: {summary["total"]:.2f}s, mean: {summary["mean"]:.2f}s, '
+                f'max: {summary["max"]:.2f}s'
+            )
+
+
+timings = Timings()
@@ -1,10 +1,22 @@
 import asyncio
+import math
 import os
 from io import BytesIO  # Import BytesIO to handle in-memory bytes data
+from typing import Any, Dict, List, Optional, Tuple
 
 from PIL import Image
 from playwright.async_api import Page
 
+from crawler.utils.image_encode import (
+    EncodeRecord,
+    save_image,
+    save_screenshot,
+    screenshot_encoder,
+)
+from crawler.utils.image_pool import image_pool
+from crawler.utils.screenshot_dedup import Previous, screenshot_dedup
+from crawler.utils.stitch import stitch_overlapping
+
 
 async def scroll_and_capture(
     page: Page,
@@ -14,8 +26,19 @@ async def scroll_and_capture(
     remove_footer: bool = False,
     save_tmp: bool = False,
     viewport_height_adjustment: int = 0,
+    stitch_mode: str = 'overlap',
+    preset: Optional[Dict[str, Any]] = None,
 ):
+    """
+    Capture the page viewport by viewport while scrolling its container
+    :param stitch_mode: 'overlap' stitches the captures where their rows
+        really overlap and keeps the fixed header and footer only once,
+        'concat' crops them by the header and footer heights and the scroll
+        offsets and pastes the captures below each other
+    :param preset: screenshot preset the capture is saved with
+    """
     tmp_path = 'tmp'
+    overlap = stitch_mode == 'overlap'
 
     header_selector = 'div.header'
     header_height = await page.evaluate(f"""
@@ -46,7 +69,33 @@ async def scroll_and_capture(
     viewport_height = int(viewport_height) + viewport_height_adjustment
     screenshot_count = 0
 
-    images = []
+    # Every capture is decoded and cropped in the image pool while the page
+    # scrolls on, only the png bytes leave the event loop
+    tiles = []
+    # Scroll position of every capture in screenshot pixels
+    offsets = []
+    ratio = await page.evaluate('window.devicePixelRatio') if overlap else 1
+
+    def add_tile(screenshot_data: bytes, top: int, bottom: int, offset: int) -> None:
+        nonlocal screenshot_count
+        save_path = (
+            os.path.join(tmp_path, f'{screenshot_count:04d}.png') if save_tmp else None
+        )
+        if overlap:
+            # The stitcher finds what to drop from the rows themselves
+            top = bottom = 0
+        tiles.append(
+            image_pool.submit(
+                crop_tile,
+                screenshot_data,
+                f'{path}.tile{screenshot_count:04d}',
+                top,
+                bottom,
+                save_path,
+            )
+        )
+        offsets.append(round(offset * ratio))
+        screenshot_count += 1
 
     if save_tmp:
         os.makedirs(tmp_path, exist_ok=True)
@@ -54,18 +103,8 @@ async def scroll_and_capture(
     # the first screenshot
     scroll_top = 0
     screenshot_data = await page.screenshot(full_page=True)
-    screenshot = Image.open(BytesIO(screenshot_data))
-    box = (0, 0, screenshot.width, screenshot.height)
     # the first screenshot does not need to remove header
-    # if remove_header:
-    #     box = (box[0], box[1] + header_height, box[2], box[3])
-    if remove_footer:
-        box = (box[0], box[1], box[2], box[3] - footer_height)
-    screenshot = screenshot.crop(box)
-    if save_tmp:
-        screenshot.save(os.path.join(tmp_path, f'{screenshot_count:04d}.png'))
-    images.append(screenshot)
-    screenshot_count += 1
+    add_tile(screenshot_data, 0, footer_height if remove_footer else 0, scroll_top)
 
     while True:
         pre_scroll_top = scroll_top
@@ -84,37 +123,22 @@ async def scroll_and_capture(
 
         if scroll_top - pre_scroll_top == viewport_height:
             screenshot_data = await page.screenshot(full_page=True)
-            screenshot = Image.open(BytesIO(screenshot_data))
-            box = (0, 0, screenshot.width, screenshot.height)
-            if remove_header:
-                box = (box[0], box[1] + header_height, box[2], box[3])
-            if remove_footer:
-                box = (box[0], box[1], box[2], box[3] - footer_height)
-            screenshot = screenshot.crop(box)
-            images.append(screenshot)
-            if save_tmp:
-                screenshot.save(os.path.join(tmp_path, f'{screenshot_count:04d}.png'))
-
-            screenshot_count += 1
+            add_tile(
+                screenshot_data,
+                header_height if remove_header else 0,
+                footer_height if remove_footer else 0,
+                scroll_top,
+            )
         elif scroll_top - pre_scroll_top < viewport_height:
             # last screenshot
             screenshot_data = await page.screenshot(full_page=False)
-            screenshot = Image.open(BytesIO(screenshot_data))
-            box = (
-                0,
-                viewport_height - (scroll_top - pre_scroll_top),
-                screenshot.width,
-                screenshot.height,
+            top = viewport_height - (scroll_top - pre_scroll_top)
+            add_tile(
+                screenshot_data,
+                top + (header_height if remove_header else 0),
+                footer_height if remove_footer else 0,
+                scroll_top,
             )
-            if remove_header:
-                box = (box[0], box[1] + header_height, box[2], box[3])
-            if remove_footer:
-                box = (box[0], box[1], box[2], box[3] - footer_height)
-            screenshot = screenshot.crop(box)
-            images.append(screenshot)
-
-            if save_tmp:
-                screenshot.save(os.path.join(tmp_path, f'{screenshot_count:04d}.png'))
             break
 
     # scroll to the top
@@ -122,18 +146,387 @@ async def scroll_and_capture(
         f"document.querySelector('{scrollable_selector}').scrollTop = 0"
     )
 
-    combine_screenshots_in_memory(images, path)
+    if not overlap:
+        await stitch_in_background(tiles, path, preset)
+        return
+
+    tile_sizes = await gather_tiles(tiles, path)
+    image_pool.submit_background(
+        stitch_overlapping,
+        [f'{path}.tile{idx:04d}' for idx in range(len(tile_sizes))],
+        list(tile_sizes),
+        path,
+        remove_footer,
+        offsets,
+        # The header is drawn over every capture, it can not be matched
+        round(header_height * ratio),
+        round(footer_height * ratio),
+        preset,
+        on_done=screenshot_encoder.record,
+    )
 
 
-def combine_screenshots_in_memory(images, output_file):
-    widths, heights = zip(*(img.size for img in images))
+async def stitch_in_background(
+    tiles: List[asyncio.Future], path: str, preset: Optional[Dict[str, Any]] = None
+) -> None:
+    """Wait for the tiles to be cropped, then stitch and encode them in the
+    background while the crawl goes on
+    """
+    tile_sizes = await gather_tiles(tiles, path)
+    image_pool.submit_background(
+        stitch_tiles,
+        [f'{path}.tile{idx:04d}' for idx in range(len(tile_sizes))],
+        list(tile_sizes),
+        path,
+        preset,
+        on_done=screenshot_encoder.record,
+    )
+
+
+async def expand_viewport(
+    page: Page, image_timeout: int = 5000, max_rounds: int = 3
+) -> Optional[int]:
+    """
+    Grow the viewport until the scroll container shows all of its content,
+    and wait once for the lazy images that come into view
+    :param page:
+    :param image_timeout: ms to wait at most for the images to load
+    :param max_rounds: times the viewport is grown when images push the content down
+    :return: height of the viewport, None if the page does not expand
+    """
+    scrollable_selector = 'div.root__scroll-body'
+
+    width = page.viewport_size['width']
+    height = page.viewport_size['height']
+
+    previous = None
+    for _ in range(max_rounds + 1):
+        # Content of the scroll container that is still hidden below
+        overflow = await page.evaluate(
+            """selector => {
+                const el = document.querySelector(selector);
+                return el ? el.scrollHeight - el.clientHeight : null;
+            }""",
+            scrollable_selector,
+        )
+        if overflow is None:
+            return None
+        if overflow <= 1:
+            return height
+        if previous is not None and overflow >= previous:
+            # The viewport grew but the container did not follow
+            return None
+
+        previous = overflow
+        height += overflow
+        await page.set_viewport_size({'width': width, 'height': height})
+
+        # Every lazy image is in the viewport now, wait for them once
+        await page.evaluate(
+            """([selector, timeout]) => {
+                const el = document.querySelector(selector);
+                el.dispatchEvent(new Event('scroll'));
+                const images = Array.from(el.querySelectorAll('img'));
+                images.forEach(img => { img.loading = 'eager'; });
+                const pending = images
+                    .filter(img => !img.complete)
+                    .map(img => new Promise(resolve => {
+                        img.addEventListener('load', resolve, {once: true});
+                        img.addEventListener('error', resolve, {once: true});
+                    }));
+                return Promise.race([
+                    Promise.all(pending),
+                    new Promise(resolve => setTimeout(resolve, timeout)),
+                ]);
+            }""",
+            [scrollable_selector, image_timeout],
+        )
+
+    # The images kept pushing the content down
+    return None
+
+
+async def capture_tiles(
+    page: Page, path: str, height: int, tile_height: int = 8000
+) -> List[asyncio.Future]:
+    """Capture the page from the top in clip tiles of tile_height pixels, the
+    tiles are decoded in the image pool into path.tileXXXX
+    """
+    width = page.viewport_size['width']
+
+    tiles: List[asyncio.Future] = []
+    try:
+        for idx, top in enumerate(range(0, height, tile_height)):
+            screenshot_data = await page.screenshot(
+                clip={
+                    'x': 0,
+                    'y': top,
+                    'width': width,
+                    'height': min(tile_height, height - top),
+                }
+            )
+            tiles.append(
+                image_pool.submit(
+                    crop_tile, screenshot_data, f'{path}.tile{idx:04d}', 0, 0
+                )
+            )
+    except BaseException:
+        await discard_tiles(tiles, path)
+        raise
+    return tiles
+
+
+async def gather_tiles(tiles: List[asyncio.Future], path: str) -> List[Tuple[int, int]]:
+    """Wait for the tiles to be cropped, none is left on disk if one fails"""
+    try:
+        return list(await asyncio.gather(*tiles))
+    except BaseException:
+        await discard_tiles(tiles, path)
+        raise
+
+
+async def discard_tiles(tiles: List[asyncio.Future], path: str) -> None:
+    """Remove the raw tiles of a capture that is given up, once they are written"""
+    await asyncio.gather(*tiles, return_exceptions=True)
+    for idx in range(len(tiles)):
+        tile_path = f'{path}.tile{idx:04d}'
+        if os.path.exists(tile_path):
+            os.remove(tile_path)
+
+
+async def tall_capture(
+    page: Page,
+    path: str,
+    remove_footer: bool = False,
+    tile_height: int = 8000,
+    image_timeout: int = 5000,
+    preset: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """
+    Capture the page in one go: the viewport is grown until the scroll
+    container shows all of its content, lazy images get one wait, and the
+    page is captured in clip tiles of tile_height pixels
+    :param page:
+    :param path:
+    :param remove_footer: hide the fixed footer instead of cropping it
+    :param tile_height: max height of a capture, taller pages take several
+    :param image_timeout: ms to wait at most for the images to load
+    :param preset: screenshot preset the capture is saved with
+    :return: False if the page does not expand, nothing is captured then
+    """
+    footer_selector = 'div.hyl-comment-foot__fixed'
+
+    original_viewport_size = page.viewport_size
+
+    try:
+        height = await expand_viewport(page, image_timeout)
+        if height is None:
+            return False
+
+        if remove_footer:
+            await page.evaluate(
+                """selector => {
+                    const footer = document.querySelector(selector);
+                    if (footer) { footer.style.visibility = 'hidden'; }
+                }""",
+                footer_selector,
+            )
+
+        tiles = await capture_tiles(page, path, height, tile_height)
+        await stitch_in_background(tiles, path, preset)
+
+        return True
+    finally:
+        if remove_footer:
+            await page.evaluate(
+                """selector => {
+                    const footer = document.querySelector(selector);
+                    if (footer) { footer.style.visibility = ''; }
+                }""",
+                footer_selector,
+            )
+        await page.set_viewport_size(original_viewport_size)
+
+
+async def capture_and_crop(
+    page: Page,
+    paths: List[Optional[str]],
+    img_paths: List[str],
+    tile_height: int = 8000,
+    image_timeout: int = 5000,
+    preset: Optional[Dict[str, Any]] = None,
+) -> Optional[List[int]]:
+    """
+    Take the screenshots of many elements from one capture of the page at the
+    current viewport width instead of one element screenshot each. The boxes
+    of all elements are read by their CSS paths in one evaluate and cropped
+    in the image pool, rounded out to whole pixels the way element
+    screenshots are. The capture is taken with the viewport grown to the
+    height of the page, so content sized by the viewport height (vh, fixed
+    bars) differs from an element screenshot at the scaled viewport, which
+    is why config.section_capture 'crop' is opt-in.
+    :param page:
+    :param paths: CSS path of every element, from PATH_SCRIPT
+    :param img_paths: image path of every element
+    :param tile_height: max height of a capture, taller pages take several
+    :param image_timeout: ms to wait at most for the images to load
+    :param preset: screenshot preset the crops are saved with
+    :return: indexes of the elements that could not be cropped, None if the
+        page does not expand and nothing is captured
+    """
+    viewport_size = page.viewport_size
+
+    try:
+        height = await expand_viewport(page, image_timeout)
+        if height is None:
+            return None
+
+        boxes = await page.evaluate(
+            """paths => ({
+                ratio: window.devicePixelRatio,
+                boxes: paths.map(path => {
+                    const el = path && document.querySelector(path);
+                    if (!el) { return null; }
+                    const rect = el.getBoundingClientRect();
+                    return [
+                        rect.left + window.scrollX,
+                        rect.top + window.scrollY,
+                        rect.width,
+                        rect.height,
+                    ];
+                }),
+            })""",
+            paths,
+        )
+
+        ratio = boxes['ratio']
+        crops = []
+        missing = []
+        for idx, (img_path, box) in enumerate(
+            zip(img_paths, boxes['boxes'], strict=True)
+        ):
+            # Not in the document, the element is left to the caller
+            if box is None or box[2] <= 0 or box[3] <= 0:
+                missing.append(idx)
+                continue
+            x, y, box_width, box_height = box
+            # The enclosing pixel rect of the box, like an element screenshot
+            left = math.floor(x + 1e-3)
+            top = math.floor(y + 1e-3)
+            right = math.ceil(x + box_width - 1e-3)
+            bottom = math.ceil(y + box_height - 1e-3)
+            crops.append(
+                (
+                    img_path,
+                    (
+                        round(left * ratio),
+                        round(top * ratio),
+                        round(right * ratio),
+                        round(bottom * ratio),
+                    ),
+                    screenshot_dedup.previous(img_path),
+                )
+            )
+
+        if crops:
+            page_path = f'{img_paths[0]}.page'
+            tile_sizes = await gather_tiles(
+                await capture_tiles(page, page_path, height, tile_height), page_path
+            )
+            image_pool.submit_background(
+                crop_sections,
+                [f'{page_path}.tile{idx:04d}' for idx in range(len(tile_sizes))],
+                list(tile_sizes),
+                crops,
+                preset,
+                screenshot_dedup.enabled,
+                on_done=screenshot_encoder.record,
+            )
+
+        return missing
+    finally:
+        await page.set_viewport_size(viewport_size)
+
+
+def crop_tile(
+    screenshot_data: bytes,
+    tile_path: str,
+    top: int,
+    bottom: int,
+    save_path: Optional[str] = None,
+) -> Tuple[int, int]:
+    """Decode a screenshot and crop top and bottom pixels off, in the image
+    pool. The pixels are kept raw in tile_path for stitch_tiles, so the tile
+    is never encoded twice nor sent back to the event loop
+    """
+    screenshot = Image.open(BytesIO(screenshot_data)).convert('RGB')
+    screenshot = screenshot.crop((0, top, screenshot.width, screenshot.height - bottom))
+    if save_path:
+        screenshot.save(save_path)
+
+    os.makedirs(os.path.dirname(tile_path), exist_ok=True)
+    with open(tile_path, 'wb') as file:
+        file.write(screenshot.tobytes())
+
+    return screenshot.size
+
+
+def _load_tiles(
+    tile_paths: List[str], tile_sizes: List[Tuple[int, int]]
+) -> Image.Image:
+    """Paste the raw tiles of crop_tile below each other, the tiles are removed"""
+    widths, heights = zip(*tile_sizes, strict=True)
     total_height = sum(heights)
 
-    combined_image = Image.new('RGB', (widths[0], total_height))
+    try:
+        combined_image = Image.new('RGB', (widths[0], total_height))
+
+        y_offset = 0
+        for tile_path, size in zip(tile_paths, tile_sizes, strict=True):
+            with open(tile_path, 'rb') as file:
+                img = Image.frombytes('RGB', size, file.read())
+            combined_image.paste(img, (0, y_offset))
+            y_offset += size[1]
+    finally:
+        # The tiles are removed even when they can not be pasted
+        for tile_path in tile_paths:
+            if os.path.exists(tile_path):
+                os.remove(tile_path)
 
-    y_offset = 0
-    for img in images:
-        combined_image.paste(img, (0, y_offset))
-        y_offset += img.size[1]
+    return combined_image
 
-    combined_image.save(output_file)
+
+def stitch_tiles(
+    tile_paths: List[str],
+    tile_sizes: List[Tuple[int, int]],
+    output_file: str,
+    preset: Optional[Dict[str, Any]] = None,
+) -> List[EncodeRecord]:
+    """Paste the raw tiles of crop_tile below each other and save the image"""
+    combined_image = _load_tiles(tile_paths, tile_sizes)
+    return [save_image(combined_image, output_file, preset or dict(format='png'))]
+
+
+def crop_sections(
+    tile_paths: List[str],
+    tile_sizes: List[Tuple[int, int]],
+    crops: List[Tuple[str, Tuple[int, int, int, int], Optional[Previous]]],
+    preset: Optional[Dict[str, Any]] = None,
+    dedup: bool = False,
+) -> List[EncodeRecord]:
+    """Cut the screenshots of the sections out of the capture of a page
+    :param crops: [(image path, (left, top, right, bottom), screenshot of the
+        last crawl)], the box in pixels
+    :param dedup: hash the screenshots, config.screenshot_dedup
+    """
+    page_image = _load_tiles(tile_paths, tile_sizes)
+    return [
+        save_screenshot(
+            page_image.crop(box),
+            img_path,
+            preset or dict(format='png'),
+            dedup,
+            previous,
+        )
+        for img_path, box, previous in crops
+    ]
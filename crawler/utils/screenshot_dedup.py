@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional, Set, Tuple
+
+import numpy as np
+from PIL import Image
+
+from crawler.logger import logger
+from crawler.utils.file_utils import assemble_project_path, link_file
+
+__all__ = [
+    'ScreenshotDedup',
+    'screenshot_dedup',
+    'perceptual_hash',
+    'hash_distance',
+    'link_if_unchanged',
+    'Previous',
+]
+
+# perceptual hash, path and max hash distance of the screenshot of the last crawl
+Previous = Tuple[str, str, int]
+
+HASH_SIZE = 8
+SAMPLE_SIZE = 32
+
+# DCT-II basis, the low frequencies of a screenshot are its layout
+_DCT = np.cos(
+    np.pi
+    * np.outer(np.arange(SAMPLE_SIZE), 2 * np.arange(SAMPLE_SIZE) + 1)
+    / (2 * SAMPLE_SIZE)
+)
+
+
+def perceptual_hash(image: Image.Image) -> str:
+    """64 bit DCT hash of an image as hex, images that look alike hash alike"""
+    pixels = np.asarray(
+        image.convert('L').resize((SAMPLE_SIZE, SAMPLE_SIZE), Image.Resampling.LANCZOS),
+        dtype=np.float64,
+    )
+    low = (_DCT @ pixels @ _DCT.T)[:HASH_SIZE, :HASH_SIZE].flatten()
+    # The DC term is the mean brightness, it is left out of the median
+    bits = low > np.median(low[1:])
+    return f'{int("".join("1" if bit else "0" for bit in bits), 2):016x}'
+
+
+def hash_distance(a: str, b: str) -> int:
+    """Number of bits two perceptual hashes differ in"""
+    return bin(int(a, 16) ^ int(b, 16)).count('1')
+
+
+def link_if_unchanged(phash: str, path: str, previous: Optional[Previous]) -> bool:
+    """
+    Link path to the screenshot of the last crawl if it looks the same, in the
+    image pool
+    :param phash: perceptual hash of the screenshot now
+    :param path: path the screenshot is saved to
+    :param previous: from ScreenshotDedup.previous
+    :return: False if the screenshot has to be written
+    """
+    if previous is None:
+        return False
+
+    previous_hash, previous_path, threshold = previous
+    if hash_distance(phash, previous_hash) > threshold:
+        return False
+    if not os.path.exists(previous_path):
+        return False
+
+    link_file(previous_path, path)
+    return True
+
+
+class ScreenshotDedup:
+    def __init__(self):
+        """
+        Perceptual hashes of the section screenshots of the last crawl, one
+        file per entry id:
+
+            screenshot_state_path/<id>.json  {save_name: {'phash': ...,
+                'fingerprint': ..., 'path': ...}}
+
+        A screenshot within config.phash_threshold of the one of the last
+        crawl is not written again, its path is linked to the file of the last
+        crawl. With config.skip_unchanged_html the screenshot of a section
+        whose HTML is unchanged is not even taken. Entries are only crawled by
+        one worker, so one file per entry is safe to share between them.
+        """
+        self.path: Optional[str] = None
+        self.threshold = 0
+        self.skip_unchanged_html = False
+
+        self._entries: Dict[str, Dict[str, Dict[str, Any]]] = dict()
+        self._dirty: Set[str] = set()
+        # HTML fingerprints of the screenshots being taken, by their path
+        self._fingerprints: Dict[str, str] = dict()
+
+        self.hashed = 0
+        self.skipped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def open(self, config) -> None:
+        if not config.screenshot_dedup:
+            return
+        self.path = assemble_project_path(config.screenshot_state_path)
+        self.threshold = config.phash_threshold
+        self.skip_unchanged_html = config.skip_unchanged_html
+        os.makedirs(self.path, exist_ok=True)
+        logger.info(f'| Screenshot dedup, state in {self.path}')
+
+    @staticmethod
+    def _key(img_path: str) -> Tuple[str, str]:
+        # img_path/<id>/<save_name>.<ext>
+        directory, file_name = os.path.split(img_path)
+        return os.path.basename(directory), os.path.splitext(file_name)[0]
+
+    def _entry(self, id: str) -> Dict[str, Dict[str, Any]]:
+        if id not in self._entries:
+            path = os.path.join(self.path, f'{id}.json')
+            entry = dict()
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    entry = json.load(f)
+            self._entries[id] = entry
+        return self._entries[id]
+
+    def previous(self, img_path: str) -> Optional[Previous]:
+        """Hash and path of the screenshot of the last crawl, for link_if_unchanged"""
+        if not self.enabled:
+            return None
+        id, save_name = self._key(img_path)
+        state = self._entry(id).get(save_name)
+        if state is None or not state.get('phash'):
+            return None
+        return state['phash'], state['path'], self.threshold
+
+    def unchanged(self, img_path: str, content: str) -> Optional[str]:
+        """
+        Get the screenshot of the last crawl of a section whose HTML is unchanged
+        :param img_path: path the screenshot would be saved to
+        :param content: HTML of the section
+        :return: path to link img_path to, None if the screenshot is taken
+        """
+        if not self.enabled:
+            return None
+
+        fingerprint = hashlib.sha1(content.encode('utf-8')).hexdigest()
+        id, save_name = self._key(img_path)
+        state = self._entry(id).get(save_name)
+        if (
+            self.skip_unchanged_html
+            and state is not None
+            and state.get('fingerprint') == fingerprint
+            and os.path.exists(state['path'])
+        ):
+            self.skipped += 1
+            previous_path = state['path']
+            # The next crawl links to the file of this one
+            self._entry(id)[save_name] = dict(state, path=img_path)
+            self._dirty.add(id)
+            return previous_path
+
+        self._fingerprints[img_path] = fingerprint
+        return None
+
+    def record(self, img_path: str, phash: str) -> None:
+        """Keep the hash of a screenshot once it is saved"""
+        id, save_name = self._key(img_path)
+        self._entry(id)[save_name] = {
+            'phash': phash,
+            'fingerprint': self._fingerprints.pop(img_path, None),
+            'path': img_path,
+        }
+        self._dirty.add(id)
+        self.hashed += 1
+
+    def close(self) -> None:
+        """Save the state of the entries crawled, after the image pool is closed"""
+        if not self.enabled:
+            return
+
+        for id in self._dirty:
+            path = os.path.join(self.path, f'{id}.json')
+            tmp_path = f'{path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries[id], f, ensure_ascii=False)
+            # Replace the state in one step, a crash never leaves half a file
+            os.replace(tmp_path, path)
+
+        logger.info(
+            f'| Screenshot dedup: {self.hashed} screenshots hashed, '
+            f'{self.skipped} skipped with unchanged HTML'
+        )
+        self._entries.clear()
+        self._dirty.clear()
+        self._fingerprints.clear()
+
+
+screenshot_dedup = ScreenshotDedup()
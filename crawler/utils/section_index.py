@@ -0,0 +1,203 @@
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from playwright.async_api import Locator, Page
+
+from crawler.offline import OfflineLocator
+
+__all__ = ['SectionIndex', 'PATH_SCRIPT']
+
+# Selector of the template parts of a wiki page
+PART_SELECTOR = '.obc-tmpl-part'
+
+# Selectors the title of a part is read from
+TITLE_SELECTORS = ['div.obc-tmpl-fold__title', 'h2.wiki-h2']
+
+# CSS path of an element from the document root by the position of every
+# ancestor, resolved later with querySelector without marking the element.
+# None for an element that is not in the document
+PATH_SCRIPT = """el => {
+    const parts = [];
+    for (; el !== document.documentElement; el = el.parentElement) {
+        if (!el || !el.parentElement) { return null; }
+        const position = Array.prototype.indexOf.call(el.parentElement.children, el);
+        parts.unshift(`${el.tagName.toLowerCase()}:nth-child(${position + 1})`);
+    }
+    return [':root', ...parts].join(' > ');
+}"""
+
+INDEX_SCRIPT = (
+    """(root, [partSelector, titleSelectors]) => {
+    const pathOf = %s;
+    return Array.from(root.querySelectorAll(partSelector)).map(part => {
+        const titles = {};
+        for (const titleSelector of titleSelectors) {
+            const title = part.querySelector(titleSelector);
+            titles[titleSelector] = title ? title.textContent : null;
+        }
+        return {
+            tag: part.tagName.toLowerCase(),
+            classes: Array.from(part.classList),
+            titles: titles,
+            html: part.outerHTML,
+            path: pathOf(part),
+        };
+    });
+}"""
+    % PATH_SCRIPT
+)
+
+
+def _parse_selector(selector: str) -> Tuple[Optional[str], List[str]]:
+    """Get the tag and classes of a simple selector, e.g. div.obc-tmpl-part.obc-tmpl-mapDesc"""
+    tag = re.match(r'^([a-zA-Z][\w-]*)', selector)
+    return tag.group(1).lower() if tag else None, re.findall(r'\.([\w-]+)', selector)
+
+
+class SectionIndex:
+    def __init__(
+        self, root: Union[Page, Locator, OfflineLocator], sections: List[Dict[str, Any]]
+    ):
+        """Index of the template parts of a page: template class -> title -> index
+
+        Built with one evaluate, then finding a section or checking it exists is
+        a lookup instead of a text_content round trip per candidate. The same
+        evaluate captures the outerHTML of every part, so the sections found
+        through the index are parsed without another round trip.
+
+        :param root: page or element the index was built on
+        :param sections: [{'tag': ..., 'classes': [...], 'titles': {...},
+            'html': ..., 'path': ...}], in the order of root.locator(PART_SELECTOR),
+            offline sections have no path
+        """
+        self.root = root
+        self.sections = sections
+
+        # Locators handed out by the index -> index of their section, the
+        # locator is kept so that its id is not reused
+        self._located: Dict[int, Tuple[Locator, int]] = dict()
+
+        # The captured HTML is outdated once the page has been switched
+        self.stale = False
+
+        self._templates: Dict[str, List[int]] = dict()
+        for index, section in enumerate(sections):
+            for cls in section['classes']:
+                self._templates.setdefault(cls, []).append(index)
+
+    @classmethod
+    async def build(cls, root: Union[Page, Locator, OfflineLocator]) -> 'SectionIndex':
+        """Build the index of a page or of the parts inside an element"""
+        args = [PART_SELECTOR, TITLE_SELECTORS]
+        if isinstance(root, OfflineLocator):
+            sections = await root.index_parts(*args)
+        elif isinstance(root, Page):
+            sections = await root.evaluate(
+                f'args => ({INDEX_SCRIPT})(document, args)', args
+            )
+        else:
+            sections = await root.evaluate(INDEX_SCRIPT, args)
+        return cls(root, sections)
+
+    def _locate(self, index: int) -> Locator:
+        locator = self.root.locator(PART_SELECTOR).nth(index)
+        self._located[id(locator)] = (locator, index)
+        return locator
+
+    def html_of(self, locator: Locator) -> Optional[str]:
+        """Get the captured outerHTML of a section found through the index
+
+        :param locator: locator returned by find or find_all
+        :return: the HTML, None if the locator is not from this index or the
+            page has been switched since the capture
+        """
+        if self.stale or id(locator) not in self._located:
+            return None
+        _, index = self._located[id(locator)]
+        return self.sections[index].get('html')
+
+    def path_of(self, locator: Locator) -> Optional[str]:
+        """Get the CSS path of PATH_SCRIPT of a section found through the index
+
+        :param locator: locator returned by find or find_all
+        :return: the path, None if the locator is not from this index or the
+            page has been switched since the capture
+        """
+        if self.stale or id(locator) not in self._located:
+            return None
+        _, index = self._located[id(locator)]
+        return self.sections[index].get('path')
+
+    def _match(
+        self,
+        selector: str,
+        title: Optional[Union[str, Callable[[str], bool]]] = None,
+        title_selector: str = TITLE_SELECTORS[0],
+    ) -> List[int]:
+        tag, classes = _parse_selector(selector)
+        if not classes:
+            return []
+
+        indexes = [
+            index
+            for index in self._templates.get(classes[0], [])
+            if all(cls in self.sections[index]['classes'] for cls in classes)
+            and (tag is None or self.sections[index]['tag'] == tag)
+        ]
+
+        if title is None:
+            return indexes
+
+        matched = []
+        for index in indexes:
+            text = self.sections[index]['titles'].get(title_selector)
+            if text is None:
+                continue
+            if title(text) if callable(title) else title in text:
+                matched.append(index)
+        return matched
+
+    def exists(
+        self,
+        selector: str,
+        title: Optional[Union[str, Callable[[str], bool]]] = None,
+        title_selector: str = TITLE_SELECTORS[0],
+    ) -> bool:
+        return len(self._match(selector, title, title_selector)) > 0
+
+    def find(
+        self,
+        selector: str,
+        title: Optional[Union[str, Callable[[str], bool]]] = None,
+        title_selector: str = TITLE_SELECTORS[0],
+    ) -> Optional[Locator]:
+        """Find the first section matching the selector whose title contains title
+
+        :param selector: simple selector of the section, e.g. div.obc-tmpl-part
+        :param title: text the title contains, or a predicate on the title
+        :param title_selector: selector the title is read from
+        :return: locator of the section, None if there is none
+        """
+        indexes = self._match(selector, title, title_selector)
+        if not indexes:
+            return None
+        return self._locate(indexes[0])
+
+    def find_all(
+        self,
+        selector: str,
+        title: Optional[Union[str, Callable[[str], bool]]] = None,
+        title_selector: str = TITLE_SELECTORS[0],
+    ) -> List[Locator]:
+        return [
+            self._locate(index)
+            for index in self._match(selector, title, title_selector)
+        ]
+
+    def titles(
+        self, selector: str, title_selector: str = TITLE_SELECTORS[0]
+    ) -> List[Optional[str]]:
+        return [
+            self.sections[index]['titles'].get(title_selector)
+            for index in self._match(selector)
+        ]
@@ -0,0 +1,264 @@
+import os
+import struct
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from crawler.utils.file_utils import unlink_file
+from crawler.utils.image_encode import EncodeRecord, is_plain_png, save_image
+
+__all__ = ['stitch_overlapping', 'row_hashes', 'find_overlap', 'PngStripWriter']
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Odd 64 bit constants of the row hashes
+HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+HASH_MIXER = np.uint64(0xBF58476D1CE4E5B9)
+
+
+def row_hashes(tile: np.ndarray, chunk_rows: int = 1024) -> np.ndarray:
+    """
+    Hash every row of a tile, rows with the same pixels have the same hash.
+    The rows are read as 64 bit words, every word is multiplied by an odd
+    constant of its position and the products are folded with xor.
+    :param tile: (rows, width, 3) uint8
+    :param chunk_rows: rows hashed at once, bounds the memory of the products
+    :return: uint64 hash of every row
+    """
+    rows = tile.reshape(len(tile), -1)
+    pad = -rows.shape[1] % 8
+    words = (rows.shape[1] + pad) // 8
+    multipliers = (np.arange(words, dtype=np.uint64) * np.uint64(2) + np.uint64(1)) * (
+        HASH_MULTIPLIER
+    )
+
+    hashes = np.empty(len(rows), dtype=np.uint64)
+    for top in range(0, len(rows), chunk_rows):
+        chunk = np.ascontiguousarray(rows[top : top + chunk_rows])
+        if pad:
+            chunk = np.pad(chunk, ((0, 0), (0, pad)))
+        folded = np.bitwise_xor.reduce(chunk.view(np.uint64) * multipliers, axis=1)
+        # Mix the high bits into the low ones, like the finalizer of splitmix64
+        folded ^= folded >> np.uint64(31)
+        folded *= HASH_MIXER
+        folded ^= folded >> np.uint64(29)
+        hashes[top : top + chunk_rows] = folded
+    return hashes
+
+
+def find_overlap(
+    previous: np.ndarray, following: np.ndarray, expected: Optional[int] = None
+) -> int:
+    """
+    Get the number of rows the end of a tile and the start of the next one
+    have in common. Plain bands match at many overlaps, the one nearest to
+    the expected overlap wins, the longest one without it.
+    :param previous: row hashes of the rows kept of the tile
+    :param following: row hashes of the next tile
+    :param expected: overlap the scroll offsets of the tiles give
+    :return:
+    """
+    if len(previous) == 0 or len(following) == 0:
+        return 0
+
+    # Every row of the tile that looks like the first row of the next one
+    # is where an overlap could start
+    overlaps = [
+        int(len(previous) - start)
+        for start in np.nonzero(previous == following[0])[0]
+        if len(previous) - start <= len(following)
+        and np.array_equal(previous[start:], following[: len(previous) - start])
+    ]
+    if expected is None:
+        return overlaps[0] if overlaps else 0
+    # No overlap at all matches as well
+    return min(overlaps + [0], key=lambda overlap: abs(overlap - expected))
+
+
+def _fixed_bands(hashes: List[np.ndarray], header: int, footer: int) -> Tuple[int, int]:
+    """
+    Rows of the fixed header and footer the DOM gives that really are the
+    same in every tile. Rows that only look alike, a plain background or a
+    margin, are page content and are never taken for a band by themselves
+    :param hashes: row hashes of every tile
+    :param header: height of the fixed header in tile pixels, from the DOM
+    :param footer: height of the fixed footer in tile pixels, from the DOM
+    :return: height of the header and of the footer
+    """
+    if len(hashes) < 2:
+        return 0, 0
+
+    height = min(len(tile_hashes) for tile_hashes in hashes)
+
+    def band(rows: np.ndarray, limit: int) -> int:
+        same = np.all(rows == rows[0], axis=0)
+        return min(limit, int(np.logical_and.accumulate(same).sum()))
+
+    header = band(np.stack([tile_hashes[:height] for tile_hashes in hashes]), header)
+    footer = band(
+        np.stack([tile_hashes[::-1][:height] for tile_hashes in hashes]), footer
+    )
+
+    # Bands that cover the whole tile leave no page content to stitch
+    if header + footer >= height:
+        return 0, 0
+    return header, footer
+
+
+class PngStripWriter:
+    def __init__(self, path: str, width: int, height: int, level: int = 6):
+        """
+        Write an RGB png strip by strip, only the strip being written is in
+        memory. The rows are paeth filtered, the filter that suits screenshots.
+        :param path:
+        :param width:
+        :param height:
+        :param level: zlib compression level
+        """
+        self.width = width
+        self.stride = width * 3
+        self._previous = np.zeros(self.stride, dtype=np.uint8)
+        self._compressor = zlib.compressobj(level)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        unlink_file(path)
+        self._file = open(path, 'wb')
+        self._file.write(PNG_SIGNATURE)
+        self._chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+
+    def _chunk(self, chunk_type: bytes, data: bytes) -> None:
+        self._file.write(struct.pack('>I', len(data)))
+        self._file.write(chunk_type)
+        self._file.write(data)
+        self._file.write(struct.pack('>I', zlib.crc32(chunk_type + data)))
+
+    def write(self, rows: np.ndarray) -> None:
+        """Write the next rows, an array of (rows, width, 3) uint8"""
+        if len(rows) == 0:
+            return
+
+        current = rows.reshape(len(rows), self.stride).astype(np.int16)
+        up = np.empty_like(current)
+        up[0] = self._previous
+        up[1:] = current[:-1]
+        left = np.zeros_like(current)
+        left[:, 3:] = current[:, :-3]
+        up_left = np.zeros_like(current)
+        up_left[:, 3:] = up[:, :-3]
+
+        estimate = left + up - up_left
+        distance_left = np.abs(estimate - left)
+        distance_up = np.abs(estimate - up)
+        distance_up_left = np.abs(estimate - up_left)
+        predictor = np.where(
+            (distance_left <= distance_up) & (distance_left <= distance_up_left),
+            left,
+            np.where(distance_up <= distance_up_left, up, up_left),
+        )
+
+        filtered = np.empty((len(rows), self.stride + 1), dtype=np.uint8)
+        filtered[:, 0] = 4  # paeth
+        filtered[:, 1:] = (current - predictor) & 0xFF
+        self._previous = current[-1].astype(np.uint8)
+
+        data = self._compressor.compress(filtered.tobytes())
+        if data:
+            self._chunk(b'IDAT', data)
+
+    def close(self) -> None:
+        self._chunk(b'IDAT', self._compressor.flush())
+        self._chunk(b'IEND', b'')
+        self._file.close()
+
+
+def stitch_overlapping(
+    tile_paths: List[str],
+    tile_sizes: List[Tuple[int, int]],
+    output_file: str,
+    remove_footer: bool = False,
+    scroll_offsets: Optional[List[int]] = None,
+    header_height: int = 0,
+    footer_height: int = 0,
+    preset: Optional[Dict[str, Any]] = None,
+    strip_rows: int = 512,
+) -> List[EncodeRecord]:
+    """
+    Stitch the tiles of a scrolled capture by where they really overlap, in
+    the image pool. The fixed header is only kept at the top and the fixed
+    footer only at the bottom, their heights come from the DOM. The raw
+    tiles of crop_tile are memory-mapped and a plain png is written in
+    strips, no full tile is ever held in memory. Other presets need the
+    whole image for their encoder.
+    :param tile_paths: raw RGB tiles, in scroll order
+    :param tile_sizes: (width, height) of every tile
+    :param output_file:
+    :param remove_footer: drop the fixed footer from the bottom as well
+    :param scroll_offsets: scroll position of every tile in tile pixels, only
+        used to choose between overlaps that match equally well
+    :param header_height: height of the fixed header in tile pixels, 0 without one
+    :param footer_height: height of the fixed footer in tile pixels, 0 without one
+    :param preset: screenshot preset the image is saved with
+    :param strip_rows: rows written to the png at once
+    :return:
+    """
+    tiles = [
+        np.memmap(tile_path, dtype=np.uint8, mode='r', shape=(height, width, 3))
+        for tile_path, (width, height) in zip(tile_paths, tile_sizes, strict=True)
+    ]
+    hashes = [row_hashes(tile) for tile in tiles]
+    header, footer = _fixed_bands(hashes, header_height, footer_height)
+
+    # Rows of every tile to keep: the header only in the first tile, the
+    # footer only in the last, and what the previous tile already showed not
+    # at all
+    spans: List[Tuple[int, int]] = []
+    for idx, tile_hashes in enumerate(hashes):
+        start = 0 if idx == 0 else header
+        end = len(tile_hashes)
+        if idx < len(hashes) - 1 or remove_footer:
+            end -= footer
+
+        if idx > 0:
+            previous_start, previous_end = spans[-1]
+            expected = None
+            if scroll_offsets is not None:
+                # Page row the previous tile ends at, minus the one this starts at
+                expected = (scroll_offsets[idx - 1] + previous_end) - (
+                    scroll_offsets[idx] + start
+                )
+            start += find_overlap(
+                hashes[idx - 1][previous_start:previous_end],
+                tile_hashes[start:end],
+                expected,
+            )
+        spans.append((start, max(start, end)))
+
+    width = tile_sizes[0][0]
+    height = sum(end - start for start, end in spans)
+
+    try:
+        if preset is not None and not is_plain_png(preset):
+            image = np.concatenate(
+                [
+                    tile[start:end]
+                    for tile, (start, end) in zip(tiles, spans, strict=True)
+                ]
+            )
+            return [save_image(Image.fromarray(image), output_file, preset)]
+
+        start_time = time.perf_counter()
+        writer = PngStripWriter(output_file, width, height)
+        try:
+            for tile, (start, end) in zip(tiles, spans, strict=True):
+                for top in range(start, end, strip_rows):
+                    writer.write(np.asarray(tile[top : min(top + strip_rows, end)]))
+        finally:
+            writer.close()
+        seconds = time.perf_counter() - start_time
+        return [(output_file, 'png', os.path.getsize(output_file), seconds, None)]
+    finally:
+        for tile_path in tile_paths:
+            os.remove(tile_path)
@@ -0,0 +1,14 @@
+from crawler.writer.arrow_export import export_results, load_category
+from crawler.writer.jsonl_writer import JsonlWriter, reset_results, result_writer
+from crawler.writer.sink_fanout import SinkFanout, result_sinks, sink_names
+
+__all__ = [
+    'JsonlWriter',
+    'result_writer',
+    'reset_results',
+    'export_results',
+    'load_category',
+    'SinkFanout',
+    'result_sinks',
+    'sink_names',
+]
@@ -0,0 +1,161 @@
+import glob
+import json
+import os
+from typing import Any, Dict, List
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from crawler.logger import logger
+
+__all__ = ['export_results', 'load_category', 'build_table', 'section_value']
+
+# Fields every entry has, they become the leading string columns
+ENTRY_FIELDS = ['id', 'name', 'url', 'icon', 'img_path', 'html_path']
+
+
+def _read_category(category_path: str) -> List[Dict[str, Any]]:
+    """Read the results of a category, the last result of an id wins"""
+    entries: Dict[str, Dict[str, Any]] = dict()
+    for path in sorted(glob.glob(os.path.join(category_path, '*.jsonl'))):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    entries[str(entry['id'])] = entry
+    return list(entries.values())
+
+
+def section_value(name: str, section: Any) -> Any:
+    """The data of a section, without the img_path and html_path around it
+    and without the extra level keyed by the section name itself
+    """
+    if not isinstance(section, dict) or 'data' not in section:
+        return section
+    data = section['data']
+    if isinstance(data, dict) and list(data.keys()) == [name]:
+        return data[name]
+    return data
+
+
+def _has_empty_struct(data_type: pa.DataType) -> bool:
+    # Parquet can not store a struct without fields
+    if pa.types.is_struct(data_type):
+        return data_type.num_fields == 0 or any(
+            _has_empty_struct(data_type.field(i).type)
+            for i in range(data_type.num_fields)
+        )
+    if pa.types.is_list(data_type) or pa.types.is_large_list(data_type):
+        return _has_empty_struct(data_type.value_type)
+    return False
+
+
+def _column(values: List[Any]) -> pa.Array:
+    """
+    Build a typed column, nested lists and dicts become list and struct
+    columns. A section whose shape differs between entries is kept as JSON
+    text instead, so one odd entry never fails the export of a category.
+    :param values:
+    :return:
+    """
+    try:
+        array = pa.array(values)
+        if not _has_empty_struct(array.type):
+            return array
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        pass
+
+    return pa.array(
+        [
+            None if value is None else json.dumps(value, ensure_ascii=False)
+            for value in values
+        ],
+        type=pa.string(),
+    )
+
+
+def build_table(entries: List[Dict[str, Any]]) -> pa.Table:
+    """
+    Flatten the entries of a category into a table: one row per entry, the
+    entry fields first, then one column per section
+    :param entries: results of the entries of one category
+    :return:
+    """
+    sections: List[str] = []
+    for entry in entries:
+        for name in (entry.get('data') or {}).keys():
+            if name not in sections:
+                sections.append(name)
+
+    columns: Dict[str, pa.Array] = dict()
+    for field in ENTRY_FIELDS:
+        columns[field] = pa.array(
+            [
+                None if entry.get(field) is None else str(entry[field])
+                for entry in entries
+            ],
+            type=pa.string(),
+        )
+    for name in sections:
+        columns[name] = _column(
+            [
+                section_value(name, (entry.get('data') or {}).get(name))
+                for entry in entries
+            ]
+        )
+
+    return pa.table(columns)
+
+
+def export_results(config) -> Dict[str, int]:
+    """
+    Export the JSONL results of every category to config.export_formats:
+
+        exp_path/export/parquet/category=<category>/part-0.parquet
+        exp_path/export/arrow/<category>.arrow   Arrow IPC file, load_category
+                                                 maps it without a copy
+    :param config:
+    :return: category -> number of rows
+    """
+    results_path = os.path.join(config.exp_path, 'results')
+    export_path = os.path.join(config.exp_path, 'export')
+    formats = set(config.export_formats)
+
+    rows: Dict[str, int] = dict()
+    for category_path in sorted(glob.glob(os.path.join(results_path, '*'))):
+        category = os.path.basename(category_path)
+        entries = _read_category(category_path)
+        if not entries:
+            continue
+
+        table = build_table(entries)
+        rows[category] = table.num_rows
+
+        if 'parquet' in formats:
+            path = os.path.join(
+                export_path, 'parquet', f'category={category}', 'part-0.parquet'
+            )
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            pq.write_table(table, path, compression=config.parquet_compression)
+
+        if 'arrow' in formats:
+            path = os.path.join(export_path, 'arrow', f'{category}.arrow')
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with pa.OSFile(path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+        logger.info(
+            f'| Export {category}: {table.num_rows} rows, '
+            f'{table.num_columns} columns to {sorted(formats)}'
+        )
+
+    return rows
+
+
+def load_category(path: str) -> pa.Table:
+    """Load an exported Arrow IPC file memory-mapped, the buffers are not copied
+    and keep the map open for as long as the table lives
+    """
+    source = pa.memory_map(path, 'r')
+    return pa.ipc.open_file(source).read_all()
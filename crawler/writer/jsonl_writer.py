@@ -0,0 +1,104 @@
+import glob
+import json
+import os
+import shutil
+from typing import IO, Any, Dict, Optional
+
+__all__ = ['JsonlWriter', 'result_writer', 'reset_results']
+
+
+def _results_path(config) -> str:
+    return os.path.join(config.exp_path, 'results')
+
+
+def reset_results(config) -> None:
+    """
+    Remove the results, sink files and checkpoints of an earlier run before a
+    run that does not resume
+    """
+    shutil.rmtree(_results_path(config), ignore_errors=True)
+    shutil.rmtree(os.path.join(config.exp_path, 'sinks'), ignore_errors=True)
+    shutil.rmtree(os.path.join(config.exp_path, 'checkpoints'), ignore_errors=True)
+
+
+class JsonlWriter:
+    def __init__(self):
+        """
+        Append the result of every entry to a JSONL file as soon as it is
+        parsed, so that only a summary of the entry stays in memory:
+
+            exp_path/results/<category>/worker_XX.jsonl
+
+        Every worker process appends to its own file. The files are fsynced
+        at every checkpoint of the sink fanout, sync returns their sizes. A
+        resumed crawl cuts them back to the sizes of the last checkpoint, the
+        results written after it, or half written by a crash, are dropped.
+        """
+        self.path: Optional[str] = None
+        self.worker_index = 0
+
+        self._files: Dict[str, IO[str]] = dict()
+        # Size of the file of every category at the last sync
+        self._sizes: Dict[str, int] = dict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def open(self, config) -> None:
+        self.path = _results_path(config)
+        self.worker_index = config.worker_index
+        os.makedirs(self.path, exist_ok=True)
+
+    def _file_path(self, category: str) -> str:
+        return os.path.join(
+            self.path, category, f'worker_{self.worker_index:02d}.jsonl'
+        )
+
+    def restore(self, sizes: Optional[Dict[str, int]]) -> None:
+        """
+        Cut the files of this worker back to a checkpoint
+        :param sizes: category -> size, returned by sync, None without one
+        :return:
+        """
+        self._sizes = dict(sizes or {})
+        pattern = os.path.join(self.path, '*', f'worker_{self.worker_index:02d}.jsonl')
+        for path in glob.glob(pattern):
+            category = os.path.basename(os.path.dirname(path))
+            size = self._sizes.get(category, 0)
+            if os.path.getsize(path) > size:
+                with open(path, 'rb+') as f:
+                    f.truncate(size)
+
+    def _file(self, category: str) -> IO[str]:
+        if category not in self._files:
+            path = self._file_path(category)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._files[category] = open(path, 'a', encoding='utf-8')
+        return self._files[category]
+
+    def write(self, category: str, res_info: Dict[str, Any]) -> None:
+        """
+        Append the result of an entry to the file of its category
+        :param category:
+        :param res_info: result of the entry, with its id
+        :return:
+        """
+        self._file(category).write(json.dumps(res_info, ensure_ascii=False) + '\n')
+
+    def sync(self) -> Dict[str, int]:
+        """Fsync the files, every result written so far is durable"""
+        for category, file in self._files.items():
+            file.flush()
+            os.fsync(file.fileno())
+            self._sizes[category] = os.fstat(file.fileno()).st_size
+        return dict(self._sizes)
+
+    def close(self) -> None:
+        self.sync()
+        for file in self._files.values():
+            file.close()
+        self._files.clear()
+
+
+result_writer = JsonlWriter()
@@ -0,0 +1,374 @@
+import asyncio
+import glob
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+from crawler.logger import logger
+from crawler.registry import SINK
+
+if TYPE_CHECKING:
+    # crawler.base imports the parser, which pushes its results through here
+    from crawler.base.sink import AbstractSink
+
+__all__ = ['SinkFanout', 'result_sinks', 'sink_names']
+
+# An entry of a sink queue, None closes the queue and a future asks the sink
+# to sync what it has written before it
+QueueItem = Optional[Tuple[str, Dict[str, Any]] | asyncio.Future]
+
+
+def sink_names(config) -> List[str]:
+    """
+    Names of the sinks in config.save_data_option, a single name or a list.
+    'json' keeps every result in res_info.json and needs no sink.
+    """
+    option = config.save_data_option
+    names = [option] if isinstance(option, str) else list(option or [])
+    return [name for name in names if name != 'json']
+
+
+def _checkpoint_path(exp_path: str, worker_index: int) -> str:
+    return os.path.join(exp_path, 'checkpoints', f'worker_{worker_index:02d}.json')
+
+
+@dataclass
+class SinkStats:
+    written: int = 0
+    batches: int = 0
+    failed: int = 0
+    busy_time: float = 0.0
+    max_depth: int = 0
+
+
+class SinkFanout:
+    def __init__(self):
+        """
+        Push every parsed entry into the sinks of config.save_data_option.
+        Every sink drains its own bounded queue in batches of
+        config.sink_batch_size entries, or what arrived within
+        config.sink_flush_interval seconds. When a sink falls behind its queue
+        fills up and put waits, which holds the parser back instead of
+        growing the memory. A failing sink loses its batch, unless it is
+        durable: then put and close raise the error.
+
+        Every config.checkpoint_every entries or config.checkpoint_interval
+        seconds the durable sinks sync what they have written, and the
+        entries they all synced are recorded as completed, with the state of
+        every durable sink:
+
+            exp_path/checkpoints/worker_XX.json  {'completed': {category:
+                [id, ...]}, 'sinks': {name: state}}
+
+        --resume skips the completed entries of every worker and rolls the
+        durable sinks of this worker back to its checkpoint, so an entry is
+        either in all of them or crawled again.
+        """
+        self.batch_size = 50
+        self.flush_interval = 2.0
+        self.checkpoint_every = 50
+        self.checkpoint_interval = 5.0
+        self.resume = False
+
+        self._sinks: Dict[str, 'AbstractSink'] = dict()
+        self._queues: Dict[str, asyncio.Queue] = dict()
+        self._workers: Dict[str, asyncio.Task] = dict()
+        self._stats: Dict[str, SinkStats] = dict()
+        self._errors: Dict[str, Exception] = dict()
+        self._start_time = time.monotonic()
+
+        # Entries put in every queue in the same order, checkpoints too
+        self._put_lock = asyncio.Lock()
+        self._checkpoint_path = ''
+        self._checkpoint_task: Optional[asyncio.Task] = None
+        self._last_checkpoint = time.monotonic()
+        # Entries put since the last checkpoint
+        self._uncommitted: List[Tuple[str, str]] = []
+        # Completed entries of every worker, and of this worker
+        self.completed: Dict[str, Set[str]] = dict()
+        self._own_completed: Dict[str, Set[str]] = dict()
+        self._sink_states: Dict[str, Any] = dict()
+
+    @property
+    def enabled(self) -> bool:
+        return len(self._sinks) > 0
+
+    @property
+    def _durable(self) -> List[str]:
+        return [name for name, sink in self._sinks.items() if sink.durable]
+
+    async def open(self, config) -> None:
+        self.batch_size = config.sink_batch_size
+        self.flush_interval = config.sink_flush_interval
+        self.checkpoint_every = config.checkpoint_every
+        self.checkpoint_interval = config.checkpoint_interval
+        self.resume = config.resume
+        self._start_time = time.monotonic()
+        self._last_checkpoint = time.monotonic()
+        self._put_lock = asyncio.Lock()
+        self._uncommitted = []
+        self.completed = dict()
+        self._own_completed = dict()
+        self._sink_states = dict()
+
+        names = sink_names(config)
+        if config.resume and 'jsonl' not in names:
+            # The jsonl results are what a resumed crawl continues
+            raise ValueError("--resume needs 'jsonl' in config.save_data_option")
+
+        self._checkpoint_path = _checkpoint_path(config.exp_path, config.worker_index)
+        if config.resume:
+            self._load_checkpoints(config.exp_path)
+
+        for name in names:
+            if name not in config.sink_options:
+                raise ValueError(f'Unknown sink: {name}')
+            sink = SINK.build(dict(config.sink_options[name]))
+            await sink.open(config)
+            if sink.durable and config.resume:
+                await sink.restore(self._sink_states.get(name))
+
+            self._sinks[name] = sink
+            self._queues[name] = asyncio.Queue(maxsize=config.sink_queue_size)
+            self._stats[name] = SinkStats()
+            self._workers[name] = asyncio.create_task(self._drain(name))
+
+        if self._sinks:
+            logger.info(f'| Sinks: {list(self._sinks.keys())}')
+
+    def _load_checkpoints(self, exp_path: str) -> None:
+        for path in glob.glob(os.path.join(exp_path, 'checkpoints', 'worker_*.json')):
+            with open(path, encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            own = path == self._checkpoint_path
+            for category, ids in checkpoint['completed'].items():
+                self.completed.setdefault(category, set()).update(ids)
+                if own:
+                    self._own_completed.setdefault(category, set()).update(ids)
+            if own:
+                self._sink_states = checkpoint['sinks']
+
+        logger.info(
+            f'| Resume with {sum(len(ids) for ids in self.completed.values())} '
+            f'completed entries from {os.path.dirname(self._checkpoint_path)}'
+        )
+
+    def is_completed(self, category: str, id: str) -> bool:
+        return str(id) in self.completed.get(category, set())
+
+    async def put(self, category: str, res_info: Dict[str, Any]) -> None:
+        """
+        Queue a parsed entry for every sink, waits while a queue is full
+        :param category:
+        :param res_info: result of the entry, with its id
+        :return:
+        """
+        async with self._put_lock:
+            for name, queue in self._queues.items():
+                if name in self._errors:
+                    raise RuntimeError(f'Sink {name} failed') from self._errors[name]
+                await queue.put((category, res_info))
+                stats = self._stats[name]
+                stats.max_depth = max(stats.max_depth, queue.qsize())
+            self._uncommitted.append((category, str(res_info['id'])))
+
+        if (
+            self._durable
+            and (self._checkpoint_task is None or self._checkpoint_task.done())
+            and (
+                len(self._uncommitted) >= self.checkpoint_every
+                or time.monotonic() - self._last_checkpoint >= self.checkpoint_interval
+            )
+        ):
+            self._checkpoint_task = asyncio.create_task(
+                self._checkpoint_in_background()
+            )
+
+    async def checkpoint(self) -> None:
+        """
+        Ask every durable sink to sync the entries put so far, once all of
+        them have the entries are recorded as completed
+        """
+        async with self._put_lock:
+            entries = self._uncommitted
+            self._uncommitted = []
+            loop = asyncio.get_running_loop()
+            markers: Dict[str, asyncio.Future] = dict()
+            for name in self._durable:
+                markers[name] = loop.create_future()
+                await self._queues[name].put(markers[name])
+        self._last_checkpoint = time.monotonic()
+
+        states = await asyncio.gather(*markers.values(), return_exceptions=True)
+        for state in states:
+            if isinstance(state, BaseException):
+                # The entries stay out of the checkpoint and are crawled again
+                raise state
+
+        for category, id in entries:
+            self.completed.setdefault(category, set()).add(id)
+            self._own_completed.setdefault(category, set()).add(id)
+        self._sink_states.update(zip(markers.keys(), states, strict=True))
+        await asyncio.to_thread(self._save_checkpoint)
+
+    async def _checkpoint_in_background(self) -> None:
+        try:
+            await self.checkpoint()
+        except Exception as e:
+            logger.info(f'| Error: {e} - checkpoint')
+
+    def _save_checkpoint(self) -> None:
+        os.makedirs(os.path.dirname(self._checkpoint_path), exist_ok=True)
+        tmp_path = f'{self._checkpoint_path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {
+                    'completed': {
+                        category: sorted(ids)
+                        for category, ids in self._own_completed.items()
+                    },
+                    'sinks': self._sink_states,
+                },
+                f,
+                ensure_ascii=False,
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        # Replace the checkpoint in one step, a crash never leaves half a file
+        os.replace(tmp_path, self._checkpoint_path)
+
+    async def _next_batch(
+        self, queue: asyncio.Queue
+    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], bool, Optional[asyncio.Future]]:
+        """
+        Wait for an entry, then take more until the batch is full or the
+        flush interval is over. A sync request ends the batch
+        :param queue:
+        :return: the batch, whether the queue is closed and the sync request
+        """
+        item: QueueItem = await queue.get()
+        if item is None:
+            return [], True, None
+        if isinstance(item, asyncio.Future):
+            return [], False, item
+
+        batch = [item]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is None:
+                return batch, True, None
+            if isinstance(item, asyncio.Future):
+                return batch, False, item
+            batch.append(item)
+        return batch, False, None
+
+    async def _drain(self, name: str) -> None:
+        queue = self._queues[name]
+        closed = False
+        while not closed:
+            batch, closed, marker = await self._next_batch(queue)
+            if batch:
+                await self._write(name, batch)
+            if marker is not None:
+                await self._sync(name, marker)
+
+    async def _write(self, name: str, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        sink = self._sinks[name]
+        stats = self._stats[name]
+        if name in self._errors:
+            # The durable sink failed, put raises and the rest is dropped
+            stats.failed += len(batch)
+            return
+
+        start = time.monotonic()
+        try:
+            await sink.write_batch(batch)
+            stats.written += len(batch)
+            stats.batches += 1
+        except Exception as e:
+            # A failing sink loses its batch, the crawl and the other sinks go on
+            stats.failed += len(batch)
+            logger.info(f'| Error: {e} - sink {name} dropped {len(batch)} entries')
+            if sink.durable:
+                self._errors[name] = e
+        stats.busy_time += time.monotonic() - start
+
+    async def _sync(self, name: str, marker: asyncio.Future) -> None:
+        """Sync a durable sink for a checkpoint, everything before it is written"""
+        if name not in self._errors:
+            try:
+                marker.set_result(await self._sinks[name].sync())
+                return
+            except Exception as e:
+                logger.info(f'| Error: {e} - sync sink {name}')
+                self._errors[name] = e
+        marker.set_exception(RuntimeError(f'Sink {name} failed'))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        elapsed = max(time.monotonic() - self._start_time, 1e-6)
+        return {
+            name: {
+                'written': stats.written,
+                'batches': stats.batches,
+                'failed': stats.failed,
+                'per_second': round(stats.written / elapsed, 2),
+                'busy_seconds': round(stats.busy_time, 2),
+                'queue_depth': self._queues[name].qsize(),
+                'max_depth': stats.max_depth,
+            }
+            for name, stats in self._stats.items()
+        }
+
+    def log_stats(self) -> None:
+        for name, stats in self.stats().items():
+            logger.info(
+                f'| Sink {name}: {stats["written"]} written '
+                f'({stats["per_second"]}/s, {stats["batches"]} batches, '
+                f'{stats["failed"]} failed, {stats["busy_seconds"]}s busy), '
+                f'queue {stats["queue_depth"]}/{self._queues[name].maxsize} '
+                f'(max {stats["max_depth"]})'
+            )
+
+    async def report(self, interval: float) -> None:
+        """Log the throughput and queue depth of every sink every interval seconds"""
+        while True:
+            await asyncio.sleep(interval)
+            self.log_stats()
+
+    async def close(self) -> None:
+        """Write and checkpoint what is left in the queues and close the sinks"""
+        if self._checkpoint_task is not None:
+            await self._checkpoint_task
+        if self._durable:
+            await self._checkpoint_in_background()
+
+        for queue in self._queues.values():
+            await queue.put(None)
+        await asyncio.gather(*self._workers.values())
+        for sink in self._sinks.values():
+            await sink.close()
+        self.log_stats()
+
+        errors = dict(self._errors)
+        self._sinks.clear()
+        self._queues.clear()
+        self._workers.clear()
+        self._stats.clear()
+        self._errors.clear()
+        self._checkpoint_task = None
+        self._uncommitted = []
+
+        for name, error in errors.items():
+            raise RuntimeError(f'Sink {name} failed') from error
+
+
+result_sinks = SinkFanout()
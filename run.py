@@ -4,6 +4,7 @@ import warnings
 warnings.filterwarnings('ignore')
 import argparse
 import asyncio
+import json
 import os
 import pathlib
 
@@ -16,8 +17,12 @@ root = str(pathlib.Path(__file__).resolve().parents[0])
 sys.path.append(root)
 
 from crawler.config import build_config
-from crawler.core import Crawler
+from crawler.core import Crawler, run_reparse, run_workers
+from crawler.logger import logger
+from crawler.utils.artifact_store import collect_garbage
 from crawler.utils.file_utils import assemble_project_path
+from crawler.utils.html_files import format_html_files
+from crawler.writer import export_results, reset_results, sink_names
 
 
 def get_args_parser():
@@ -41,17 +46,128 @@ def get_args_parser():
     parser.add_argument('--tag', type=str, default=None)
     parser.add_argument('--exp-path', type=str, default=None)
     parser.add_argument('--if_remove', action='store_true', default=False)
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='number of crawl processes, the entries are sharded across them',
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        default=None,
+        help='poll the listing pages and crawl only the entries that appeared',
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        default=None,
+        help='skip the entries an earlier run checkpointed in every durable sink',
+    )
+    parser.add_argument(
+        '--reparse',
+        type=str,
+        default=None,
+        help='exp path of an earlier crawl, parse its archived HTML again '
+        'without a browser',
+    )
+    parser.add_argument(
+        '--format-html',
+        type=str,
+        default=None,
+        help='exp path of an earlier crawl, format its HTML files with '
+        'config.html_format and exit',
+    )
+    parser.add_argument(
+        '--gc-artifacts',
+        action='store_true',
+        default=None,
+        help='drop the stored artifacts no retained crawl references and exit, '
+        'run it between crawls',
+    )
 
     return parser
 
 
 async def main(args):
+    if args.reparse:
+        # re-parse an earlier crawl in place, never remove its archive
+        args.exp_path = args.reparse
+        args.if_remove = False
+    if args.resume:
+        # a resumed crawl continues in the results of the earlier one
+        args.if_remove = False
+    if args.format_html:
+        # format the files of an earlier crawl in place, never remove them
+        args.exp_path = args.format_html
+        args.if_remove = False
+    if args.gc_artifacts:
+        # only the artifact store is cleaned, never remove a crawl
+        args.if_remove = False
+
     # 1. build config
     config = build_config(assemble_project_path(args.config), args)
 
+    # the crawl wrote the HTML files raw, format them off the hot path
+    if config.format_html:
+        html_path = os.path.join(config.exp_path, 'html')
+        count = await asyncio.get_running_loop().run_in_executor(
+            None,
+            format_html_files,
+            html_path,
+            config.html_format,
+            config.reparse_workers,
+        )
+        logger.info(f'| Formatted {count} HTML files in {html_path}')
+        return
+
+    # drop the blobs of the artifact store that no retained crawl references
+    if config.gc_artifacts:
+        store_path = assemble_project_path(config.artifact_store_path)
+        dropped, removed, freed = await asyncio.get_running_loop().run_in_executor(
+            None,
+            collect_garbage,
+            store_path,
+            config.artifact_keep_runs,
+        )
+        logger.info(
+            f'| Artifact store {store_path}: {dropped} runs dropped, '
+            f'{removed} blobs removed, {freed / 1024 / 1024:.2f} MB freed'
+        )
+        return
+
+    # the watch keeps one browser across its polls, in a single process
+    if config.watch:
+        config.workers = 1
+
+    # a run that neither resumes nor watches starts from empty results
+    if sink_names(config) and not (config.resume or config.watch):
+        reset_results(config)
+
     # 2. init crawler
-    crawler = Crawler(config=config)
-    await crawler.start()
+    if config.reparse:
+        # parse the archived HTML in a pool of processes, no browser
+        res_info = await asyncio.get_running_loop().run_in_executor(
+            None, run_reparse, config
+        )
+    elif config.workers > 1:
+        # every worker process runs its own crawler, the shards are merged
+        res_info = await asyncio.get_running_loop().run_in_executor(
+            None, run_workers, config
+        )
+    else:
+        crawler = Crawler(config=config)
+        res_info = await crawler.start()
+
+    # 3. save results, with sinks the entries are in the sinks and res_info
+    # only holds their summaries
+    res_path = os.path.join(config.exp_path, 'res_info.json')
+    with open(res_path, 'w', encoding='utf-8') as f:
+        json.dump(res_info, f, ensure_ascii=False, indent=4)
+
+    # 4. export the results to columnar files
+    if 'jsonl' in sink_names(config) and config.export_formats:
+        export_results(config)
 
 
 if __name__ == '__main__':
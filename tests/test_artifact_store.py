@@ -0,0 +1,117 @@
+import asyncio
+import os
+import shutil
+from types import SimpleNamespace
+
+from crawler.utils.artifact_store import (
+    ArtifactStore,
+    _blob_path,
+    collect_garbage,
+    read_runs,
+)
+
+
+def _open(tmp_path, exp, run_id):
+    # build_config makes the exp path
+    os.makedirs(tmp_path / exp, exist_ok=True)
+    store = ArtifactStore()
+    store.open(
+        SimpleNamespace(
+            artifact_store=True,
+            artifact_store_path=str(tmp_path / 'store'),
+            exp_path=str(tmp_path / exp),
+            run_id=run_id,
+            worker_index=0,
+        )
+    )
+    return store
+
+
+def _run(tmp_path, exp, run_id, files):
+    """Crawl files {name: content} into an exp path through the store"""
+    store = _open(tmp_path, exp, run_id)
+    for name, content in files.items():
+        store.put(str(tmp_path / exp / 'img' / name), content)
+    asyncio.run(store.close())
+    return store
+
+
+def _blobs(tmp_path):
+    return sorted(
+        file_name
+        for _, _, file_names in os.walk(tmp_path / 'store' / 'blobs')
+        for file_name in file_names
+    )
+
+
+def test_put_stores_content_once(tmp_path):
+    store = _run(tmp_path, 'exp1', 'run1', {'a.png': b'same', 'b.png': b'same'})
+
+    a, b = tmp_path / 'exp1' / 'img' / 'a.png', tmp_path / 'exp1' / 'img' / 'b.png'
+    assert a.read_bytes() == b'same'
+    assert os.path.samefile(a, b)
+    assert (store.stored, store.reused, store.bytes_saved) == (1, 1, 4)
+    assert len(_blobs(tmp_path)) == 1
+    assert read_runs(str(tmp_path / 'exp1')) == ['run1']
+
+
+def test_ingest_a_written_file(tmp_path):
+    store = _open(tmp_path, 'exp1', 'run1')
+    path = tmp_path / 'exp1' / 'img' / 'a.png'
+    os.makedirs(path.parent)
+    path.write_bytes(b'written')
+    store.add(str(path))
+    asyncio.run(store.close())
+
+    assert path.read_bytes() == b'written'
+    assert len(_blobs(tmp_path)) == 1
+    assert store.stored == 1
+
+
+def test_collect_garbage_counts_references(tmp_path):
+    _run(tmp_path, 'exp1', 'run1', {'a.png': b'shared', 'b.png': b'only run1'})
+    _run(tmp_path, 'exp2', 'run2', {'a.png': b'shared', 'c.png': b'only run2'})
+    store_path = str(tmp_path / 'store')
+
+    # Both exp paths list their runs, nothing goes
+    assert collect_garbage(store_path) == (0, 0, 0)
+    assert len(_blobs(tmp_path)) == 3
+
+    # Once exp1 is removed its run goes, and so does the blob only it used
+    shutil.rmtree(tmp_path / 'exp1')
+    assert collect_garbage(store_path) == (1, 1, len(b'only run1'))
+    assert not os.path.exists(tmp_path / 'store' / 'manifests' / 'run1')
+    assert (tmp_path / 'exp2' / 'img' / 'a.png').read_bytes() == b'shared'
+    assert len(_blobs(tmp_path)) == 2
+
+
+def test_collect_garbage_keeps_the_latest_runs(tmp_path):
+    _run(tmp_path, 'exp1', '20240101_000000', {'a.png': b'old'})
+    _run(tmp_path, 'exp2', '20240102_000000', {'a.png': b'new'})
+
+    dropped, removed, freed = collect_garbage(str(tmp_path / 'store'), keep_runs=1)
+
+    # The blob of the old run is still linked from exp1, no space is freed
+    assert (dropped, removed, freed) == (1, 1, 0)
+    assert os.listdir(tmp_path / 'store' / 'manifests') == ['20240102_000000']
+    assert (tmp_path / 'exp1' / 'img' / 'a.png').read_bytes() == b'old'
+
+
+def test_collect_garbage_removes_partial_blobs(tmp_path):
+    _run(tmp_path, 'exp1', 'run1', {'a.png': b'kept'})
+    digest = _blobs(tmp_path)[0]
+    partial = _blob_path(str(tmp_path / 'store'), digest) + '.1234.tmp'
+    with open(partial, 'wb') as f:
+        f.write(b'ke')
+
+    assert collect_garbage(str(tmp_path / 'store')) == (0, 1, 2)
+    assert _blobs(tmp_path) == [digest]
+
+
+def test_runs_of_an_exp_path(tmp_path):
+    _run(tmp_path, 'exp1', 'run1', {'a.png': b'a'})
+    _run(tmp_path, 'exp1', 'run2', {'a.png': b'a'})
+    _run(tmp_path, 'exp1', 'run2', {'a.png': b'a'})
+
+    assert read_runs(str(tmp_path / 'exp1')) == ['run1', 'run2']
+    assert read_runs(str(tmp_path / 'missing')) == []
@@ -0,0 +1,134 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from crawler.scheduler.crawl_state import CrawlState, fingerprint_of, normalize_html
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+@pytest.fixture
+def state(tmp_path):
+    state = CrawlState()
+    state.open(
+        SimpleNamespace(incremental=True, crawl_state_path=str(tmp_path / 'state'))
+    )
+    return state
+
+
+def _crawl(tmp_path, run, id='1'):
+    img_path = str(tmp_path / run / 'img' / id)
+    html_path = str(tmp_path / run / 'html' / id)
+    _write(os.path.join(img_path, 'base.png'), f'png {run}')
+    _write(os.path.join(html_path, 'base.html'), f'html {run}')
+    res_info = {
+        'id': id,
+        'sections': [
+            {
+                'img_path': os.path.join(img_path, 'base.png'),
+                'html_path': os.path.join(html_path, 'base.html'),
+            }
+        ],
+    }
+    return img_path, html_path, res_info
+
+
+def test_fingerprint_of():
+    assert fingerprint_of(['a', 'b']) == fingerprint_of(['a', 'b'])
+    assert fingerprint_of(['a', 'b']) != fingerprint_of(['b', 'a'])
+    # The sections are delimited, moving text between them changes it
+    assert fingerprint_of(['ab', '']) != fingerprint_of(['a', 'b'])
+
+
+# The same section on two loads: other swiper state, lazy image loaded
+FIRST_LOAD = (
+    '<div class="obc-tmpl-part" data-v-1a2b>'
+    '<div class="swiper-slide swiper-slide-active" style="width: 300px">'
+    '<img class="lazy" data-src="https://img/a.png" src="data:image/gif;base64,R0">'
+    '<p>甘雨</p></div></div>'
+)
+SECOND_LOAD = (
+    '<div class="obc-tmpl-part obc-tmpl-part--loaded" data-v-9f8e>'
+    '<div class="swiper-slide" style="width: 412px; transform: translate3d(0,0,0)"'
+    ' aria-hidden="true">'
+    '<img class="lazy loaded" src="https://img/a.png">'
+    '<p>甘雨</p></div></div>'
+)
+
+
+def test_dynamic_attributes_do_not_change_the_fingerprint():
+    assert normalize_html(FIRST_LOAD) == normalize_html(SECOND_LOAD)
+    assert normalize_html(FIRST_LOAD) == (
+        '<div><div><img src="https://img/a.png"><p>甘雨</p></div></div>'
+    )
+    assert fingerprint_of([FIRST_LOAD]) == fingerprint_of([SECOND_LOAD])
+
+
+def test_content_changes_the_fingerprint():
+    assert fingerprint_of([FIRST_LOAD]) != fingerprint_of(
+        [FIRST_LOAD.replace('甘雨', '刻晴')]
+    )
+    assert fingerprint_of([FIRST_LOAD]) != fingerprint_of(
+        [SECOND_LOAD.replace('img/a.png', 'img/b.png')]
+    )
+    assert normalize_html('  ') == '  '
+
+
+def test_unchanged_entry_is_linked_into_this_crawl(state, tmp_path):
+    img_path, html_path, res_info = _crawl(tmp_path, 'run1')
+    state.set('characters', '1', 'fp', res_info, img_path, html_path)
+
+    next_img_path = str(tmp_path / 'run2' / 'img' / '1')
+    next_html_path = str(tmp_path / 'run2' / 'html' / '1')
+    reused = state.get('characters', '1', 'fp', next_img_path, next_html_path)
+
+    section = reused['sections'][0]
+    assert section == {
+        'img_path': os.path.join(next_img_path, 'base.png'),
+        'html_path': os.path.join(next_html_path, 'base.html'),
+    }
+    with open(section['img_path'], encoding='utf-8') as f:
+        assert f.read() == 'png run1'
+    with open(section['html_path'], encoding='utf-8') as f:
+        assert f.read() == 'html run1'
+    assert (state.unchanged, state.changed) == (1, 0)
+
+
+def test_changed_entry_is_parsed(state, tmp_path):
+    img_path, html_path, res_info = _crawl(tmp_path, 'run1')
+    state.set('characters', '1', 'fp', res_info, img_path, html_path)
+
+    assert state.get('characters', '1', 'other', img_path, html_path) is None
+    assert state.get('characters', '2', 'fp', img_path, html_path) is None
+    assert (state.unchanged, state.changed) == (0, 2)
+
+
+def test_entry_whose_files_are_gone_is_parsed(state, tmp_path):
+    img_path, html_path, res_info = _crawl(tmp_path, 'run1')
+    state.set('characters', '1', 'fp', res_info, img_path, html_path)
+
+    os.remove(os.path.join(html_path, 'base.html'))
+    os.rmdir(html_path)
+
+    next_img_path = str(tmp_path / 'run2' / 'img' / '1')
+    next_html_path = str(tmp_path / 'run2' / 'html' / '1')
+    assert state.get('characters', '1', 'fp', next_img_path, next_html_path) is None
+    assert not os.path.exists(next_img_path)
+
+
+def test_entries_are_keyed_by_category(state, tmp_path):
+    img_path, html_path, res_info = _crawl(tmp_path, 'run1')
+    state.set('characters', '1', 'fp', res_info, img_path, html_path)
+    other_img_path, other_html_path, other_res_info = _crawl(tmp_path, 'run1', '1b')
+    state.set('weapons', '1', 'fp', other_res_info, other_img_path, other_html_path)
+
+    assert state.get('characters', '1', 'fp', img_path, html_path) == res_info
+    assert state.get('weapons', '1', 'fp', other_img_path, other_html_path) == (
+        other_res_info
+    )
+    assert state.get(None, '1', 'fp', img_path, html_path) is None
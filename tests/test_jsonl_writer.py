@@ -0,0 +1,77 @@
+import json
+import os
+from types import SimpleNamespace
+
+from crawler.writer.jsonl_writer import JsonlWriter
+
+
+def _config(exp_path):
+    return SimpleNamespace(exp_path=str(exp_path), worker_index=1)
+
+
+def _read_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_write_appends_a_line_per_result(tmp_path):
+    writer = JsonlWriter()
+    writer.open(_config(tmp_path))
+    writer.write('characters', {'id': 1, 'name': '甘雨'})
+    writer.write('characters', {'id': 2, 'name': '刻晴'})
+    writer.write('weapons', {'id': 3})
+    sizes = writer.sync()
+    writer.close()
+
+    path = tmp_path / 'results' / 'characters' / 'worker_01.jsonl'
+    assert _read_lines(path) == [{'id': 1, 'name': '甘雨'}, {'id': 2, 'name': '刻晴'}]
+    assert sizes['characters'] == os.path.getsize(path)
+    assert set(sizes) == {'characters', 'weapons'}
+
+
+def test_restore_cuts_what_was_written_after_the_checkpoint(tmp_path):
+    path = tmp_path / 'results' / 'characters' / 'worker_01.jsonl'
+    os.makedirs(path.parent)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"id": 1}\n{"id": 2}\n{"id": 3, "na')
+    other = tmp_path / 'results' / 'weapons' / 'worker_01.jsonl'
+    os.makedirs(other.parent)
+    other.write_text('{"id": 4}\n', encoding='utf-8')
+
+    writer = JsonlWriter()
+    writer.open(_config(tmp_path))
+    writer.restore({'characters': len('{"id": 1}\n')})
+
+    assert path.read_text(encoding='utf-8') == '{"id": 1}\n'
+    # Nothing of weapons was checkpointed
+    assert other.read_text(encoding='utf-8') == ''
+
+
+def test_restore_keeps_the_files_of_other_workers(tmp_path):
+    path = tmp_path / 'results' / 'characters' / 'worker_00.jsonl'
+    os.makedirs(path.parent)
+    path.write_text('{"id": 1}\n', encoding='utf-8')
+
+    writer = JsonlWriter()
+    writer.open(_config(tmp_path))
+    writer.restore(None)
+
+    assert path.read_text(encoding='utf-8') == '{"id": 1}\n'
+
+
+def test_resumed_writer_appends_after_the_checkpoint(tmp_path):
+    writer = JsonlWriter()
+    writer.open(_config(tmp_path))
+    writer.write('characters', {'id': 1})
+    sizes = writer.sync()
+    writer.write('characters', {'id': 2})
+    writer.close()
+
+    resumed = JsonlWriter()
+    resumed.open(_config(tmp_path))
+    resumed.restore(sizes)
+    resumed.write('characters', {'id': 3})
+    resumed.close()
+
+    path = tmp_path / 'results' / 'characters' / 'worker_01.jsonl'
+    assert _read_lines(path) == [{'id': 1}, {'id': 3}]
@@ -0,0 +1,105 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from crawler.base import AbstractParser
+from crawler.scheduler import listing_watcher
+
+
+class EntryParser(AbstractParser):
+    async def _parse(self, context_page, browser_context):
+        return dict()
+
+    async def parse(self, browser_context=None, category=None):
+        return dict(self._summary(), data={'parsed': True})
+
+
+class ContainerParser(AbstractParser):
+    def __init__(self, *args, listing, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.listing = listing
+        self.polled_listings_only = []
+
+    async def _parse(self, context_page, browser_context):
+        return await self._run_categories(self.categories(), browser_context)
+
+    def categories(self):
+        return {'角色': self._parse_character}
+
+    async def _parse_character(self, context_page=None, browser_context=None):
+        self.polled_listings_only.append(self.listings_only)
+        parsers = [
+            EntryParser(
+                config=self.config,
+                url=f'https://wiki/{id}',
+                id=id,
+                name=f'entry {id}',
+                img_path='img',
+                html_path='html',
+            )
+            for id in self.listing
+        ]
+        entries = await self._run_entries('character', parsers, browser_context)
+        return {'data': {entry['name']: entry for entry in entries}}
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = SimpleNamespace(
+        watch=True,
+        watch_state_path=str(tmp_path / 'watch'),
+        watch_baseline=False,
+        workers=1,
+        worker_index=0,
+        concurrency=2,
+        save_screen=False,
+    )
+    listing_watcher.open(config)
+    yield config
+    listing_watcher.__init__()
+
+
+def _container(config, listing):
+    return ContainerParser(
+        config=config,
+        url='https://wiki/container',
+        id='illustration',
+        name='illustration',
+        img_path='img',
+        html_path='html',
+        listing=listing,
+    )
+
+
+def test_poll_crawls_only_new_entries(config):
+    container = _container(config, ['1', '2'])
+
+    first = asyncio.run(container.poll())
+    assert list(first['data']['角色']['data']) == ['entry 1', 'entry 2']
+    assert listing_watcher.reset_added() == 2
+
+    container.listing = ['1', '2', '3']
+    second = asyncio.run(container.poll())
+    assert list(second['data']['角色']['data']) == ['entry 3']
+    assert listing_watcher.reset_added() == 1
+
+    assert asyncio.run(container.poll())['data']['角色']['data'] == {}
+
+    # The container page is never opened and its save names are untouched
+    assert container.polled_listings_only == [True, True, True]
+    assert not container.listings_only
+    assert container.save_id == 0
+    assert first['id'] == 'illustration'
+
+
+def test_poll_without_listings(config):
+    entry = EntryParser(
+        config=config,
+        url='https://wiki/strategy',
+        id='strategy',
+        name='strategy',
+        img_path='img',
+        html_path='html',
+    )
+    assert asyncio.run(entry.poll()) == {}
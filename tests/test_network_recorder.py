@@ -0,0 +1,103 @@
+import asyncio
+import json
+import os
+from types import SimpleNamespace
+
+from crawler.network.recorder import NetworkRecorder
+
+
+class FakeResponse:
+    status = 200
+    headers = {'content-type': 'text/html', 'content-length': '4'}
+
+    def __init__(self, body):
+        self._body = body
+
+    async def body(self):
+        # Let the other requests of the key start meanwhile
+        await asyncio.sleep(0.01)
+        return self._body
+
+
+class FakeRoute:
+    def __init__(self, body=b'page'):
+        self._body = body
+        self.fulfilled = None
+        self.aborted = False
+
+    async def fetch(self):
+        return FakeResponse(self._body)
+
+    async def fulfill(self, **kwargs):
+        self.fulfilled = kwargs
+
+    async def abort(self):
+        self.aborted = True
+
+
+def _request(url):
+    return SimpleNamespace(
+        url=url, method='GET', post_data_buffer=None, resource_type='document'
+    )
+
+
+class FakeContext:
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+
+def _recorder(tmp_path, mode):
+    recorder = NetworkRecorder()
+    config = SimpleNamespace(
+        network_mode=mode,
+        network_archive=str(tmp_path / 'network'),
+        replay_ignore_params=['t'],
+        worker_index=0,
+    )
+    asyncio.run(recorder.attach(FakeContext(), config))
+    return recorder
+
+
+def test_concurrent_requests_of_a_key_are_recorded_once(tmp_path):
+    recorder = _recorder(tmp_path, 'record')
+    routes = [FakeRoute() for _ in range(5)]
+
+    async def run():
+        await asyncio.gather(
+            *[
+                recorder.handle(route, _request(f'https://wiki/page?t={idx}'))
+                for idx, route in enumerate(routes)
+            ]
+        )
+
+    asyncio.run(run())
+
+    assert all(route.fulfilled is not None for route in routes)
+    assert recorder.recorded == {'document': 1}
+    with open(tmp_path / 'network' / 'index_worker_00.jsonl', encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f]
+    assert [entry['key'] for entry in entries] == ['GET https://wiki/page']
+    assert entries[0]['headers'] == {'content-type': 'text/html'}
+    assert len(os.listdir(tmp_path / 'network' / 'bodies')) == 1
+
+
+def test_replay_serves_the_recorded_body(tmp_path):
+    recorder = _recorder(tmp_path, 'record')
+    asyncio.run(recorder.handle(FakeRoute(b'recorded'), _request('https://wiki/a')))
+
+    replayer = _recorder(tmp_path, 'replay')
+    route, missing = FakeRoute(), FakeRoute()
+
+    async def run():
+        await replayer.handle(route, _request('https://wiki/a?t=2'))
+        await replayer.handle(missing, _request('https://wiki/b'))
+
+    asyncio.run(run())
+
+    assert route.fulfilled == {
+        'status': 200,
+        'headers': {'content-type': 'text/html'},
+        'body': b'recorded',
+    }
+    assert missing.aborted
+    assert (replayer.replayed, replayer.missed) == ({'document': 1}, {'document': 1})
@@ -0,0 +1,115 @@
+import asyncio
+import glob
+import json
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pyarrow.parquet as pq
+
+from crawler.sink.jsonl_sink import JsonlSink  # noqa: F401
+from crawler.sink.parquet_sink import ParquetSink
+from crawler.writer.sink_fanout import SinkFanout
+
+ENTRIES = 60
+KILL_AT = 37
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _config(exp_path, resume):
+    return SimpleNamespace(
+        exp_path=str(exp_path),
+        worker_index=0,
+        resume=resume,
+        save_data_option=['jsonl', 'parquet'],
+        sink_options=dict(
+            jsonl=dict(type='JsonlSink'),
+            parquet=dict(type='ParquetSink', rows_per_file=1000),
+        ),
+        parquet_compression='zstd',
+        sink_batch_size=5,
+        sink_flush_interval=0.05,
+        sink_queue_size=16,
+        checkpoint_every=10,
+        checkpoint_interval=60.0,
+    )
+
+
+def _entry(id):
+    # A list where the others have a dict does not fit the pinned schema
+    stats = [id] if id % 10 == 7 else {'hp': id}
+    return {'id': id, 'name': f'entry {id}', 'data': {'stats': stats, 'note': None}}
+
+
+async def _crawl(exp_path, resume, kill_at=None):
+    fanout = SinkFanout()
+    await fanout.open(_config(exp_path, resume))
+    for id in range(ENTRIES):
+        if fanout.is_completed('characters', id):
+            continue
+        if id == kill_at:
+            # Let the sinks take the entries, parquet keeps them in its buffer
+            await asyncio.sleep(0.3)
+            os.kill(os.getpid(), 9)
+        await fanout.put('characters', _entry(id))
+    await fanout.close()
+
+
+def _jsonl_ids(exp_path):
+    ids = []
+    for path in glob.glob(os.path.join(exp_path, 'results', 'characters', '*.jsonl')):
+        with open(path, encoding='utf-8') as f:
+            ids += [json.loads(line)['id'] for line in f]
+    return ids
+
+
+def _parquet_parts(exp_path):
+    return sorted(
+        glob.glob(
+            os.path.join(
+                exp_path, 'sinks', 'parquet', 'category=characters', '*.parquet'
+            )
+        )
+    )
+
+
+def test_killed_crawl_resumes_with_the_same_rows_in_every_sink(tmp_path):
+    script = (
+        f'import asyncio, sys; sys.path[:0] = [{ROOT!r}, {os.path.join(ROOT, "tests")!r}]; '
+        f'from test_parquet_sink import _crawl; '
+        f'asyncio.run(_crawl({str(tmp_path)!r}, False, kill_at={KILL_AT}))'
+    )
+    process = subprocess.run([sys.executable, '-c', script], cwd=ROOT)
+    assert process.returncode == -9
+
+    with open(tmp_path / 'checkpoints' / 'worker_00.json', encoding='utf-8') as f:
+        completed = json.load(f)['completed']['characters']
+    assert 0 < len(completed) < KILL_AT
+
+    asyncio.run(_crawl(tmp_path, True))
+
+    jsonl_ids = _jsonl_ids(tmp_path)
+    tables = [pq.read_table(path) for path in _parquet_parts(tmp_path)]
+    parquet_ids = [id for table in tables for id in table.column('id').to_pylist()]
+    assert sorted(jsonl_ids) == list(range(ENTRIES))
+    assert sorted(parquet_ids) == sorted(str(id) for id in range(ENTRIES))
+    assert all(table.schema == tables[0].schema for table in tables)
+
+
+def test_schema_is_pinned_by_the_first_file(tmp_path):
+    async def run():
+        sink = ParquetSink(rows_per_file=2)
+        await sink.open(_config(tmp_path, False))
+        await sink.write_batch([('characters', _entry(id)) for id in [8, 9, 6, 7]])
+        await sink.close()
+
+    asyncio.run(run())
+
+    tables = [pq.read_table(path) for path in _parquet_parts(tmp_path)]
+    assert len(tables) == 2
+    assert tables[0].schema == tables[1].schema
+    assert tables[0].column('stats').to_pylist() == [{'hp': 8}, {'hp': 9}]
+    # The list of entry 7 does not fit the struct the first file pinned
+    assert tables[1].column('stats').to_pylist() == [{'hp': 6}, None]
+    assert tables[0].schema.field('note').type == 'string'
@@ -0,0 +1,120 @@
+import io
+import json
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from crawler.utils.screenshot_dedup import (
+    ScreenshotDedup,
+    hash_distance,
+    link_if_unchanged,
+    perceptual_hash,
+)
+
+THRESHOLD = 2  # phash_threshold of configs/exp.py
+
+
+def _page(blocks):
+    """A screenshot of a page with grey blocks on white"""
+    image = Image.new('RGB', (400, 600), 'white')
+    draw = ImageDraw.Draw(image)
+    for box in blocks:
+        draw.rectangle(box, fill=(60, 60, 60))
+    return image
+
+
+LAYOUT = [(20, 20, 380, 80), (20, 120, 180, 400), (220, 120, 380, 260)]
+
+
+def test_hash_distance():
+    assert hash_distance('0' * 16, '0' * 16) == 0
+    assert hash_distance('0' * 16, 'f' * 16) == 64
+    assert hash_distance('00000000000000ff', '000000000000000f') == 4
+
+
+def test_perceptual_hash_threshold():
+    image = _page(LAYOUT)
+    phash = perceptual_hash(image)
+    assert len(phash) == 16
+
+    # Noise and a lossy encode look the same
+    pixels = np.asarray(image, dtype=np.int16)
+    noise = np.random.default_rng(0).integers(-8, 9, pixels.shape)
+    noisy = Image.fromarray(np.clip(pixels + noise, 0, 255).astype(np.uint8))
+    assert hash_distance(phash, perceptual_hash(noisy)) <= THRESHOLD
+    encoded = io.BytesIO()
+    image.save(encoded, 'JPEG', quality=50)
+    lossy = Image.open(encoded)
+    assert hash_distance(phash, perceptual_hash(lossy)) <= THRESHOLD
+
+    # Another layout does not
+    changed = _page([(20, 20, 380, 80), (20, 300, 380, 580)])
+    assert hash_distance(phash, perceptual_hash(changed)) > THRESHOLD
+
+
+def test_link_if_unchanged(tmp_path):
+    previous_path = str(tmp_path / 'run1' / 'base.png')
+    os.makedirs(os.path.dirname(previous_path))
+    _page(LAYOUT).save(previous_path)
+    phash = perceptual_hash(_page(LAYOUT))
+    path = str(tmp_path / 'run2' / 'base.png')
+
+    assert not link_if_unchanged(phash, path, None)
+    far = f'{int(phash, 16) ^ 0b111:016x}'
+    assert not link_if_unchanged(phash, path, (far, previous_path, THRESHOLD))
+    assert not link_if_unchanged(phash, path, (phash, path + '.gone', THRESHOLD))
+    assert not os.path.exists(path)
+
+    near = f'{int(phash, 16) ^ 0b11:016x}'
+    assert link_if_unchanged(phash, path, (near, previous_path, THRESHOLD))
+    assert os.path.samefile(path, previous_path)
+
+
+@pytest.fixture
+def dedup(tmp_path):
+    dedup = ScreenshotDedup()
+    dedup.open(
+        SimpleNamespace(
+            screenshot_dedup=True,
+            screenshot_state_path=str(tmp_path / 'state'),
+            phash_threshold=THRESHOLD,
+            skip_unchanged_html=True,
+        )
+    )
+    return dedup
+
+
+def test_state_of_the_last_crawl(dedup, tmp_path):
+    img_path = str(tmp_path / 'run1' / 'img' / '1' / 'base.png')
+    os.makedirs(os.path.dirname(img_path))
+    _page(LAYOUT).save(img_path)
+
+    assert dedup.previous(img_path) is None
+    assert dedup.unchanged(img_path, '<div>base</div>') is None
+    dedup.record(img_path, 'abcd' * 4)
+    dedup.close()
+
+    with open(tmp_path / 'state' / '1.json', encoding='utf-8') as f:
+        state = json.load(f)
+    assert state['base']['phash'] == 'abcd' * 4
+    assert state['base']['path'] == img_path
+
+    # The next crawl saves to another directory, with the same entry id
+    next_path = str(tmp_path / 'run2' / 'img' / '1' / 'base.png')
+    assert dedup.previous(next_path) == ('abcd' * 4, img_path, THRESHOLD)
+    assert dedup.unchanged(next_path, '<div>changed</div>') is None
+    assert dedup.unchanged(next_path, '<div>base</div>') == img_path
+    assert dedup.skipped == 1
+    # and the crawl after it links to the file of this one
+    assert dedup.previous(next_path)[1] == next_path
+
+
+def test_disabled(tmp_path):
+    dedup = ScreenshotDedup()
+    dedup.open(SimpleNamespace(screenshot_dedup=False))
+    img_path = str(tmp_path / '1' / 'base.png')
+    assert dedup.previous(img_path) is None
+    assert dedup.unchanged(img_path, '<div></div>') is None
@@ -0,0 +1,89 @@
+from crawler.utils.section_index import TITLE_SELECTORS, SectionIndex, _parse_selector
+
+FOLD_TITLE, H2_TITLE = TITLE_SELECTORS
+
+
+def _section(classes, title=None, h2=None, tag='div'):
+    return {
+        'tag': tag,
+        'classes': ['obc-tmpl-part'] + classes,
+        'titles': {FOLD_TITLE: title, H2_TITLE: h2},
+        'html': f'<{tag}>{title}</{tag}>',
+    }
+
+
+SECTIONS = [
+    _section(['obc-tmpl-fold'], title='基础信息'),
+    _section(['obc-tmpl-mapDesc'], title='角色故事'),
+    _section(['obc-tmpl-fold'], title='角色故事一'),
+    _section(['obc-tmpl-fold'], h2='天赋'),
+    _section(['obc-tmpl-fold'], title='基础信息', tag='section'),
+]
+
+
+def _index():
+    return SectionIndex(None, SECTIONS)
+
+
+def test_parse_selector():
+    assert _parse_selector('div.obc-tmpl-part.obc-tmpl-mapDesc') == (
+        'div',
+        ['obc-tmpl-part', 'obc-tmpl-mapDesc'],
+    )
+    assert _parse_selector('.obc-tmpl-fold') == (None, ['obc-tmpl-fold'])
+    assert _parse_selector('DIV') == ('div', [])
+
+
+def test_match_by_classes_and_tag():
+    index = _index()
+    assert index._match('.obc-tmpl-fold') == [0, 2, 3, 4]
+    assert index._match('div.obc-tmpl-fold') == [0, 2, 3]
+    assert index._match('div.obc-tmpl-part.obc-tmpl-mapDesc') == [1]
+    assert index._match('div.obc-tmpl-part.obc-tmpl-missing') == []
+    # A selector without a class is not indexed
+    assert index._match('div') == []
+
+
+def test_match_by_title():
+    index = _index()
+    # The title contains the text, like the text_content loop it replaces
+    assert index._match('div.obc-tmpl-fold', '角色故事') == [2]
+    assert index._match('div.obc-tmpl-part', '角色故事') == [1, 2]
+    assert index._match('div.obc-tmpl-part', lambda text: text == '角色故事') == [1]
+    # Sections without the title selector never match a title
+    assert index._match('div.obc-tmpl-fold', '天赋') == []
+    assert index._match('div.obc-tmpl-fold', '天赋', H2_TITLE) == [3]
+
+
+def test_exists_and_titles():
+    index = _index()
+    assert index.exists('div.obc-tmpl-mapDesc')
+    assert not index.exists('div.obc-tmpl-mapDesc', '基础信息')
+    assert index.titles('div.obc-tmpl-fold') == ['基础信息', '角色故事一', None]
+    assert index.titles('div.obc-tmpl-fold', H2_TITLE) == [None, None, '天赋']
+
+
+def test_html_of_unknown_locator():
+    assert _index().html_of(object()) is None
+
+
+class FakeRoot:
+    def locator(self, selector):
+        return self
+
+    def nth(self, index):
+        return object()
+
+
+def test_path_of_a_located_section():
+    sections = [
+        dict(section, path=f':root > div:nth-child({idx + 1})')
+        for idx, section in enumerate(SECTIONS)
+    ]
+    index = SectionIndex(FakeRoot(), sections)
+    locator = index.find('div.obc-tmpl-mapDesc')
+    assert index.path_of(locator) == ':root > div:nth-child(2)'
+    assert index.path_of(object()) is None
+    # The page has been switched since the paths were read
+    index.stale = True
+    assert index.path_of(locator) is None
@@ -0,0 +1,112 @@
+import asyncio
+from collections import Counter
+from types import SimpleNamespace
+
+from crawler.base import AbstractParser
+from crawler.scheduler.shard import shard_of
+from crawler.utils.merge import merge_results
+
+
+class ListingParser(AbstractParser):
+    async def _parse(self, context_page, browser_context):
+        return dict()
+
+    async def parse(self, browser_context=None, category=None):
+        return dict(self._summary(), data={'parsed_by': self.config.worker_index})
+
+
+def _parser(config, id):
+    return ListingParser(
+        config=config,
+        url=f'https://wiki/{id}',
+        id=id,
+        name=f'entry {id}',
+        img_path='img',
+        html_path='html',
+    )
+
+
+def _shard(worker_index, ids, workers=3):
+    """Result of the listing of one worker, like the wiki parsers build it"""
+    config = SimpleNamespace(
+        workers=workers, worker_index=worker_index, concurrency=2, save_screen=False
+    )
+    listing = _parser(config, 'listing')
+    parsers = [_parser(config, id) for id in ids]
+    results = asyncio.run(listing._run_entries('character', parsers))
+    return {'data': {item['name']: item for item in results}}
+
+
+def test_shard_of_is_stable_and_in_range():
+    ids = [str(id) for id in range(1000)]
+    shards = [shard_of(id, 4) for id in ids]
+
+    assert all(0 <= shard < 4 for shard in shards)
+    # md5 of the id, the same in every process and run
+    assert shard_of('12345', 4) == int('827ccb0eea8a706c4c34a16891f84e7b', 16) % 4
+    assert shards == [shard_of(id, 4) for id in ids]
+    # Every worker gets a fair share of the entries
+    assert min(Counter(shards).values()) > 200
+
+
+def test_shard_of_single_worker():
+    assert shard_of('12345', 1) == 0
+    assert shard_of('12345', 0) == 0
+
+
+def test_shard_of_matches_int_and_str_ids():
+    assert shard_of(12345, 3) == shard_of('12345', 3)
+
+
+def test_merge_results_joins_shards():
+    shards = [
+        {
+            'name': 'wiki',
+            'url': None,
+            'characters': {'name': 'characters', '1': {'name': 'a'}},
+        },
+        {
+            'name': 'wiki',
+            'url': 'https://wiki',
+            'characters': {'name': 'characters', '2': {'name': 'b'}},
+            'weapons': {'3': {'name': 'c'}},
+        },
+    ]
+    res_info: dict = dict()
+    for shard in shards:
+        merge_results(res_info, shard)
+
+    assert res_info == {
+        'name': 'wiki',
+        'url': 'https://wiki',
+        'characters': {'name': 'characters', '1': {'name': 'a'}, '2': {'name': 'b'}},
+        'weapons': {'3': {'name': 'c'}},
+    }
+
+
+def test_merge_results_first_value_wins():
+    dst = {'name': 'first', 'entry': {'title': 'first'}}
+    merge_results(dst, {'name': 'second', 'entry': {'title': 'second', 'id': '1'}})
+
+    assert dst == {'name': 'first', 'entry': {'title': 'first', 'id': '1'}}
+
+
+def test_merged_shards_keep_the_listing_order():
+    ids = [str(id) for id in range(20)]
+    res_info: dict = dict()
+    for worker_index in range(3):
+        merge_results(res_info, _shard(worker_index, ids))
+
+    assert list(res_info['data']) == [f'entry {id}' for id in ids]
+    for id in ids:
+        entry = res_info['data'][f'entry {id}']
+        assert entry['id'] == id
+        assert entry['data'] == {'parsed_by': shard_of(id, 3)}
+
+
+def test_single_worker_parses_every_entry():
+    res_info = _shard(0, ['1', '2'], workers=1)
+    assert [entry['data'] for entry in res_info['data'].values()] == [
+        {'parsed_by': 0},
+        {'parsed_by': 0},
+    ]
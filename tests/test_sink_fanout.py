@@ -0,0 +1,175 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from crawler.base import AbstractSink
+from crawler.registry import SINK
+from crawler.writer.sink_fanout import SinkFanout, sink_names
+
+
+@SINK.register_module(force=True)
+class MemorySink(AbstractSink):
+    def __init__(self, fail=False, durable=False):
+        self.fail = fail
+        self.durable = durable
+        self.batches = []
+        self.synced = 0
+        self.restored = None
+        self.closed = False
+
+    async def write_batch(self, batch):
+        if self.fail:
+            raise OSError('disk full')
+        self.batches.append(batch)
+
+    async def sync(self):
+        self.synced = sum(len(batch) for batch in self.batches)
+        return self.synced
+
+    async def restore(self, state):
+        self.restored = state
+
+    async def close(self):
+        self.closed = True
+
+
+def _config(sink_options, resume=False, batch_size=2, exp_path=''):
+    return SimpleNamespace(
+        exp_path=str(exp_path),
+        worker_index=0,
+        save_data_option=['json'] + list(sink_options),
+        sink_options={
+            name: dict(type='MemorySink', **options)
+            for name, options in sink_options.items()
+        },
+        resume=resume,
+        sink_batch_size=batch_size,
+        sink_flush_interval=0.05,
+        sink_queue_size=4,
+        checkpoint_every=3,
+        checkpoint_interval=60.0,
+    )
+
+
+def test_sink_names():
+    assert sink_names(SimpleNamespace(save_data_option='json')) == []
+    assert sink_names(SimpleNamespace(save_data_option='jsonl')) == ['jsonl']
+    assert sink_names(SimpleNamespace(save_data_option=['json', 'es'])) == ['es']
+    assert sink_names(SimpleNamespace(save_data_option=None)) == []
+
+
+def test_every_sink_gets_every_entry_in_batches():
+    async def run():
+        fanout = SinkFanout()
+        await fanout.open(_config({'a': {}, 'b': {}}))
+        sinks = dict(fanout._sinks)
+        for id in range(5):
+            await fanout.put('characters', {'id': id})
+        stats = fanout.stats()
+        await fanout.close()
+        assert not fanout.enabled
+        return sinks, stats
+
+    sinks, stats = asyncio.run(run())
+    for sink in sinks.values():
+        entries = [entry for batch in sink.batches for entry in batch]
+        assert entries == [('characters', {'id': id}) for id in range(5)]
+        assert max(len(batch) for batch in sink.batches) <= 2
+        assert sink.closed
+    assert stats['a']['max_depth'] <= 4
+
+
+def test_failing_sink_drops_its_batches_only():
+    async def run():
+        fanout = SinkFanout()
+        await fanout.open(_config({'ok': {}, 'broken': {'fail': True}}))
+        sinks = dict(fanout._sinks)
+        for id in range(3):
+            await fanout.put('characters', {'id': id})
+        stats = dict(fanout._stats)
+        await fanout.close()
+        return sinks, stats
+
+    sinks, stats = asyncio.run(run())
+    assert sum(len(batch) for batch in sinks['ok'].batches) == 3
+    assert (stats['broken'].written, stats['broken'].failed) == (0, 3)
+
+
+def test_failing_durable_sink_stops_the_crawl():
+    async def run():
+        fanout = SinkFanout()
+        await fanout.open(_config({'jsonl': {'fail': True, 'durable': True}}))
+        await fanout.put('characters', {'id': 1})
+        while not fanout._errors:
+            await asyncio.sleep(0.01)
+        with pytest.raises(RuntimeError, match='jsonl'):
+            await fanout.put('characters', {'id': 2})
+        with pytest.raises(RuntimeError, match='jsonl'):
+            await fanout.close()
+
+    asyncio.run(run())
+
+
+def test_checkpoint_completes_the_entries_every_durable_sink_synced(tmp_path):
+    async def run():
+        fanout = SinkFanout()
+        await fanout.open(_config({'jsonl': {'durable': True}}, exp_path=tmp_path))
+        sink = fanout._sinks['jsonl']
+        for id in range(3):
+            await fanout.put('characters', {'id': id})
+        # Checkpointed after 3 entries, once the sink has synced them
+        await fanout._checkpoint_task
+        assert sink.synced == 3
+        assert fanout.completed == {'characters': {'0', '1', '2'}}
+        await fanout.put('characters', {'id': 3})
+        await fanout.close()
+
+        resumed = SinkFanout()
+        await resumed.open(
+            _config({'jsonl': {'durable': True}}, resume=True, exp_path=tmp_path)
+        )
+        restored = resumed._sinks['jsonl'].restored
+        await resumed.close()
+        return resumed, restored
+
+    resumed, restored = asyncio.run(run())
+    assert resumed.is_completed('characters', 3)
+    assert not resumed.is_completed('weapons', 3)
+    assert restored == 4
+
+
+def test_failed_sync_completes_nothing(tmp_path):
+    async def run():
+        fanout = SinkFanout()
+        await fanout.open(
+            _config(
+                {
+                    'jsonl': {'durable': True},
+                    'parquet': {'fail': True, 'durable': True},
+                },
+                exp_path=tmp_path,
+            )
+        )
+        await fanout.put('characters', {'id': 1})
+        with pytest.raises(RuntimeError, match='parquet'):
+            await fanout.checkpoint()
+        with pytest.raises(RuntimeError, match='parquet'):
+            await fanout.close()
+        return fanout
+
+    fanout = asyncio.run(run())
+    assert fanout.completed == {}
+    assert not (tmp_path / 'checkpoints').exists()
+
+
+def test_resume_needs_the_jsonl_sink():
+    with pytest.raises(ValueError, match='jsonl'):
+        asyncio.run(SinkFanout().open(_config({'a': {}}, resume=True)))
+
+
+def test_unknown_sink():
+    config = _config({})
+    config.save_data_option = ['missing']
+    with pytest.raises(ValueError, match='missing'):
+        asyncio.run(SinkFanout().open(config))
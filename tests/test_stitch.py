@@ -0,0 +1,169 @@
+import os
+
+import numpy as np
+from PIL import Image
+
+from crawler.utils.stitch import (
+    PngStripWriter,
+    _fixed_bands,
+    find_overlap,
+    row_hashes,
+    stitch_overlapping,
+)
+
+HEADER = 20
+FOOTER = 15
+VIEWPORT = 300
+WIDTH = 37  # not a multiple of 8 bytes per row
+
+
+def _rows(count, seed):
+    return np.random.default_rng(seed).integers(0, 256, (count, WIDTH, 3), np.uint8)
+
+
+def test_row_hashes():
+    tile = _rows(10, 0)
+    tile[7] = tile[2]
+    hashes = row_hashes(tile)
+
+    assert hashes.dtype == np.uint64
+    assert hashes[7] == hashes[2]
+    assert len(set(hashes.tolist())) == 9
+    # Hashed in chunks or at once, rows hash alike
+    assert np.array_equal(row_hashes(tile, chunk_rows=3), hashes)
+
+    changed = tile.copy()
+    changed[4, WIDTH - 1, 2] ^= 1
+    assert np.flatnonzero(row_hashes(changed) != hashes).tolist() == [4]
+
+
+def test_find_overlap():
+    previous = np.array([1, 2, 3, 4, 5], dtype=np.uint64)
+    assert find_overlap(previous, np.array([4, 5, 6], dtype=np.uint64)) == 2
+    assert find_overlap(previous, np.array([6, 7], dtype=np.uint64)) == 0
+    assert find_overlap(previous, np.array([], dtype=np.uint64)) == 0
+
+
+def test_find_overlap_of_plain_bands():
+    previous = np.array([7, 7, 7, 7], dtype=np.uint64)
+    following = np.array([7, 7, 7, 9], dtype=np.uint64)
+
+    # Without the scroll offsets the longest overlap wins
+    assert find_overlap(previous, following) == 3
+    # With them the overlap nearest to the expected one
+    assert find_overlap(previous, following, expected=1) == 1
+    assert find_overlap(previous, following, expected=10) == 3
+    assert find_overlap(previous, np.array([9], dtype=np.uint64), expected=2) == 0
+
+
+def test_fixed_bands():
+    tiles = [np.arange(10, dtype=np.uint64) + offset for offset in (0, 100, 200)]
+    for tile in tiles:
+        tile[:3] = [1, 2, 3]
+        tile[-2:] = [4, 5]
+
+    assert _fixed_bands(tiles, 3, 2) == (3, 2)
+    assert _fixed_bands(tiles[:1], 3, 2) == (0, 0)
+    # Rows that are the same in every tile are no band without a fixed element
+    assert _fixed_bands(tiles, 0, 0) == (0, 0)
+    # Nor beyond its height, or where the tiles differ
+    assert _fixed_bands(tiles, 1, 5) == (1, 2)
+    # Bands as high as the tile leave no content, none is cut
+    assert _fixed_bands([tiles[0], tiles[0].copy()], 6, 6) == (0, 0)
+
+
+def test_png_strip_writer_round_trip(tmp_path):
+    image = _rows(50, 1)
+    image[10:30] = image[10]  # plain band, the up filter matches exactly
+    path = str(tmp_path / 'strips' / 'image.png')
+
+    writer = PngStripWriter(path, WIDTH, len(image))
+    for top in range(0, len(image), 7):
+        writer.write(image[top : top + 7])
+    writer.write(image[:0])
+    writer.close()
+
+    with Image.open(path) as png:
+        assert png.mode == 'RGB'
+        assert np.array_equal(np.asarray(png), image)
+
+
+def _capture(tmp_path, page, header, footer, offsets):
+    """Raw tiles of a page scrolled to offsets, a fixed header and footer on top"""
+    paths = []
+    for idx, offset in enumerate(offsets):
+        tile = np.concatenate(
+            [header, page[offset : offset + VIEWPORT - HEADER - FOOTER], footer]
+        )
+        path = str(tmp_path / f'page.tile{idx:04d}')
+        tile.tofile(path)
+        paths.append(path)
+    return paths, [(WIDTH, VIEWPORT)] * len(offsets)
+
+
+def test_stitch_overlapping(tmp_path):
+    page = _rows(800, 2)
+    header, footer = _rows(HEADER, 3), _rows(FOOTER, 4)
+    # The last scroll stops at the end of the page
+    offsets = [0, 200, 400, 800 - (VIEWPORT - HEADER - FOOTER)]
+    paths, sizes = _capture(tmp_path, page, header, footer, offsets)
+
+    output_file = str(tmp_path / 'page.png')
+    records = stitch_overlapping(
+        paths,
+        sizes,
+        output_file,
+        scroll_offsets=offsets,
+        header_height=HEADER,
+        footer_height=FOOTER,
+    )
+
+    with Image.open(output_file) as png:
+        stitched = np.asarray(png)
+    assert np.array_equal(stitched, np.concatenate([header, page, footer]))
+    assert records == [
+        (output_file, 'png', os.path.getsize(output_file), records[0][3], None)
+    ]
+    assert not any(os.path.exists(path) for path in paths)
+
+
+def test_stitch_overlapping_removes_footer(tmp_path):
+    page = _rows(500, 5)
+    header, footer = _rows(HEADER, 6), _rows(FOOTER, 7)
+    paths, sizes = _capture(tmp_path, page, header, footer, [0, 235])
+
+    output_file = str(tmp_path / 'page.png')
+    stitch_overlapping(
+        paths,
+        sizes,
+        output_file,
+        remove_footer=True,
+        header_height=HEADER,
+        footer_height=FOOTER,
+        strip_rows=64,
+    )
+
+    with Image.open(output_file) as png:
+        assert np.array_equal(np.asarray(png), np.concatenate([header, page]))
+
+
+def test_stitch_overlapping_keeps_a_uniform_background(tmp_path):
+    # A plain background around the content and no fixed header or footer:
+    # every tile starts and ends with the same rows
+    page = np.full((900, WIDTH, 3), 245, np.uint8)
+    for top in (100, 400, 700):
+        page[top : top + 100] = _rows(100, top)
+    offsets = [0, 300, 600]
+    paths = []
+    for idx, offset in enumerate(offsets):
+        path = str(tmp_path / f'page.tile{idx:04d}')
+        page[offset : offset + VIEWPORT].tofile(path)
+        paths.append(path)
+
+    output_file = str(tmp_path / 'page.png')
+    stitch_overlapping(
+        paths, [(WIDTH, VIEWPORT)] * len(offsets), output_file, scroll_offsets=offsets
+    )
+
+    with Image.open(output_file) as png:
+        assert np.array_equal(np.asarray(png), page)